@@ -0,0 +1,305 @@
+"""
+Compact action logs and deterministic replay.
+
+A log holds the board configuration (dimensions, mine count, seed, first-click mode and
+engine) followed by the player's actions. Since boards are generated from their seed,
+re-running the actions on a fresh game reproduces it exactly, including any intermediate
+state. Each action takes a few bytes: one varint packing the milliseconds elapsed since
+the previous action with the action kind, and one varint with the cell's flat index.
+
+Logs are self-delimiting, so many of them can be stored back to back in one file.
+"""
+import struct
+import time
+
+from core.serialization import FIRST_CLICK_CODES, FIRST_CLICK_MODES, pack_game, unpack_board
+
+MAGIC = b"MSWL"
+VERSION = 1
+
+# magic, version, first click, engine, rows, cols, num_mines, seed, action count, action bytes
+HEADER = struct.Struct("<4sHBBIIIQIQ")
+
+# Action kinds
+REVEAL = 0
+FLAG = 1
+CHORD = 2  # Reveal the unflagged neighbors of a number whose flags are all placed
+UNDO = 3   # Take back the previous move; the cell is unused
+KIND_BITS = 2  # The kinds share the low bits of the time varint
+
+# Names accepted for the kinds by Game.apply_actions and the server
+ACTION_KINDS = {"reveal": REVEAL, "flag": FLAG, "chord": CHORD}
+
+ENGINE_CODES = {"classic": 0, "array": 1, "chunked": 2}
+ENGINE_NAMES = {code: name for name, code in ENGINE_CODES.items()}
+
+
+class ActionLogError(ValueError):
+    """
+    Raised for data that is not a valid action log.
+    """
+
+
+def encode_varint(value, out):
+    """
+    Append the unsigned LEB128 encoding of `value` to the bytearray `out`.
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, offset):
+    """
+    Decode an unsigned LEB128 varint at `offset`. Returns (value, next offset).
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class ActionLog:
+    """
+    Append-only record of the actions taken in one game.
+    """
+
+    def __init__(self, rows, cols, num_mines, seed, first_click=None, engine="classic"):
+        if seed is None or not 0 <= seed < 2 ** 64:
+            raise ActionLogError("Action logs need the board's integer seed to be replayable.")
+        self.rows = rows
+        self.cols = cols
+        self.num_mines = num_mines
+        self.seed = seed
+        self.first_click = first_click
+        self.engine = engine
+        self.data = bytearray()  # Encoded actions
+        self.count = 0
+        self.start_time = time.monotonic()
+        self.last_ms = 0
+
+    @classmethod
+    def for_game(cls, game):
+        """
+        Start a log for a freshly generated game.
+        """
+        board = game.board
+        return cls(board.rows, board.cols, board.num_mines, board.seed, board.first_click, game.engine)
+
+    def restart_clock(self):
+        """
+        Count the time of the next actions from now, e.g. when a game built in advance is
+        dealt. The actions already logged keep their times.
+        """
+        self.start_time = time.monotonic() - self.last_ms / 1000
+
+    def append(self, kind, row, col, timestamp=None):
+        """
+        Record an action. `timestamp` is in milliseconds since the start of the game and
+        defaults to now.
+        """
+        if timestamp is None:
+            timestamp = int((time.monotonic() - self.start_time) * 1000)
+        delta = max(timestamp - self.last_ms, 0)
+        self.last_ms += delta
+        encode_varint((delta << KIND_BITS) | kind, self.data)
+        encode_varint(row * self.cols + col, self.data)
+        self.count += 1
+
+    def __iter__(self):
+        """
+        Yield (kind, row, col, milliseconds since the start) for every action.
+        """
+        data = self.data
+        offset = 0
+        timestamp = 0
+        cols = self.cols
+        for _ in range(self.count):
+            packed, offset = decode_varint(data, offset)
+            index, offset = decode_varint(data, offset)
+            timestamp += packed >> KIND_BITS
+            row, col = divmod(index, cols)
+            yield packed & ((1 << KIND_BITS) - 1), row, col, timestamp
+
+    def __len__(self):
+        return self.count
+
+    def mark(self):
+        """
+        Position of the log's end, to truncate back to later.
+        """
+        return len(self.data), self.count, self.last_ms
+
+    def truncate(self, mark):
+        """
+        Drop the actions appended after `mark`.
+        """
+        size, self.count, self.last_ms = mark
+        del self.data[size:]
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, FIRST_CLICK_CODES[self.first_click], ENGINE_CODES[self.engine],
+                             self.rows, self.cols, self.num_mines, self.seed, self.count, len(self.data))
+        return header + bytes(self.data)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Decode the log starting at `offset`. Returns (log, next offset).
+        """
+        if len(data) - offset < HEADER.size:
+            raise ActionLogError("Truncated action log header.")
+        (magic, version, first_click, engine, rows, cols, num_mines, seed, count,
+         size) = HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise ActionLogError("Not an action log.")
+        if version > VERSION:
+            raise ActionLogError(f"Action log version {version} is newer than supported version {VERSION}.")
+        start = offset + HEADER.size
+        if len(data) < start + size:
+            raise ActionLogError("Truncated action log.")
+        log = cls(rows, cols, num_mines, seed, FIRST_CLICK_MODES[first_click], ENGINE_NAMES[engine])
+        log.data = bytearray(data[start:start + size])
+        log.count = count
+        for *_, timestamp in log:  # Restore the clock in case more actions are appended
+            log.last_ms = timestamp
+        return log, start + size
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())[0]
+
+
+def iter_logs(data):
+    """
+    Yield every log stored back to back in `data`.
+    """
+    offset = 0
+    while offset < len(data):
+        log, offset = ActionLog.from_bytes(data, offset)
+        yield log
+
+
+def apply_action(game, kind, row, col):
+    if kind == REVEAL:
+        game.reveal_cell(row, col)
+    elif kind == FLAG:
+        game.flag_cell(row, col)
+    elif kind == CHORD:
+        game.chord_cell(row, col)
+    elif kind == UNDO:
+        game.undo()
+    else:
+        raise ActionLogError(f"Unknown action kind {kind}.")
+
+
+def apply_actions(game, actions):
+    """
+    Apply (kind, row, col, timestamp) actions in order. Without undos among them, they
+    are applied as one Game.apply_actions batch, which skips the per-move undo snapshots
+    and game checks; undos need the history of every single move, so they are replayed
+    one action at a time.
+    """
+    if has_undo(actions):
+        for kind, row, col, _ in actions:
+            apply_action(game, kind, row, col)
+    elif actions:
+        game.apply_actions([(kind, row, col) for kind, row, col, _ in actions])
+
+
+def has_undo(actions):
+    return any(kind == UNDO for kind, _, _, _ in actions)
+
+
+def new_game(log, engine=None, max_undo=None):
+    """
+    Recreate the initial game of a log.
+    """
+    from core.game import Game
+    return Game(log.rows, log.cols, log.num_mines, engine=engine or log.engine, seed=log.seed,
+                first_click=log.first_click, record=False, max_undo=max_undo)
+
+
+def replay(log, until=None, engine=None):
+    """
+    Rebuild the game of a log without any UI, applying its first `until` actions (all by
+    default). Returns the Game, which has no undo history unless the log has undos.
+    """
+    actions = list(log)[:until]
+    game = new_game(log, engine, max_undo=None if has_undo(actions) else 0)
+    apply_actions(game, actions)
+    return game
+
+
+class Replayer:
+    """
+    Random access into a long log. Snapshots of the game are taken every
+    `checkpoint_interval` actions while the log is first played through, so seeking to
+    any action only re-runs the actions since the nearest checkpoint.
+    """
+
+    def __init__(self, log, checkpoint_interval=500, engine=None):
+        self.log = log
+        self.engine = engine or log.engine
+        self.checkpoint_interval = checkpoint_interval
+        self.actions = list(log)
+        self.checkpoints = []  # Snapshot bytes after 0, interval, 2*interval, ... actions
+        self.depths = []  # Length of the game's undo history before each action
+        if not has_undo(self.actions):
+            # Nothing is ever undone, so no history is kept and each stretch between
+            # checkpoints is applied as one batch
+            game = new_game(log, self.engine, max_undo=0)
+            self.depths = [0] * len(self.actions)
+            for start in range(0, len(self.actions), checkpoint_interval):
+                self.checkpoints.append(pack_game(game))
+                apply_actions(game, self.actions[start:start + checkpoint_interval])
+            self.final = game
+            return
+        game = new_game(log, self.engine)
+        for number, (kind, row, col, _) in enumerate(self.actions):
+            if number % checkpoint_interval == 0:
+                self.checkpoints.append(pack_game(game))
+            self.depths.append(len(game.history))
+            apply_action(game, kind, row, col)
+        self.final = game
+
+    def replayable_from(self, start, position):
+        """
+        Whether the actions from `start` to `position` can be re-run on a game restored at
+        `start`. Restored games have no undo history, so no undo may reach back past `start`.
+        """
+        depths = self.depths
+        return all(depths[number] > depths[start] for number in range(start, position)
+                   if self.actions[number][0] == UNDO)
+
+    def seek(self, position):
+        """
+        Return the game as it was after `position` actions.
+        """
+        from core.game import Game
+
+        position = max(0, min(position, len(self.actions)))
+        if position == len(self.actions):
+            index = len(self.checkpoints) - 1
+        else:
+            index = position // self.checkpoint_interval
+        while index > 0 and not self.replayable_from(index * self.checkpoint_interval, position):
+            index -= 1
+        if index <= 0:
+            game = new_game(self.log, self.engine)
+        else:
+            board, state, _ = unpack_board(self.checkpoints[index], engine=self.engine)
+            game = Game.from_board(board, **state)
+        apply_actions(game, self.actions[max(index, 0) * self.checkpoint_interval:position])
+        return game
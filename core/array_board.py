@@ -0,0 +1,385 @@
+from collections import deque
+
+import numpy as np
+
+from core import instrumentation, text_render
+from core.journal import FLAG, PLACE, REVEAL, Journal, JournaledBoard
+from core.mines import resolve_seed, safe_zone, sample_mine_indices, validate_first_click
+from core.neighbors import GRID, MAX_TABLE_CELLS, get_topology, neighbor_table
+
+# Symbol of a revealed safe cell, indexed by its adjacent mine count
+COUNT_SYMBOLS = np.array([" ", "1", "2", "3", "4", "5", "6", "7", "8"])
+
+
+class CellView:
+    """
+    Lightweight view of a single cell in an ArrayBoard.
+    Mirrors the attributes and methods of `core.cell.Cell` but reads and writes
+    the board's arrays instead of holding its own state.
+    """
+    __slots__ = ("_board", "row", "col")
+
+    def __init__(self, board, row, col):
+        self._board = board
+        self.row = row
+        self.col = col
+
+    @property
+    def is_mine(self):
+        return bool(self._board.mines[self.row, self.col])
+
+    @is_mine.setter
+    def is_mine(self, value):
+        self._board.mines[self.row, self.col] = value
+
+    @property
+    def is_flagged(self):
+        return bool(self._board.flagged[self.row, self.col])
+
+    @is_flagged.setter
+    def is_flagged(self, value):
+        self._board.flagged[self.row, self.col] = value
+
+    @property
+    def is_revealed(self):
+        return bool(self._board.revealed[self.row, self.col])
+
+    @is_revealed.setter
+    def is_revealed(self, value):
+        self._board.revealed[self.row, self.col] = value
+
+    @property
+    def adjacent_mines(self):
+        return int(self._board.adjacent[self.row, self.col])
+
+    @adjacent_mines.setter
+    def adjacent_mines(self, value):
+        self._board.adjacent[self.row, self.col] = value
+
+    @property
+    def is_clear(self):
+        return not self.is_mine and self.adjacent_mines == 0
+
+    def reveal(self):
+        """
+        Reveal the cell if it is not flagged.
+        Returns True if successfully revealed, False otherwise.
+        """
+        if not self.is_flagged:
+            self.is_revealed = True
+            return True
+        return False
+
+    def toggle_flag(self):
+        """
+        Toggle the flagged state of the cell.
+        """
+        if not self.is_revealed:
+            self.is_flagged = not self.is_flagged
+
+    def __str__(self):
+        """
+        String representation of the cell for debugging or display purposes.
+        """
+        if self.is_flagged:
+            return "F"  # Flagged
+        if not self.is_revealed:
+            return "?"  # Hidden
+        if self.is_mine:
+            return "*"  # Mine
+        if self.adjacent_mines == 0:
+            return " "  # Blank if no adjacent mines
+        return str(self.adjacent_mines)  # Number of adjacent mines if revealed
+
+
+class RowView:
+    """
+    A single row of CellViews, so `board.grid[row][col]` works as it does on Board.
+    """
+    __slots__ = ("_board", "row")
+
+    def __init__(self, board, row):
+        self._board = board
+        self.row = row
+
+    def __getitem__(self, col):
+        if col < 0:
+            col += self._board.cols
+        return CellView(self._board, self.row, col)
+
+    def __len__(self):
+        return self._board.cols
+
+    def __iter__(self):
+        for col in range(self._board.cols):
+            yield CellView(self._board, self.row, col)
+
+
+class GridView:
+    """
+    Read-only list-of-lists facade over the board's arrays.
+    Views are created on demand, so no per-cell objects are kept alive.
+    """
+    __slots__ = ("_board",)
+
+    def __init__(self, board):
+        self._board = board
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self._board.rows
+        return RowView(self._board, row)
+
+    def __len__(self):
+        return self._board.rows
+
+    def __iter__(self):
+        for row in range(self._board.rows):
+            yield RowView(self._board, row)
+
+
+class ArrayBoard(JournaledBoard):
+    """
+    Minesweeper board that keeps its state in NumPy arrays instead of Cell objects.
+    Exposes the same public surface as `core.board.Board`.
+    """
+
+    def __init__(self, rows, cols, num_mines, seed=None, first_click=None, topology=GRID):
+        """
+        Initializes a new array-backed board with the given number of rows, columns, and mines.
+        `seed`, `first_click` and `topology` behave as on `core.board.Board`.
+        """
+        validate_first_click(first_click)
+        self.rows = rows
+        self.cols = cols
+        self.num_mines = num_mines
+        self.rng, self.seed = resolve_seed(seed)
+        self.first_click = first_click
+        self.topology = get_topology(topology)
+        self._neighbor_table = None  # Built on first use, see neighbor_table
+        self.mines_placed = False
+        self.safe_cells = rows * cols - num_mines  # Cells that must be revealed to win
+        self.revealed_count = 0  # Safe cells revealed so far
+        self.flags_placed = 0    # Cells currently flagged
+        self.mines = np.zeros((rows, cols), dtype=bool)
+        self.revealed = np.zeros((rows, cols), dtype=bool)
+        self.flagged = np.zeros((rows, cols), dtype=bool)
+        self.adjacent = np.zeros((rows, cols), dtype=np.uint8)
+        self.grid = GridView(self)
+        self.journal = Journal()  # Reversible record of changes, for snapshots
+        if first_click is None:
+            self._place_mines()  # Place the mines randomly
+            self.calculate_adjacent_mines()  # Calculate adjacent mines for all cells
+
+    def _place_mines(self, excluded=()):
+        """
+        Randomly places mines on the board, keeping the flat indices in `excluded` clear.
+        """
+        self.mines.flat[sample_mine_indices(self.rows * self.cols, self.num_mines, self.rng, excluded)] = True
+        self.mines_placed = True
+
+    def ensure_mines_placed(self, row, col):
+        """
+        Places deferred mines around a first click at (row, col). Does nothing if the
+        mines are already on the board.
+        """
+        if self.mines_placed:
+            return
+        self.journal.record(PLACE, self.rng.getstate())
+        neighbors = [r * self.cols + c for r, c in self.neighbors(row, col)]
+        self._place_mines(safe_zone(self.rows, self.cols, self.num_mines, row, col, self.first_click, neighbors))
+        self.calculate_adjacent_mines()
+
+    @property
+    def neighbor_table(self):
+        """
+        The shared neighbor table of the board's shape (see core.neighbors), or None for
+        plain grids too large to be worth storing one.
+        """
+        if self._neighbor_table is None and (self.topology != GRID or self.rows * self.cols <= MAX_TABLE_CELLS):
+            self._neighbor_table = neighbor_table(self.rows, self.cols, self.topology)
+        return self._neighbor_table
+
+    def neighbors(self, row, col):
+        """
+        Returns the (row, col) positions of the neighbors of a cell.
+        """
+        return self.topology.positions(self.rows, self.cols, row, col)
+
+    def calculate_adjacent_mines(self):
+        """
+        Calculates the number of mines adjacent to every cell in one pass. On plain grids
+        this sums the eight shifted copies of the zero-padded mine plane; other
+        topologies count through the neighbor table.
+        """
+        if self.topology != GRID:
+            counts = self.neighbor_table.count(self.mines).reshape(self.rows, self.cols)
+            counts[self.mines] = 0
+            self.adjacent = counts
+            return
+        padded = np.pad(self.mines.astype(np.uint8), 1)
+        counts = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        for row_offset in (0, 1, 2):
+            for column_offset in (0, 1, 2):
+                if row_offset == 1 and column_offset == 1:
+                    continue  # Skip the cell itself
+                counts += padded[row_offset:row_offset + self.rows, column_offset:column_offset + self.cols]
+        counts[self.mines] = 0  # Mines keep a zero count, as on Board
+        self.adjacent = counts
+
+    @instrumentation.timed("board.reveal_cell")
+    def reveal_cell(self, row, col):
+        """
+        Reveals a specific cell and propagates the reveal using breadth-first search
+        if the cell has no adjacent mines.
+        Returns a list of (row, col) positions that were revealed by this call,
+        which is empty if the position is invalid, already revealed or flagged.
+        """
+        if not self.is_valid_position(row, col) or self.revealed[row, col] or self.flagged[row, col]:
+            return []  # Invalid position, already revealed or flagged
+        self.ensure_mines_placed(row, col)
+
+        rows, cols = self.rows, self.cols
+        # Memoryviews of the flat planes index much faster than NumPy scalars inside the
+        # Python loop, and unlike copies they cost nothing up front, so small reveals stay
+        # cheap on huge boards. Cells are marked revealed as they are queued, so the revealed
+        # plane doubles as the visited bitmap.
+        is_revealed = memoryview(self.revealed.reshape(-1))
+        is_flagged = memoryview(self.flagged.reshape(-1))
+        counts = memoryview(self.adjacent.reshape(-1))
+
+        start = row * cols + col
+        is_revealed[start] = True
+        queue = deque([start])
+        revealed = []
+
+        table = self.neighbor_table
+        if table is not None:
+            # Neighbors of flat index i are indices[offsets[i]:offsets[i + 1]]
+            offsets, indices = table.offsets, table.indices
+            while queue:
+                index = queue.popleft()
+                revealed.append(index)
+                if counts[index] == 0:
+                    for neighbor in indices[offsets[index]:offsets[index + 1]]:
+                        if not is_revealed[neighbor] and not is_flagged[neighbor]:
+                            is_revealed[neighbor] = True
+                            queue.append(neighbor)
+
+        # Offsets of the eight neighbors, as (row offset, column offset), for grids without a table
+        adjacent_positions = [(-1, -1), (-1, 0), (-1, 1),
+                              (0, -1), (0, 1),
+                              (1, -1), (1, 0), (1, 1)]
+
+        while queue:
+            index = queue.popleft()
+            revealed.append(index)
+
+            # If the current cell has no adjacent mines, add its neighbors to the queue
+            if counts[index] == 0:
+                current_row, current_col = divmod(index, cols)
+                for dr, dc in adjacent_positions:
+                    new_row, new_col = current_row + dr, current_col + dc
+                    if 0 <= new_row < rows and 0 <= new_col < cols:
+                        neighbor = new_row * cols + new_col
+                        if not is_revealed[neighbor] and not is_flagged[neighbor]:
+                            is_revealed[neighbor] = True
+                            queue.append(neighbor)
+
+        self.revealed_count += len(revealed)
+        self.journal.record(REVEAL, (revealed, len(revealed)))  # Flat indices
+        instrumentation.observe("board.reveal_cell.cells", len(revealed))
+        return [divmod(index, cols) for index in revealed]
+
+    def _reveal_hidden(self):
+        """
+        Reveals every hidden cell; returns (journal flat indices, revealed positions) for reveal_all.
+        """
+        hidden = np.flatnonzero(~self.revealed)
+        self.revealed[:] = True
+        return hidden, [divmod(int(index), self.cols) for index in hidden]
+
+    def toggle_flag(self, row, col):
+        """
+        Toggles the flag on a hidden cell and keeps the flag counter up to date.
+        Returns True if the flag state changed, False if the cell is already revealed.
+        """
+        if self.revealed[row, col]:
+            return False
+        self.flags_placed += 1 if self._flip_flag(row, col) else -1
+        self.journal.record(FLAG, (row, col))
+        return True
+
+    def _flip_flag(self, row, col):
+        flagged = not self.flagged[row, col]
+        self.flagged[row, col] = flagged
+        return flagged
+
+    def _hide(self, indices):
+        self.revealed.flat[indices] = False
+        return [divmod(int(index), self.cols) for index in indices]
+
+    def _unplace_mines(self, rng_state):
+        self.mines[:] = False
+        self.adjacent[:] = 0
+        self.rng.setstate(rng_state)
+
+    def get_planes(self):
+        """
+        Returns the (mines, revealed, flagged) boolean arrays. They are the board's own
+        arrays, not copies.
+        """
+        return self.mines, self.revealed, self.flagged
+
+    def set_planes(self, mines, revealed, flagged):
+        """
+        Replaces the board state with the given (mines, revealed, flagged) boolean arrays,
+        then recomputes the adjacency counts and the counters.
+        """
+        self.mines = np.asarray(mines, dtype=bool).reshape(self.rows, self.cols)
+        # Contiguous, so reveal_cell can write through flat views
+        self.revealed = np.ascontiguousarray(revealed, dtype=bool).reshape(self.rows, self.cols)
+        self.flagged = np.ascontiguousarray(flagged, dtype=bool).reshape(self.rows, self.cols)
+        self.revealed_count = int(np.count_nonzero(self.revealed & ~self.mines))
+        self.flags_placed = int(np.count_nonzero(self.flagged))
+        self.mines_placed = True
+        self.calculate_adjacent_mines()
+        self.journal.clear()
+
+    def iter_revealed(self):
+        """
+        Yields the (row, col) of every revealed cell.
+        """
+        for index in np.flatnonzero(self.revealed):
+            yield divmod(int(index), self.cols)
+
+    @property
+    def safe_cells_remaining(self):
+        """
+        Number of non-mine cells still hidden; the game is won when this reaches zero.
+        """
+        return self.safe_cells - self.revealed_count
+
+    def is_valid_position(self, row, col):
+        """
+        Checks if the given position is within the bounds of the board.
+        """
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def row_symbols(self, row, first_col=0, last_col=None):
+        """
+        Returns the display symbols of the cells in a row, from `first_col` to `last_col` inclusive.
+        Computed for the whole slice at once from the arrays.
+        """
+        columns = slice(first_col, self.cols if last_col is None else last_col + 1)
+        symbols = COUNT_SYMBOLS[self.adjacent[row, columns]]
+        symbols = np.where(self.mines[row, columns], "*", symbols)
+        symbols = np.where(self.revealed[row, columns], symbols, "?")
+        symbols = np.where(self.flagged[row, columns], "F", symbols)
+        return symbols.tolist()
+
+    def __str__(self):
+        """
+        String representation of the board for debugging or display purposes.
+        """
+        return text_render.render(self)
@@ -0,0 +1,251 @@
+"""
+Vectorized batch of games, for training and evaluating agents.
+
+A BatchEnv holds N boards of one configuration as stacked NumPy arrays and steps them in
+lockstep: every step takes one action per board, and the reveals, cascades and win/loss
+checks of all boards run as whole-array operations instead of one Game at a time.
+Cascades spread one breadth-first level per iteration over every board at once, through
+the shared neighbor table of the board shape (see core.neighbors).
+
+The rules are those of core.game: a reveal on a flagged or revealed cell does nothing,
+deferred mines are placed around the first reveal (`first_click`), hitting a mine loses
+and revealing the last safe cell wins. Each game is drawn from its own seed exactly as
+`core.board.Board` would lay it out, so any board can be reproduced or inspected as a
+regular Game (see `game`). Finished boards are replaced by fresh games at the end of
+the step unless `auto_reset` is off.
+
+Example:
+    env = BatchEnv(4096, 9, 9, 10, first_click="neighborhood", seed=1)
+    observation = env.observation()
+    observation, revealed, done, won = env.step(policy(observation))
+"""
+import random
+
+import numpy as np
+
+from core import instrumentation
+from core.action_log import FLAG, REVEAL
+from core.array_board import ArrayBoard
+from core.game import Game
+from core.mines import safe_zone, sample_mine_indices, validate_first_click
+from core.neighbors import GRID, get_topology, neighbor_table
+
+# Codes of the cells that show no number in `observation`
+HIDDEN = -1
+FLAGGED = -2
+
+
+class BatchEnv:
+    """
+    `num_envs` games of `rows` x `cols` with `num_mines` mines, stepped together.
+    `first_click` and `topology` behave as on `core.board.Board`; `seed` makes the whole
+    sequence of games reproducible.
+    Board state is kept in (num_envs, rows, cols) arrays: `mines`, `revealed`, `flagged`
+    and `adjacent` (mine counts). Cells are addressed by flat index, row * cols + col.
+    """
+
+    def __init__(self, num_envs, rows, cols, num_mines, first_click=None, seed=None, topology=GRID,
+                 auto_reset=True):
+        validate_first_click(first_click)
+        if not 0 <= num_mines <= rows * cols:
+            raise ValueError(f"Cannot place {num_mines} mines in {rows * cols} cells.")
+        self.num_envs = num_envs
+        self.rows = rows
+        self.cols = cols
+        self.num_mines = num_mines
+        self.first_click = first_click
+        self.topology = get_topology(topology)
+        self.auto_reset = auto_reset
+        self.rng = random.Random(seed)  # Draws the seed of every game
+        self.safe_cells = rows * cols - num_mines  # Cells that must be revealed to win
+        self.table = neighbor_table(rows, cols, self.topology)
+        self.offsets, self.indices = (array.astype(np.int64) for array in self.table.numpy())
+
+        shape = (num_envs, rows, cols)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flagged = np.zeros(shape, dtype=bool)
+        self.adjacent = np.zeros(shape, dtype=np.uint8)
+        self.revealed_count = np.zeros(num_envs, dtype=np.int64)  # Safe cells revealed per board
+        self.mines_placed = np.zeros(num_envs, dtype=bool)
+        self.done = np.zeros(num_envs, dtype=bool)  # Only ever set while auto_reset is off
+        self.won = np.zeros(num_envs, dtype=bool)
+        self.seeds = np.zeros(num_envs, dtype=np.int64)  # Seed of each board's current game
+        self.generators = [None] * num_envs  # Random of each board whose mines are still deferred
+        self.games_played = 0
+        self.games_won = 0
+        self.reset()
+
+    def reset(self, envs=None):
+        """
+        Start new games on the given boards (all by default).
+        """
+        envs = np.arange(self.num_envs) if envs is None else np.atleast_1d(envs)
+        for env in envs:
+            seed = self.rng.randrange(2 ** 63)
+            self.seeds[env] = seed
+            self.generators[env] = random.Random(seed)
+        for array in (self.mines, self.revealed, self.flagged, self.adjacent):
+            array[envs] = 0
+        self.revealed_count[envs] = 0
+        self.mines_placed[envs] = False
+        self.done[envs] = False
+        self.won[envs] = False
+        if self.first_click is None:
+            self._place_mines(envs)
+
+    def _place_mines(self, envs, cells=None):
+        """
+        Lay out the mines of the given boards from their seeds, keeping the safe zone of
+        the first clicked `cells` clear, then count their neighbors.
+        """
+        total_cells = self.rows * self.cols
+        mines = self.mines.reshape(self.num_envs, total_cells)
+        for position, env in enumerate(envs):
+            excluded = ()
+            if cells is not None:
+                row, col = divmod(int(cells[position]), self.cols)
+                excluded = safe_zone(self.rows, self.cols, self.num_mines, row, col, self.first_click,
+                                     self.table.neighbors(row * self.cols + col))
+            mines[env, sample_mine_indices(total_cells, self.num_mines, self.generators[env], excluded)] = True
+            self.generators[env] = None
+        self.mines_placed[envs] = True
+
+        # Neighbor counts as differences of running sums over each cell's slice of the table
+        placed = mines[envs]
+        sums = np.zeros((len(envs), len(self.indices) + 1), dtype=np.int32)
+        np.cumsum(placed[:, self.indices], axis=1, out=sums[:, 1:])
+        counts = sums[:, self.offsets[1:]] - sums[:, self.offsets[:-1]]
+        counts[placed] = 0  # Mines keep a zero count, as on Board
+        self.adjacent.reshape(self.num_envs, total_cells)[envs] = counts
+
+    @instrumentation.timed("batch_env.step")
+    def step(self, cells, kinds=None):
+        """
+        Apply one action per board: `cells` holds a flat cell index per board (negative
+        to leave that board alone this step) and `kinds` the REVEAL or FLAG action of
+        core.action_log per board (all reveals by default). Finished boards ignore their
+        action until they are reset.
+        Returns (observation, revealed, done, won): the observation after the step, the
+        number of cells each board revealed, and which boards finished and which of those
+        were won. With auto_reset, finished boards already show their next game.
+        """
+        total_cells = self.rows * self.cols
+        cells = np.asarray(cells, dtype=np.int64).reshape(self.num_envs)
+        if (cells >= total_cells).any():
+            raise ValueError(f"Cell indices must be below {total_cells}.")
+        if kinds is None:
+            kinds = np.full(self.num_envs, REVEAL)
+        else:
+            kinds = np.asarray(kinds).reshape(self.num_envs)
+            if not np.isin(kinds, (REVEAL, FLAG)).all():
+                raise ValueError("Only REVEAL and FLAG actions can be batched.")
+
+        active = (cells >= 0) & ~self.done
+        envs = np.flatnonzero(active)
+        cells = cells[envs]
+        kinds = kinds[envs]
+        revealed = self.revealed.reshape(self.num_envs, total_cells)
+        flagged = self.flagged.reshape(self.num_envs, total_cells)
+
+        # Flags toggle on hidden cells only
+        flagging = kinds == FLAG
+        flag_envs, flag_cells = envs[flagging], cells[flagging]
+        hidden = ~revealed[flag_envs, flag_cells]
+        flagged[flag_envs[hidden], flag_cells[hidden]] ^= True
+
+        # Reveals skip flagged and already revealed cells
+        envs, cells = envs[~flagging], cells[~flagging]
+        playable = ~(revealed[envs, cells] | flagged[envs, cells])
+        envs, cells = envs[playable], cells[playable]
+        deferred = ~self.mines_placed[envs]
+        if deferred.any():
+            self._place_mines(envs[deferred], cells[deferred])
+        hit = self.mines.reshape(self.num_envs, total_cells)[envs, cells]
+        lost = np.zeros(self.num_envs, dtype=bool)
+        lost[envs[hit]] = True
+
+        uncovered = self._cascade(envs[~hit], cells[~hit])
+        self.revealed_count += uncovered
+        won = (self.revealed_count == self.safe_cells) & (uncovered > 0)
+        done = won | lost
+        self.games_played += int(done.sum())
+        self.games_won += int(won.sum())
+        self.done |= done
+        self.won |= won
+        if self.auto_reset and done.any():
+            self.reset(np.flatnonzero(done))
+        return self.observation(), uncovered, done, won
+
+    def _cascade(self, envs, cells):
+        """
+        Reveal the given cells and flood every board's cascade together, one
+        breadth-first level per iteration. Returns the number of cells revealed per board.
+        """
+        total_cells = self.rows * self.cols
+        offsets, indices = self.offsets, self.indices
+        revealed = self.revealed.reshape(-1)  # Indexed by env * total_cells + cell
+        adjacent = self.adjacent.reshape(-1)
+        blocked = revealed | self.flagged.reshape(-1)  # Doubles as the visited bitmap
+
+        frontier = envs * total_cells + cells
+        blocked[frontier] = True
+        revealed[frontier] = True
+        uncovered = np.bincount(envs, minlength=self.num_envs)
+        while frontier.size:
+            frontier = frontier[adjacent[frontier] == 0]  # Only blank cells spread
+            if not frontier.size:
+                break
+            env, cell = np.divmod(frontier, total_cells)
+            # Gather the table slices of all frontier cells at once
+            starts = offsets[cell]
+            lengths = offsets[cell + 1] - starts
+            ends = np.cumsum(lengths)
+            positions = np.arange(ends[-1]) + np.repeat(starts - ends + lengths, lengths)
+            neighbors = np.repeat(env * total_cells, lengths) + indices[positions]
+            frontier = np.unique(neighbors[~blocked[neighbors]])
+            blocked[frontier] = True
+            revealed[frontier] = True
+            uncovered += np.bincount(frontier // total_cells, minlength=self.num_envs)
+        return uncovered
+
+    def observation(self):
+        """
+        The visible state as an int8 (num_envs, rows, cols) array: the mine count of
+        revealed cells, HIDDEN for hidden cells and FLAGGED for flagged ones.
+        """
+        observation = self.adjacent.astype(np.int8)
+        observation[~self.revealed] = HIDDEN
+        observation[self.flagged] = FLAGGED
+        return observation
+
+    def planes(self):
+        """
+        The visible state as separate (num_envs, rows, cols) planes: (numbers, hidden,
+        flagged), where numbers is the mine count of revealed cells and 0 elsewhere.
+        `flagged` is the environment's own array, not a copy.
+        """
+        numbers = np.where(self.revealed, self.adjacent, 0).astype(np.uint8)
+        return numbers, ~self.revealed, self.flagged
+
+    def action_mask(self):
+        """
+        A (num_envs, rows * cols) boolean array of the cells a reveal would open.
+        """
+        return ~(self.revealed | self.flagged).reshape(self.num_envs, -1)
+
+    def game(self, env):
+        """
+        A regular Game holding a copy of one board's current state, e.g. to display it
+        or hand it to core.solver. `Game(rows, cols, num_mines, seed=env.seeds[i], ...)`
+        replays the same layout from scratch.
+        """
+        board = ArrayBoard(self.rows, self.cols, self.num_mines, seed=int(self.seeds[env]),
+                           first_click=self.first_click, topology=self.topology)
+        if self.mines_placed[env]:
+            board.set_planes(self.mines[env].copy(), self.revealed[env].copy(), self.flagged[env].copy())
+        else:
+            for index in np.flatnonzero(self.flagged[env]):
+                board.toggle_flag(*divmod(int(index), self.cols))
+            board.journal.clear()
+        return Game.from_board(board, is_game_over=bool(self.done[env]), is_winner=bool(self.won[env]))
@@ -1,57 +1,100 @@
-import random
 from collections import deque
+from core import instrumentation, text_render
 from core.cell import Cell
+from core.journal import FLAG, PLACE, REVEAL, Journal, JournaledBoard
+from core.mines import resolve_seed, safe_zone, sample_mine_indices, validate_first_click
+from core.neighbors import GRID, MAX_TABLE_CELLS, get_topology, neighbor_table
 
 
-class Board:
-    def __init__(self, rows, cols, num_mines):
+class Board(JournaledBoard):
+    def __init__(self, rows, cols, num_mines, seed=None, first_click=None, topology=GRID):
         """
         Initializes a new Minesweeper board with the given number of rows, columns, and mines.
+        `seed` (an int or a random.Random) makes the mine layout reproducible.
+        `first_click` defers mine placement until the first reveal so that the revealed
+        cell ("cell") or the cell and its neighbors ("neighborhood") are never mines.
+        `topology` (a name from `core.neighbors.TOPOLOGIES` or a Topology) says which
+        cells are neighbors.
         """
+        validate_first_click(first_click)
         self.rows = rows
         self.cols = cols
         self.num_mines = num_mines
+        self.rng, self.seed = resolve_seed(seed)
+        self.first_click = first_click
+        self.topology = get_topology(topology)
+        self.mines_placed = False
+        self.safe_cells = rows * cols - num_mines  # Cells that must be revealed to win
+        self.revealed_count = 0  # Safe cells revealed so far
+        self.flags_placed = 0    # Cells currently flagged
         self.grid = [[Cell() for _ in range(cols)] for _ in range(rows)]  # Create a grid of cells
-        self._place_mines()  # Place the mines randomly
-        self.calculate_adjacent_mines()  # Calculate adjacent mines for all cells
+        self.cells = [cell for cells in self.grid for cell in cells]  # The same cells, by flat index
+        self.neighbor_table = None  # Plain grids too large for a table compute neighbors on the fly
+        if self.topology != GRID or rows * cols <= MAX_TABLE_CELLS:
+            self.neighbor_table = neighbor_table(rows, cols, self.topology)  # Shared by boards of this shape
+        self.journal = Journal()  # Reversible record of changes, for snapshots
+        if first_click is None:
+            self._place_mines()  # Place the mines randomly
+            self.calculate_adjacent_mines()  # Calculate adjacent mines for all cells
 
-    def _place_mines(self):
+    def _place_mines(self, excluded=()):
         """
-        Randomly places mines on the board.
+        Randomly places mines on the board, keeping the flat indices in `excluded` clear.
         """
-        mines_placed = 0
-        while mines_placed < self.num_mines:
-            row = random.randint(0, self.rows - 1)
-            col = random.randint(0, self.cols - 1)
-            if not self.grid[row][col].is_mine:  # Ensure no duplicate mine placement
-                self.grid[row][col].is_mine = True
-                mines_placed += 1
+        for index in sample_mine_indices(self.rows * self.cols, self.num_mines, self.rng, excluded):
+            self.cells[index].is_mine = True
+        self.mines_placed = True
+
+    def ensure_mines_placed(self, row, col):
+        """
+        Places deferred mines around a first click at (row, col). Does nothing if the
+        mines are already on the board.
+        """
+        if self.mines_placed:
+            return
+        self.journal.record(PLACE, self.rng.getstate())
+        neighbors = self._neighbor_indices(row * self.cols + col) if self.neighbor_table is not None else None
+        self._place_mines(safe_zone(self.rows, self.cols, self.num_mines, row, col, self.first_click, neighbors))
+        self.calculate_adjacent_mines()
 
     def calculate_adjacent_mines(self):
         """
         Calculates the number of mines adjacent to each non-mine cell.
+        Each mine adds one to its neighbors, so the cost follows the number of mines
+        rather than the number of cells times their neighbors.
         """
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if not self.grid[row][col].is_mine:
-                    self.grid[row][col].adjacent_mines = self._count_adjacent_mines(row, col)
+        counts = [0] * (self.rows * self.cols)
+        neighbors = self._neighbor_indices
+        for index, cell in enumerate(self.cells):
+            if cell.is_mine:
+                for neighbor in neighbors(index):
+                    counts[neighbor] += 1
+        for cell, count in zip(self.cells, counts):
+            cell.adjacent_mines = 0 if cell.is_mine else count
 
     def _count_adjacent_mines(self, row, col):
         """
         Counts how many mines are adjacent to the given cell.
         """
+        cells = self.cells
+        return sum(cells[index].is_mine for index in self._neighbor_indices(row * self.cols + col))
 
-        # Create a list of tuples to navigate surrounding cells
-        adjacent_positions = [(-1, -1), (-1, 0), (-1, 1),
-                              (0, -1),          (0, 1),
-                              (1, -1), (1, 0), (1, 1)]
-        mine_count = 0
-        for row_offset, column_offset in adjacent_positions:
-            surrounding_row, surrounding_column = row + row_offset, col + column_offset
-            if self.is_valid_position(surrounding_row, surrounding_column):
-                if self.grid[surrounding_row][surrounding_column].is_mine:
-                    mine_count += 1
-        return mine_count
+    def neighbors(self, row, col):
+        """
+        Returns the (row, col) positions of the neighbors of a cell.
+        """
+        if self.neighbor_table is None:
+            return self.topology.positions(self.rows, self.cols, row, col)
+        return self.neighbor_table.positions(row, col)
+
+    def _neighbor_indices(self, index):
+        """
+        Returns the flat indices of the neighbors of the cell at flat `index`.
+        """
+        if self.neighbor_table is None:
+            cols = self.cols
+            return [r * cols + c for r, c in self.topology.positions(self.rows, cols, *divmod(index, cols))]
+        return self.neighbor_table.neighbors(index)
 
     # Depth first search implementation of reveal_cell
     #
@@ -80,64 +123,168 @@ class Board:
     #     return True
 
     # Breadth first search of reveal cell
+    @instrumentation.timed("board.reveal_cell")
     def reveal_cell(self, row, col):
         """
         Reveals a specific cell and propagates the reveal using breadth-first search
         if the cell has no adjacent mines.
+        Returns a list of (row, col) positions that were revealed by this call,
+        which is empty if the position is invalid, already revealed or flagged.
         """
         if not self.is_valid_position(row, col) or self.grid[row][col].is_revealed:
-            return False  # Invalid position or already revealed
+            return []  # Invalid position or already revealed
+        self.ensure_mines_placed(row, col)
 
-        # Create a queue to manage cells to process
-        queue = deque()
-        queue.append((row, col))  # Start with the given cell
+        rows, cols = self.rows, self.cols
+        cells = self.cells
 
-        # Create a list of tuples to navigate surrounding cells
+        start = row * cols + col
+        if not cells[start].reveal():
+            return []  # Flagged cells stay hidden
+        # Cells are revealed as they are queued, so their state doubles as the visited set
+        # and no per-call bitmap over the whole board is needed
+        queue = deque([start])
+        revealed = []
+
+        table = self.neighbor_table
+        if table is not None:
+            # Neighbors of flat index i are indices[offsets[i]:offsets[i + 1]]
+            offsets, indices = table.offsets, table.indices
+            while queue:
+                index = queue.popleft()  # Pop the next cell from the queue
+                revealed.append(divmod(index, cols))
+
+                # If the current cell has no adjacent mines, add its neighbors to the queue
+                if cells[index].adjacent_mines == 0:
+                    for neighbor in indices[offsets[index]:offsets[index + 1]]:
+                        cell = cells[neighbor]
+                        if not cell.is_revealed and not cell.is_flagged:
+                            cell.is_revealed = True
+                            queue.append(neighbor)  # Add to queue for processing
+
+        # Offsets of the eight neighbors, as (row offset, column offset), for grids without a table
         adjacent_positions = [(-1, -1), (-1, 0), (-1, 1),
                               (0, -1), (0, 1),
                               (1, -1), (1, 0), (1, 1)]
 
         while queue:
-            current_row, current_col = queue.popleft()  # Pop the next cell from the queue
-            current_cell = self.grid[current_row][current_col]
+            index = queue.popleft()
+            current_row, current_col = divmod(index, cols)
+            revealed.append((current_row, current_col))
 
-            # Skip if already revealed (this can happen with multiple queue additions)
-            if current_cell.is_revealed:
-                continue
-
-            # Reveal the current cell
-            current_cell.reveal()
-
-            # If the current cell has no adjacent mines, add its neighbors to the queue
-            if current_cell.adjacent_mines == 0:
+            if cells[index].adjacent_mines == 0:
                 for dr, dc in adjacent_positions:
                     new_row, new_col = current_row + dr, current_col + dc
-                    if self.is_valid_position(new_row, new_col):
-                        neighbor_cell = self.grid[new_row][new_col]
-                        if not neighbor_cell.is_revealed and (new_row, new_col) not in queue:
-                            queue.append((new_row, new_col))  # Add to queue for processing
+                    if 0 <= new_row < rows and 0 <= new_col < cols:
+                        cell = cells[new_row * cols + new_col]
+                        if not cell.is_revealed and not cell.is_flagged:
+                            cell.is_revealed = True
+                            queue.append(new_row * cols + new_col)
+        self.revealed_count += len(revealed)
+
+        if revealed:
+            self.journal.record(REVEAL, (revealed, len(revealed)))
+        instrumentation.observe("board.reveal_cell.cells", len(revealed))
+        return revealed
+
+    def _reveal_hidden(self):
+        """
+        Reveals every hidden cell; returns (journal cells, revealed positions) for reveal_all.
+        """
+        revealed = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                cell = self.grid[row][col]
+                if not cell.is_revealed:
+                    cell.is_revealed = True
+                    revealed.append((row, col))
+        return revealed, revealed
 
+    def toggle_flag(self, row, col):
+        """
+        Toggles the flag on a hidden cell and keeps the flag counter up to date.
+        Returns True if the flag state changed, False if the cell is already revealed.
+        """
+        if self.grid[row][col].is_revealed:
+            return False
+        self.flags_placed += 1 if self._flip_flag(row, col) else -1
+        self.journal.record(FLAG, (row, col))
         return True
 
+    def _flip_flag(self, row, col):
+        cell = self.grid[row][col]
+        cell.toggle_flag()
+        return cell.is_flagged
+
+    def _hide(self, cells):
+        for row, col in cells:
+            self.grid[row][col].is_revealed = False
+        return cells
+
+    def _unplace_mines(self, rng_state):
+        for cell in self.cells:
+            cell.is_mine = False
+            cell.adjacent_mines = 0
+        self.rng.setstate(rng_state)
+
+    def get_planes(self):
+        """
+        Returns the (mines, revealed, flagged) state as three lists of rows of booleans.
+        """
+        mines = [[cell.is_mine for cell in row] for row in self.grid]
+        revealed = [[cell.is_revealed for cell in row] for row in self.grid]
+        flagged = [[cell.is_flagged for cell in row] for row in self.grid]
+        return mines, revealed, flagged
+
+    def set_planes(self, mines, revealed, flagged):
+        """
+        Replaces the board state with the given (mines, revealed, flagged) rows of booleans,
+        then recomputes the adjacency counts and the counters.
+        """
+        self.revealed_count = 0
+        self.flags_placed = 0
+        for cells, mine_row, revealed_row, flagged_row in zip(self.grid, mines, revealed, flagged):
+            for cell, is_mine, is_revealed, is_flagged in zip(cells, mine_row, revealed_row, flagged_row):
+                cell.is_mine = bool(is_mine)
+                cell.is_revealed = bool(is_revealed)
+                cell.is_flagged = bool(is_flagged)
+                self.revealed_count += cell.is_revealed and not cell.is_mine
+                self.flags_placed += cell.is_flagged
+        self.mines_placed = True
+        self.calculate_adjacent_mines()
+        self.journal.clear()
+
+    def iter_revealed(self):
+        """
+        Yields the (row, col) of every revealed cell.
+        """
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self.grid[row][col].is_revealed:
+                    yield row, col
+
+    @property
+    def safe_cells_remaining(self):
+        """
+        Number of non-mine cells still hidden; the game is won when this reaches zero.
+        """
+        return self.safe_cells - self.revealed_count
+
     def is_valid_position(self, row, col):
         """
         Checks if the given position is within the bounds of the board.
         """
         return 0 <= row < self.rows and 0 <= col < self.cols
 
+    def row_symbols(self, row, first_col=0, last_col=None):
+        """
+        Returns the display symbols of the cells in a row, from `first_col` to `last_col` inclusive.
+        """
+        last_col = self.cols - 1 if last_col is None else last_col
+        return [str(cell) for cell in self.grid[row][first_col:last_col + 1]]
+
     def __str__(self):
         """
         String representation of the board for debugging or display purposes.
         """
-        row_count = 0
-
-        # Generate the numbers leading up to `col`
-        columns = list(range(self.cols))
-        board_str = f"  {' '.join(str(col) for col in columns)}\n"
-        for row in self.grid:
-            board_str += str(row_count) + " "
-            row_count += 1
-            for cell in row:
-                board_str += str(cell) + " "
-            board_str += "\n"
-        return board_str
+        return text_render.render(self)
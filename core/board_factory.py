@@ -0,0 +1,252 @@
+"""
+Background pre-generation of games.
+
+A BoardFactory keeps a small queue of ready games for one configuration, filled by a
+worker thread, so starting a new game never waits on board construction. It can also
+deal "no-guess" games: boards the solver clears from the opening click by pure
+deduction, found by trying seeds until one is solvable. That search is the expensive
+part, so it is spread over a process pool.
+
+Layouts are fully determined by the configuration and the seed, so the optional disk
+cache only stores seeds: the ones found solvable but not dealt yet are written back when
+the factory closes, and dealt first on the next run.
+
+Example:
+    factory = BoardFactory(16, 30, 99, no_guess=True)
+    game = factory.get()  # Ready at once if the queue has a game
+    factory.close()
+"""
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+
+from core.game import Game
+from core.mines import SAFE_NEIGHBORHOOD
+
+SEARCH_BATCH = 16  # Seeds each worker tries per task when searching for no-guess boards
+DEFAULT_PROCESSES = 2  # Search processes per factory; each one holds a full interpreter
+
+
+def start_cell(rows, cols):
+    """
+    Cell a no-guess game is opened at.
+    """
+    return rows // 2, cols // 2
+
+
+def is_no_guess(game, row, col):
+    """
+    Whether the solver wins the game from a reveal at (row, col) without ever guessing.
+    The game is left as it was.
+    """
+    snapshot = game.snapshot()
+    game.reveal_cell(row, col)
+    game.auto_play(guess=False)
+    solved = game.is_winner
+    game.restore(snapshot)
+    return solved
+
+
+def search_no_guess(rows, cols, num_mines, engine, first_click, seeds):
+    """
+    Return the first of `seeds` giving a no-guess board, or None. Runs in worker processes.
+    """
+    row, col = start_cell(rows, cols)
+    for seed in seeds:
+        game = Game(rows, cols, num_mines, engine=engine, seed=seed, first_click=first_click, record=False)
+        if is_no_guess(game, row, col):
+            return seed
+    return None
+
+
+class BoardFactory:
+    """
+    Pre-generates games for one configuration in the background.
+    `size` games are kept ready. No-guess games are opened at `start_cell` and searched
+    for on `processes` worker processes (DEFAULT_PROCESSES by default, capped by the
+    cores; 0 searches in the worker thread). The pool is only started for no-guess games. `cache_dir` enables the on-disk seed cache.
+    """
+
+    def __init__(self, rows, cols, num_mines, engine="classic", first_click=None, no_guess=False,
+                 size=2, processes=None, cache_dir=None, seed=None):
+        if no_guess and first_click is None:
+            first_click = SAFE_NEIGHBORHOOD  # The opening must be a safe cascade to be solvable
+        self.rows = rows
+        self.cols = cols
+        self.num_mines = num_mines
+        self.engine = engine
+        self.first_click = first_click
+        self.no_guess = no_guess
+        self.cache_dir = cache_dir
+        self.rng = random.Random(seed)  # Draws the seed of every game
+        self.ready = queue.Queue(maxsize=size)
+        self.cached_seeds = self.load_cache()
+        if processes is None:
+            processes = min(DEFAULT_PROCESSES, os.cpu_count() or 1)
+        self.processes = processes
+        self.executor = None
+        if no_guess and self.processes > 0:
+            self.executor = ProcessPoolExecutor(max_workers=self.processes)
+        self.closed = threading.Event()
+        self.error = None  # Exception that stopped the worker thread, raised by get
+        self.thread = threading.Thread(target=self.fill, name="board-factory", daemon=True)
+        self.thread.start()
+
+    @property
+    def config_key(self):
+        mode = "noguess" if self.no_guess else self.first_click or "plain"
+        return f"{self.rows}x{self.cols}-{self.num_mines}-{self.engine}-{mode}"
+
+    def matches(self, rows, cols, num_mines, engine="classic", first_click=None, no_guess=False):
+        """
+        Whether this factory deals games of the given configuration.
+        """
+        if no_guess and first_click is None:
+            first_click = SAFE_NEIGHBORHOOD
+        return (rows, cols, num_mines, engine, first_click, no_guess) == (
+            self.rows, self.cols, self.num_mines, self.engine, self.first_click, self.no_guess)
+
+    def get(self, block=True, timeout=None):
+        """
+        Take a ready game, with its clock started now.
+        If none is ready, plain games are built on the spot, while no-guess games are
+        waited for (`block`, `timeout`); returns None if none arrives in time.
+        Raises RuntimeError if the worker thread failed, so callers never wait on it forever.
+        """
+        try:
+            game = self.ready.get_nowait()
+        except queue.Empty:
+            self.check_worker()
+            if not self.no_guess:
+                game = self.build(self.rng.randrange(2 ** 63))
+            elif not block:
+                return None
+            else:
+                game = self.wait_ready(timeout)
+                if game is None:
+                    return None
+        game.start_time = time.time()
+        if game.action_log is not None:
+            game.action_log.restart_clock()  # Its clock started when the game was built
+        return game
+
+    def wait_ready(self, timeout=None):
+        """
+        Wait up to `timeout` seconds (forever by default) for a ready game, or None.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = 0.1 if deadline is None else min(max(deadline - time.monotonic(), 0), 0.1)
+            try:
+                return self.ready.get(timeout=wait)
+            except queue.Empty:
+                self.check_worker()
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+
+    def check_worker(self):
+        if self.error is not None:
+            raise RuntimeError(f"Board generation failed: {self.error}") from self.error
+
+    def build(self, seed):
+        """
+        Generate the game of a seed, opened at the start cell for no-guess games.
+        The opening is part of the deal, so it cannot be undone.
+        """
+        game = Game(self.rows, self.cols, self.num_mines, engine=self.engine, seed=seed,
+                    first_click=self.first_click)
+        if self.no_guess:
+            game.reveal_cell(*start_cell(self.rows, self.cols))
+            game.pop_changes()  # A new grid is drawn in full anyway
+            # Undoing the opening would unplace the mines the solver checked; drop it from
+            # the history and let the journal forget it, so it becomes the starting state
+            game.history_base += len(game.history)
+            game.history.clear()
+            game.board.journal.discard_before(game.board.snapshot())
+        return game
+
+    def fill(self):
+        """
+        Worker thread: keeps the queue topped up until the factory is closed.
+        """
+        try:
+            for seed in self.seeds():
+                game = self.build(seed)
+                queued = False
+                while not queued and not self.closed.is_set():
+                    try:
+                        self.ready.put(game, timeout=0.1)
+                        queued = True
+                    except queue.Full:
+                        continue
+                if not queued:
+                    if self.no_guess:
+                        self.cached_seeds.append(seed)  # Found, but not dealt; keep for next time
+                    return
+        except Exception as error:
+            if isinstance(error, (CancelledError, RuntimeError)) and self.closed.is_set():
+                return  # The process pool was shut down under the search
+            self.error = error  # Reported by get
+
+    def seeds(self):
+        """
+        Yield the seeds of the games to deal: cached ones first, then new ones (searched
+        for in parallel for no-guess games).
+        """
+        while self.cached_seeds and not self.closed.is_set():
+            yield self.cached_seeds.pop()
+        if not self.no_guess:
+            while not self.closed.is_set():
+                yield self.rng.randrange(2 ** 63)
+            return
+
+        config = (self.rows, self.cols, self.num_mines, self.engine, self.first_click)
+        if self.executor is None:
+            while not self.closed.is_set():
+                seed = search_no_guess(*config, [self.rng.randrange(2 ** 63) for _ in range(SEARCH_BATCH)])
+                if seed is not None:
+                    yield seed
+            return
+
+        # Keep every worker busy with a batch of candidate seeds
+        pending = []
+        while not self.closed.is_set():
+            while len(pending) < self.processes:
+                candidates = [self.rng.randrange(2 ** 63) for _ in range(SEARCH_BATCH)]
+                pending.append(self.executor.submit(search_no_guess, *config, candidates))
+            seed = pending.pop(0).result()
+            if seed is not None:
+                yield seed
+
+    def cache_path(self):
+        return os.path.join(self.cache_dir, f"{self.config_key}.seeds")
+
+    def load_cache(self):
+        if not self.cache_dir or not os.path.exists(self.cache_path()):
+            return []
+        with open(self.cache_path()) as file:
+            return [int(line) for line in file if line.strip()]
+
+    def close(self):
+        """
+        Stop the background work. No-guess games that were found but not dealt are
+        saved to the cache.
+        """
+        self.closed.set()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.thread.join()
+        while True:
+            try:
+                game = self.ready.get_nowait()
+            except queue.Empty:
+                break
+            if self.no_guess:
+                self.cached_seeds.append(game.board.seed)
+        if self.cache_dir and self.no_guess:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.cache_path(), "w") as file:
+                file.writelines(f"{seed}\n" for seed in self.cached_seeds)
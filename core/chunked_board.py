@@ -0,0 +1,456 @@
+import math
+import random
+from collections import OrderedDict, deque
+
+from core import instrumentation, text_render
+from core.journal import FLAG, PLACE, REVEAL, Journal, JournaledBoard
+from core.mines import SAFE_NEIGHBORHOOD, resolve_seed, sample_mine_indices, validate_first_click
+from core.neighbors import GRID, get_topology
+
+DEFAULT_DENSITY = 0.16  # Mine density of unbounded boards, close to an expert board
+# Below this density the mine-free regions of an unbounded board percolate, so a single
+# click could cascade forever
+MIN_UNBOUNDED_DENSITY = 0.12
+
+# Offsets of the eight neighbors of a cell
+ADJACENT_POSITIONS = [(-1, -1), (-1, 0), (-1, 1),
+                      (0, -1), (0, 1),
+                      (1, -1), (1, 0), (1, 1)]
+
+
+class ChunkCellView:
+    """
+    Lightweight view of a single cell in a ChunkedBoard, mirroring `core.cell.Cell`.
+    """
+    __slots__ = ("_board", "row", "col")
+
+    def __init__(self, board, row, col):
+        self._board = board
+        self.row = row
+        self.col = col
+
+    @property
+    def is_mine(self):
+        return self._board.is_mine(self.row, self.col)
+
+    @property
+    def is_revealed(self):
+        return self._board.is_revealed(self.row, self.col)
+
+    @is_revealed.setter
+    def is_revealed(self, value):
+        self._board.set_revealed(self.row, self.col, value)
+
+    @property
+    def is_flagged(self):
+        return self._board.is_flagged(self.row, self.col)
+
+    @property
+    def adjacent_mines(self):
+        return self._board.adjacent_mines(self.row, self.col)
+
+    @property
+    def is_clear(self):
+        return not self.is_mine and self.adjacent_mines == 0
+
+    def __str__(self):
+        """
+        String representation of the cell for debugging or display purposes.
+        """
+        if self.is_flagged:
+            return "F"  # Flagged
+        if not self.is_revealed:
+            return "?"  # Hidden
+        if self.is_mine:
+            return "*"  # Mine
+        if self.adjacent_mines == 0:
+            return " "  # Blank if no adjacent mines
+        return str(self.adjacent_mines)  # Number of adjacent mines if revealed
+
+
+class ChunkRowView:
+    __slots__ = ("_board", "row")
+
+    def __init__(self, board, row):
+        self._board = board
+        self.row = row
+
+    def __getitem__(self, col):
+        return ChunkCellView(self._board, self.row, col)
+
+
+class ChunkGridView:
+    """
+    Facade so `board.grid[row][col]` works on a ChunkedBoard. Unlike the other boards the
+    grid cannot be iterated, since it may be unbounded.
+    """
+    __slots__ = ("_board",)
+
+    def __init__(self, board):
+        self._board = board
+
+    def __getitem__(self, row):
+        return ChunkRowView(self._board, row)
+
+
+class ChunkedBoard(JournaledBoard):
+    """
+    Minesweeper board generated lazily in fixed-size square chunks.
+
+    The mines of each chunk are derived deterministically from the board seed and the
+    chunk coordinates, so a chunk is only generated when a reveal or an adjacency lookup
+    touches it, and generated chunks can be evicted and regenerated identically later.
+    Only the player's state (revealed and flagged cells) of touched chunks is kept for
+    good, so memory is proportional to the explored region.
+
+    Pass rows=None and cols=None for a board that is unbounded in every direction; its
+    mines are spread at `density` and it cannot be won.
+    """
+
+    def __init__(self, rows, cols, num_mines, seed=None, first_click=None, chunk_size=64,
+                 max_cached_chunks=1024, density=None, topology=GRID):
+        """
+        Initializes a chunked board. Nothing is generated until cells are accessed.
+        For bounded boards exactly `num_mines` mines are spread over the chunks in proportion
+        to their area; with first-click safety, mines in the cleared zone are moved to the
+        next free cells of their chunks, so the total stays the same.
+        Only the grid topology is supported, since neighbor tables need a finite board.
+        """
+        validate_first_click(first_click)
+        if get_topology(topology) != GRID:
+            raise ValueError("Chunked boards only support the grid topology.")
+        self.topology = GRID
+        self.rows = rows
+        self.cols = cols
+        self.bounded = rows is not None and cols is not None
+        self.chunk_size = chunk_size
+        self.max_cached_chunks = max_cached_chunks
+
+        if self.bounded:
+            if not 0 <= num_mines <= rows * cols:
+                raise ValueError(f"Cannot place {num_mines} mines in {rows * cols} cells.")
+            self.num_mines = num_mines
+            self.generated_mines = num_mines  # Before first-click clearing; fixes each chunk's share
+            self.safe_cells = rows * cols - num_mines  # Cells that must be revealed to win
+        else:
+            self.density = DEFAULT_DENSITY if density is None else density
+            if not MIN_UNBOUNDED_DENSITY <= self.density < 1:
+                raise ValueError(f"Unbounded boards need a mine density between {MIN_UNBOUNDED_DENSITY} and 1.")
+            self.num_mines = math.inf
+            self.safe_cells = math.inf
+
+        self.rng, self.seed = resolve_seed(seed)
+        if self.seed is None:
+            self.seed = self.rng.randrange(2 ** 63)  # Chunks are keyed by a concrete seed
+        self.first_click = first_click
+        self.mines_placed = first_click is None
+        self.cleared = set()  # Cells kept free of mines by first-click safety
+        self.relocated = set()  # Cells holding the mines moved out of the cleared zone
+
+        self.revealed_count = 0  # Safe cells revealed so far
+        self.flags_placed = 0    # Cells currently flagged
+        self.mine_cache = OrderedDict()  # Chunk -> [mines, adjacency counts], least recently used first
+        self.state = {}  # Chunk -> [revealed, flagged] for every chunk the player has touched
+        self.grid = ChunkGridView(self)
+        self.journal = Journal()  # Reversible record of changes, for snapshots
+
+    def _chunk_of(self, row, col):
+        size = self.chunk_size
+        return (row // size, col // size), (row % size) * size + col % size
+
+    def _chunk_bounds(self, chunk):
+        """
+        Returns (first_row, first_col, height, width) of a chunk, clipped to the board.
+        """
+        size = self.chunk_size
+        first_row, first_col = chunk[0] * size, chunk[1] * size
+        height = width = size
+        if self.bounded:
+            height = min(size, self.rows - first_row)
+            width = min(size, self.cols - first_col)
+        return first_row, first_col, height, width
+
+    def _chunk_mine_count(self, chunk):
+        """
+        Number of mines in a chunk. On bounded boards every chunk takes its share of the
+        running total by cumulative area, so the counts add up to exactly num_mines.
+        """
+        first_row, first_col, height, width = self._chunk_bounds(chunk)
+        if not self.bounded:
+            return round(self.density * height * width)
+        total = self.rows * self.cols
+        start = first_row * self.cols + first_col * height  # Cells in all earlier chunks
+        end = start + height * width
+        mines = self.generated_mines
+        return end * mines // total - start * mines // total
+
+    def _chunk_mines(self, chunk):
+        """
+        Returns the cached [mines, counts] entry of a chunk, generating it if needed.
+        """
+        entry = self.mine_cache.get(chunk)
+        if entry is not None:
+            self.mine_cache.move_to_end(chunk)
+            return entry
+
+        size = self.chunk_size
+        first_row, first_col, height, width = self._chunk_bounds(chunk)
+        mines = bytearray(size * size)
+        rng = random.Random(f"{self.seed}:{chunk[0]}:{chunk[1]}")
+        for index in sample_mine_indices(height * width, self._chunk_mine_count(chunk), rng):
+            mines[(index // width) * size + index % width] = 1
+        for row, col in self.cleared:
+            if self._chunk_of(row, col)[0] == chunk:
+                mines[self._chunk_of(row, col)[1]] = 0
+        for row, col in self.relocated:
+            if self._chunk_of(row, col)[0] == chunk:
+                mines[self._chunk_of(row, col)[1]] = 1
+
+        entry = [mines, bytearray(b"\xff" * (size * size))]  # 255 marks a count not computed yet
+        self.mine_cache[chunk] = entry
+        while len(self.mine_cache) > self.max_cached_chunks:
+            self.mine_cache.popitem(last=False)  # Evict the coldest chunk; it can be regenerated
+        return entry
+
+    def _chunk_state(self, chunk, create=False):
+        state = self.state.get(chunk)
+        if state is None and create:
+            size = self.chunk_size
+            state = self.state[chunk] = [bytearray(size * size), bytearray(size * size)]
+        return state
+
+    def is_mine(self, row, col):
+        chunk, index = self._chunk_of(row, col)
+        return bool(self._chunk_mines(chunk)[0][index])
+
+    def is_revealed(self, row, col):
+        chunk, index = self._chunk_of(row, col)
+        state = self.state.get(chunk)
+        return state is not None and bool(state[0][index])
+
+    def set_revealed(self, row, col, value=True):
+        chunk, index = self._chunk_of(row, col)
+        self._chunk_state(chunk, create=True)[0][index] = bool(value)
+
+    def is_flagged(self, row, col):
+        chunk, index = self._chunk_of(row, col)
+        state = self.state.get(chunk)
+        return state is not None and bool(state[1][index])
+
+    def adjacent_mines(self, row, col):
+        """
+        Counts the mines around a cell, generating neighboring chunks as needed.
+        Counts are cached with the chunk's mines and recomputed if it is evicted.
+        """
+        chunk, index = self._chunk_of(row, col)
+        counts = self._chunk_mines(chunk)[1]
+        if counts[index] == 255:
+            count = 0
+            for dr, dc in ADJACENT_POSITIONS:
+                new_row, new_col = row + dr, col + dc
+                if self.is_valid_position(new_row, new_col) and self.is_mine(new_row, new_col):
+                    count += 1
+            counts = self._chunk_mines(chunk)[1]  # The entry may have been evicted meanwhile
+            counts[index] = count
+            return count
+        return counts[index]
+
+    def neighbors(self, row, col):
+        """
+        Returns the (row, col) positions of the neighbors of a cell.
+        """
+        return [(row + dr, col + dc) for dr, dc in ADJACENT_POSITIONS if self.is_valid_position(row + dr, col + dc)]
+
+    def ensure_mines_placed(self, row, col):
+        """
+        Clears the first-click zone around (row, col) when placement is deferred.
+        On bounded boards each mine of the zone is moved to the next free cell of its chunk,
+        so the count is kept; unbounded boards just drop them, as their density is nominal.
+        """
+        if self.mines_placed:
+            return
+        self.journal.record(PLACE, (self.num_mines, self.safe_cells, set(self.cleared), set(self.relocated)))
+        zone = [(row, col)]
+        if self.first_click == SAFE_NEIGHBORHOOD:
+            zone = [(row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)]
+        zone = {position for position in zone if self.is_valid_position(*position)}
+        for position in sorted(zone):
+            if not self.is_mine(*position):
+                continue
+            self.cleared.add(position)
+            if self.bounded:
+                target = self._free_cell(position, zone)
+                if target is None:
+                    # Every other cell is already a mine, so the mine has nowhere to go
+                    self.num_mines -= 1
+                    self.safe_cells += 1
+                else:
+                    self.relocated.add(target)
+        self.mine_cache.clear()  # Regenerate with the zone cleared and counts recomputed
+        self.mines_placed = True
+
+    def _free_cell(self, position, zone):
+        """
+        Returns the first cell after `position` that can take a moved mine, scanning its own
+        chunk first and then the whole board in row-major order, or None if there is none.
+        The scan only depends on the seed and the click, so the result is deterministic.
+        """
+        def is_free(row, col):
+            return ((row, col) not in zone and (row, col) not in self.relocated
+                    and not self.is_mine(row, col))
+
+        chunk = self._chunk_of(*position)[0]
+        first_row, first_col, height, width = self._chunk_bounds(chunk)
+        area = height * width
+        start = (position[0] - first_row) * width + position[1] - first_col
+        for step in range(1, area):
+            index = (start + step) % area
+            row, col = first_row + index // width, first_col + index % width
+            if is_free(row, col):
+                return row, col
+        total = self.rows * self.cols
+        start = position[0] * self.cols + position[1]
+        for step in range(1, total):
+            row, col = divmod((start + step) % total, self.cols)
+            if is_free(row, col):
+                return row, col
+        return None
+
+    @instrumentation.timed("board.reveal_cell")
+    def reveal_cell(self, row, col):
+        """
+        Reveals a specific cell and propagates the reveal using breadth-first search
+        if the cell has no adjacent mines, crossing chunk boundaries as needed.
+        Returns a list of (row, col) positions that were revealed by this call,
+        which is empty if the position is invalid, already revealed or flagged.
+        """
+        if not self.is_valid_position(row, col) or self.is_revealed(row, col) or self.is_flagged(row, col):
+            return []  # Invalid position, already revealed or flagged
+        self.ensure_mines_placed(row, col)
+
+        # Cells are marked revealed as they are queued, so each one is enqueued at most once
+        self.set_revealed(row, col)
+        queue = deque([(row, col)])
+        revealed = []
+        revealed_before = self.revealed_count
+
+        while queue:
+            current_row, current_col = queue.popleft()
+            revealed.append((current_row, current_col))
+            if self.is_mine(current_row, current_col):
+                continue
+            self.revealed_count += 1
+
+            # If the current cell has no adjacent mines, add its neighbors to the queue
+            if self.adjacent_mines(current_row, current_col) == 0:
+                for dr, dc in ADJACENT_POSITIONS:
+                    new_row, new_col = current_row + dr, current_col + dc
+                    if self.is_valid_position(new_row, new_col) and not self.is_revealed(new_row, new_col) \
+                            and not self.is_flagged(new_row, new_col):
+                        self.set_revealed(new_row, new_col)
+                        queue.append((new_row, new_col))
+
+        self.journal.record(REVEAL, (revealed, self.revealed_count - revealed_before))
+        instrumentation.observe("board.reveal_cell.cells", len(revealed))
+        return revealed
+
+    def _reveal_hidden(self):
+        """
+        Reveals every hidden cell of the explored chunks, for reveal_all; the rest of the
+        board is never generated. Returns (journal cells, revealed positions).
+        """
+        revealed = []
+        for chunk in list(self.state):
+            first_row, first_col, height, width = self._chunk_bounds(chunk)
+            for row in range(first_row, first_row + height):
+                for col in range(first_col, first_col + width):
+                    if not self.is_revealed(row, col):
+                        self.set_revealed(row, col)
+                        revealed.append((row, col))
+        return revealed, revealed
+
+    def toggle_flag(self, row, col):
+        """
+        Toggles the flag on a hidden cell and keeps the flag counter up to date.
+        Returns True if the flag state changed, False if the cell is already revealed.
+        """
+        if self.is_revealed(row, col):
+            return False
+        self.flags_placed += 1 if self._flip_flag(row, col) else -1
+        self.journal.record(FLAG, (row, col))
+        return True
+
+    def _flip_flag(self, row, col):
+        chunk, index = self._chunk_of(row, col)
+        flagged = self._chunk_state(chunk, create=True)[1]
+        flagged[index] = not flagged[index]
+        return flagged[index]
+
+    def _hide(self, cells):
+        for row, col in cells:
+            self.set_revealed(row, col, False)
+        return cells
+
+    def _unplace_mines(self, data):
+        # Put back the mines moved out of the first-click zone
+        self.num_mines, self.safe_cells, self.cleared, self.relocated = data
+        self.mine_cache.clear()
+
+    def iter_revealed(self):
+        """
+        Yields the (row, col) of every revealed cell, looking only at explored chunks.
+        """
+        size = self.chunk_size
+        for (chunk_row, chunk_col), (revealed, _) in self.state.items():
+            for index, is_revealed in enumerate(revealed):
+                if is_revealed:
+                    yield chunk_row * size + index // size, chunk_col * size + index % size
+
+    @property
+    def safe_cells_remaining(self):
+        """
+        Number of non-mine cells still hidden; infinite on unbounded boards.
+        """
+        return self.safe_cells - self.revealed_count
+
+    def explored_bounds(self):
+        """
+        Returns (first_row, last_row, first_col, last_col) covering the explored chunks,
+        or None if nothing has been touched yet.
+        """
+        if not self.state:
+            return None
+        size = self.chunk_size
+        first_row = min(chunk[0] for chunk in self.state) * size
+        first_col = min(chunk[1] for chunk in self.state) * size
+        last_row = (max(chunk[0] for chunk in self.state) + 1) * size - 1
+        last_col = (max(chunk[1] for chunk in self.state) + 1) * size - 1
+        if self.bounded:
+            last_row, last_col = min(last_row, self.rows - 1), min(last_col, self.cols - 1)
+        return first_row, last_row, first_col, last_col
+
+    def is_valid_position(self, row, col):
+        """
+        Checks if the given position is within the bounds of the board.
+        """
+        if not self.bounded:
+            return True
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def row_symbols(self, row, first_col=0, last_col=None):
+        """
+        Returns the display symbols of the cells in a row, from `first_col` to `last_col` inclusive.
+        """
+        if last_col is None:
+            last_col = self.cols - 1
+        cells = self.grid[row]
+        return [str(cells[col]) for col in range(first_col, last_col + 1)]
+
+    def __str__(self):
+        """
+        String representation of the explored part of the board.
+        """
+        bounds = self.explored_bounds()
+        if bounds is None:
+            return "\n"
+        return text_render.render(self, bounds)
@@ -1,22 +1,79 @@
 # core/game.py
+from core import instrumentation
 from core.board import Board
+from core.action_log import ACTION_KINDS, CHORD, FLAG, REVEAL, UNDO, ActionLog
+from core.array_board import ArrayBoard
+from core.chunked_board import ChunkedBoard
+from core.neighbors import GRID
+from core.serialization import SnapshotError, iter_snapshots, pack_game
+from core.solver import Solver
+import functools
 import time
 
+# Board implementations selectable through the `engine` argument of Game
+BOARD_ENGINES = {
+    "classic": Board,     # Grid of Cell objects
+    "array": ArrayBoard,  # NumPy arrays, suited to very large boards
+    "chunked": ChunkedBoard,  # Generated lazily per chunk, for huge or unbounded boards
+}
+
+
+def undoable(method):
+    """
+    Decorator for player moves: takes a snapshot before the move and keeps it as an undo
+    step if the move changed anything.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        snapshot = self.snapshot()
+        result = method(self, *args, **kwargs)
+        if (self.board.snapshot(), self.is_game_over) != (snapshot[0], snapshot[1]):
+            self.history.append(snapshot)
+        self._trim_history()
+        return result
+    return wrapper
+
 
 class Game:
-    def __init__(self, rows, cols, num_mines):
+    def __init__(self, rows, cols, num_mines, engine="classic", seed=None, first_click=None, board=None,
+                 record=True, topology=GRID, max_undo=None):
         """
         Initialize a new game.
+        `engine` selects the board implementation from BOARD_ENGINES.
+        `seed`, `first_click` and `topology` are passed to the board; see `core.board.Board`.
+        `board` starts the game on an existing board instead of generating one.
+        `record` keeps an action log of the game for replays (see core.action_log).
+        `max_undo` caps the undo history (None for unlimited, 0 for none) so that it and
+        the board's journal stay bounded; snapshots older than that window expire.
         """
+        if engine not in BOARD_ENGINES:
+            raise ValueError(f"Unknown board engine '{engine}'. Choose from: {', '.join(BOARD_ENGINES)}.")
         self.rows = rows
         self.cols = cols
         self.num_mines = num_mines
-        self.mines_left = num_mines
+        self.engine = engine
+        self.seed = seed
+        self.first_click = first_click
+        self.topology = topology
         self.start_time = None
-        self.board = self.initialize_board()  # Create the board
+        if board is None:
+            self.board = self.initialize_board()  # Create the board
+        else:
+            self.board = board
+            self.start_time = time.time()
         self.is_game_over = False
         self.is_winner = False
+        self.changes = []  # Cells whose display changed since the last pop_changes()
+        self.solver = None  # Created on the first hint, then kept up to date by reveals
+        self.history = []  # Snapshots taken before each move, for undo
+        self.history_base = 0  # Undo steps dropped from the front of the history by max_undo
+        self.max_undo = max_undo
+        self.record = record
+        # Only games generated from a known seed can be replayed from their log
+        self.action_log = self.new_action_log() if board is None else None
 
+    @instrumentation.timed("game.reveal_cell")
+    @undoable
     def reveal_cell(self, row, col):
         """
         Handles the logic for revealing a cell.
@@ -25,24 +82,35 @@ class Game:
         if self.is_game_over:
             return True, "The game is over! Start a new game."
 
+        if self.action_log is not None:
+            self.action_log.append(REVEAL, row, col)
         cell = self.board.grid[row][col]
         if cell.is_flagged:
             return False, "Cell is flagged. Unflag it first to reveal."
 
+        self.board.ensure_mines_placed(row, col)  # Deferred placement keeps the first click safe
+
         if cell.is_mine:
+            instrumentation.count("game.lost")
             self.is_game_over = True
             return True, "You hit a mine! Game over."
 
         # Update the board and reveal adjacent cells if this cell is empty
-        self.board.reveal_cell(row, col)
+        revealed = self.board.reveal_cell(row, col)
+        self.changes.extend(revealed)
+        if self.solver is not None:
+            self.solver.update(revealed)
 
         # Check if the player has won
         self.check_win_condition()
         if self.is_winner:
+            instrumentation.count("game.won")
             return True, "You Win!"
 
         return False, None  # Game continues
 
+    @instrumentation.timed("game.flag_cell")
+    @undoable
     def flag_cell(self, row, col):
         """
         Toggles a flag on a cell.
@@ -51,25 +119,111 @@ class Game:
         if self.is_game_over:
             return "The game is over! Start a new game."
 
-        cell = self.board.grid[row][col]
-        cell.toggle_flag()
+        if self.action_log is not None:
+            self.action_log.append(FLAG, row, col)
+        if self.board.toggle_flag(row, col):
+            self.changes.append((row, col))
+        is_flagged = self.board.grid[row][col].is_flagged
+        return f"Flag {'set' if is_flagged else 'removed'} on cell ({row}, {col})."
 
-        if cell.is_flagged:
-            self.mines_left = self.mines_left - 1
-        else:
-            self.mines_left = self.mines_left + 1
-        return f"Flag {'set' if cell.is_flagged else 'removed'} on cell ({row}, {col})."
+    def chord_cell(self, row, col):
+        """
+        Reveal every hidden, unflagged neighbor of a revealed number once as many flags
+        as the number surround it (the classic chord click).
+        Returns a tuple (game_over, message) like reveal_cell.
+        """
+        game_over, message, _ = self.apply_actions([(CHORD, row, col)])
+        return game_over, message
+
+    def chord_targets(self, row, col):
+        """
+        Get the cells a chord on (row, col) would reveal; empty unless the cell is a
+        revealed number with exactly that many flagged neighbors.
+        """
+        grid = self.board.grid
+        cell = grid[row][col]
+        if not cell.is_revealed or cell.adjacent_mines == 0:
+            return []
+        neighbors = self.board.neighbors(row, col)
+        if sum(grid[r][c].is_flagged for r, c in neighbors) != cell.adjacent_mines:
+            return []
+        return [(r, c) for r, c in neighbors if not grid[r][c].is_flagged and not grid[r][c].is_revealed]
+
+    @instrumentation.timed("game.apply_actions")
+    @undoable
+    def apply_actions(self, actions):
+        """
+        Apply a batch of (kind, row, col) actions, where kind is REVEAL, FLAG or CHORD
+        from core.action_log or its name ("reveal", "flag", "chord").
+        Every action is validated before any is applied, so an invalid one raises
+        ValueError and leaves the game untouched. The cascades are merged, the solver is
+        updated once and the game is evaluated once: actions after a mine is hit or the
+        last safe cell is revealed are dropped.
+        Returns a tuple (game_over, message, changes), where changes lists the cells the
+        batch changed without duplicates. They are also recorded for pop_changes.
+        """
+        if self.is_game_over:
+            return True, "The game is over! Start a new game.", []
+
+        batch = []
+        for kind, row, col in actions:
+            kind = ACTION_KINDS.get(kind, kind)
+            if kind not in (REVEAL, FLAG, CHORD):
+                raise ValueError(f"Unknown action kind {kind!r}.")
+            if not self.board.is_valid_position(row, col):
+                raise ValueError(f"({row}, {col}) is outside the board.")
+            batch.append((kind, row, col))
+
+        board = self.board
+        grid = board.grid
+        changed = []
+        revealed = []
+        hit_mine = False
+        for kind, row, col in batch:
+            if self.action_log is not None:
+                self.action_log.append(kind, row, col)
+            if kind == FLAG:
+                if board.toggle_flag(row, col):
+                    changed.append((row, col))
+                continue
 
+            for target_row, target_col in ([(row, col)] if kind == REVEAL else self.chord_targets(row, col)):
+                cell = grid[target_row][target_col]
+                if cell.is_flagged or cell.is_revealed:
+                    continue
+                board.ensure_mines_placed(target_row, target_col)
+                if cell.is_mine:
+                    hit_mine = True
+                    break
+                revealed.extend(board.reveal_cell(target_row, target_col))
+            if hit_mine or board.safe_cells_remaining == 0:
+                break  # The game is decided, so the rest of the batch no longer applies
+
+        changed.extend(revealed)
+        changes = list(dict.fromkeys(changed))
+        self.changes.extend(changes)
+        if self.solver is not None and revealed:
+            self.solver.update(revealed)
+
+        if hit_mine:
+            instrumentation.count("game.lost")
+            self.is_game_over = True
+            return True, "You hit a mine! Game over.", changes
+        self.check_win_condition()
+        if self.is_winner:
+            instrumentation.count("game.won")
+            return True, "You Win!", changes
+        return False, None, changes
+
+    @instrumentation.timed("game.check_win_condition")
     def check_win_condition(self):
         """
         Check if all non-mine cells have been revealed.
         If the player has won, set the `is_winner` flag.
+        Uses the board's running reveal counter, so this is constant time.
         """
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.board.grid[row][col]
-                if not cell.is_mine and not cell.is_revealed:
-                    return  # Still cells to uncover, no win yet
+        if self.board.safe_cells_remaining > 0:
+            return  # Still cells to uncover, no win yet
 
         # If we reach here, the player has revealed all non-mine cells
         self.is_game_over = True
@@ -83,8 +237,199 @@ class Game:
         self.board = self.initialize_board()
         self.is_game_over = False
         self.is_winner = False
+        self.changes = []
+        self.solver = None
+        self.history = []
+        self.history_base = 0
+        self.action_log = self.new_action_log()
         return "Game restarted."
 
+    def snapshot(self):
+        """
+        Capture the game state in constant time, e.g. to explore a branch of moves and
+        come back. Snapshots nest like a stack (see core.journal) and do not survive a restart.
+        """
+        log_mark = self.action_log.mark() if self.action_log is not None else None
+        depth = self.history_base + len(self.history)
+        return self.board.snapshot(), self.is_game_over, self.is_winner, depth, log_mark
+
+    def restore(self, snapshot):
+        """
+        Return to a snapshot, reverting only the cells changed since. Moves made after it
+        are dropped from the undo history and the action log, as if never played.
+        """
+        self._rewind(snapshot)
+        if self.action_log is not None:
+            self.action_log.truncate(snapshot[4])
+
+    def undo(self):
+        """
+        Take back the last move, including a losing one. Can be repeated back to the start
+        of the game. Returns True if a move was undone.
+        """
+        if not self.history:
+            return False
+        self._rewind(self.history.pop())
+        if self.action_log is not None:
+            self.action_log.append(UNDO, 0, 0)  # Kept in the log, so replays show the take-back
+        return True
+
+    def _rewind(self, snapshot):
+        board_snapshot, is_game_over, is_winner, depth, _ = snapshot
+        self.changes.extend(self.board.restore(board_snapshot))  # Raises first if the snapshot expired
+        self.is_game_over, self.is_winner = is_game_over, is_winner
+        del self.history[max(depth - self.history_base, 0):]
+        self.solver = None  # Rebuilt from the board on next use
+
+    def _trim_history(self):
+        """
+        Keep at most `max_undo` undo steps, and let the board journal forget what only
+        the dropped steps needed.
+        """
+        if self.max_undo is None:
+            return
+        excess = len(self.history) - self.max_undo
+        if excess > 0:
+            del self.history[:excess]
+            self.history_base += excess
+        self.board.journal.discard_before(self.history[0][0] if self.history else self.board.snapshot())
+
+    def new_action_log(self):
+        """
+        Start an action log for the current board, or return None when recording is off,
+        the board's seed is unknown, or the board is chunked or not a plain grid: replays
+        need snapshots of the board (see Replayer), which only the other engines provide.
+        """
+        if (not self.record or self.board.seed is None or isinstance(self.board, ChunkedBoard)
+                or self.board.topology != GRID):
+            return None
+        return ActionLog.for_game(self)
+
+    def reveal_board(self):
+        """
+        Reveal every remaining cell, typically once the game is over.
+        The newly revealed cells are recorded as changes.
+        """
+        self.changes.extend(self.board.reveal_all())
+
+    def pop_changes(self):
+        """
+        Return the (row, col) cells changed by reveals and flags since the last call,
+        without duplicates, and clear the pending list.
+        Lets the UI redraw only what changed instead of the whole board.
+        """
+        changes = list(dict.fromkeys(self.changes))
+        self.changes = []
+        return changes
+
+    @property
+    def mines_left(self):
+        """
+        Mines not yet accounted for by a flag (can go negative if the player over-flags).
+        Taken from the board, whose count is infinite on unbounded boards.
+        """
+        return self.board.num_mines - self.board.flags_placed
+
+    def get_status(self):
+        """
+        Get a summary of the game's counters without touching the grid.
+        Cheap enough for the UI timer and the CLI to poll after every move.
+        """
+        return {
+            "elapsed_time": self.get_elapsed_time(),
+            "mines_left": self.mines_left,
+            "flags_placed": self.board.flags_placed,
+            "revealed": self.board.revealed_count,
+            "safe_cells_remaining": self.board.safe_cells_remaining,
+            "is_game_over": self.is_game_over,
+            "is_winner": self.is_winner,
+        }
+
+    def get_solver(self):
+        """
+        Get the solver for the current board, creating it on first use.
+        """
+        if self.solver is None:
+            self.solver = Solver(self.board)
+        return self.solver
+
+    @instrumentation.timed("game.hint")
+    def hint(self):
+        """
+        Suggest the next cell to reveal.
+        Returns a tuple (row, col, mine_probability), or None if the game is over.
+        A probability of 0 means the cell is proven safe.
+        """
+        if self.is_game_over:
+            return None
+        return self.get_solver().best_move()
+
+    def auto_play(self, guess=False, flag_mines=False, rng=None, max_moves=None):
+        """
+        Let the solver play: reveal every cell it proves safe until none are left,
+        optionally flagging proven mines and guessing the safest cell when stuck.
+        Returns a tuple (game_over, message) like reveal_cell.
+        """
+        solver = self.get_solver()
+        moves = 0
+        while not self.is_game_over and (max_moves is None or moves < max_moves):
+            actions = []
+            if flag_mines:
+                actions = [(FLAG, row, col) for row, col in solver.mine_cells()
+                           if not self.board.grid[row][col].is_flagged]
+
+            safe = [(row, col) for row, col in sorted(solver.safe_cells())
+                    if not self.board.grid[row][col].is_flagged]
+            if not safe:
+                move = solver.best_move(rng) if guess else None
+                if move is None:
+                    if actions:
+                        self.apply_actions(actions)
+                    break
+                safe = [move[:2]]
+            if max_moves is not None:
+                safe = safe[:max_moves - moves]
+            moves += len(safe)
+
+            # One batch per round: a single solver update and win check for all the reveals
+            game_over, message, changes = self.apply_actions(actions + [(REVEAL, row, col) for row, col in safe])
+            if game_over:
+                return game_over, message
+            if not changes:
+                break  # Nothing left the solver can change
+        return self.is_game_over, None
+
+    def save(self, path):
+        """
+        Save the game to a binary snapshot file (see core.serialization).
+        """
+        data = pack_game(self)  # Raises SnapshotError before an existing file is overwritten
+        with open(path, "wb") as file:
+            file.write(data)
+
+    @classmethod
+    def load(cls, path, engine="array"):
+        """
+        Load a game saved with `save`. The array engine loads without creating per-cell objects.
+        """
+        board, state = next(iter_snapshots(path, engine=engine), (None, None))
+        if board is None:
+            raise SnapshotError("Empty snapshot file.")
+        return cls.from_board(board, **state)
+
+    @classmethod
+    def from_board(cls, board, is_game_over=False, is_winner=False, elapsed_time=0.0):
+        """
+        Wrap an existing board in a Game, e.g. one restored from a snapshot.
+        """
+        engine = next(name for name, board_class in BOARD_ENGINES.items() if isinstance(board, board_class))
+        game = cls(board.rows, board.cols, board.num_mines, engine=engine, seed=board.seed,
+                   first_click=board.first_click, board=board, topology=board.topology)
+        game.start_time -= elapsed_time
+        game.is_game_over = is_game_over
+        game.is_winner = is_winner
+        return game
+
     def get_cell(self, row, col):
         """
         Get the current state of the cell (for UI to query).
@@ -95,7 +440,8 @@ class Game:
 
     def initialize_board(self):
         self.start_time = time.time()
-        return Board(self.rows, self.cols, self.num_mines)
+        return BOARD_ENGINES[self.engine](self.rows, self.cols, self.num_mines,
+                                          seed=self.seed, first_click=self.first_click, topology=self.topology)
 
     def get_elapsed_time(self):
         if self.start_time:
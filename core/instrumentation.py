@@ -0,0 +1,221 @@
+"""
+Opt-in instrumentation of the game's hot paths.
+
+Functions decorated with `timed(name)` record a latency histogram per operation, and
+`observe(name, value)` / `count(name)` record sizes and counters, such as the number of
+cells a reveal cascade uncovered. Everything goes to the active Instrumentation, and
+does nothing while none is enabled: a disabled timed call costs one global lookup and a
+None check on top of the call itself.
+
+Examples:
+    from core import instrumentation
+    stats = instrumentation.enable(profile_threshold=0.05)
+    ... play ...
+    instrumentation.disable()
+    stats.dump("stats.json")
+"""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import random
+import threading
+import time
+
+active = None  # The enabled Instrumentation, or None
+
+
+class Histogram:
+    """
+    Distribution of non-negative integer values (nanoseconds for timings, cells for
+    sizes) in power-of-two buckets: bucket i holds values below 2**i.
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def add(self, value):
+        index = int(value).bit_length()
+        buckets = self.buckets
+        if index >= len(buckets):
+            buckets.extend([0] * (index + 1 - len(buckets)))
+        buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the given fraction (0 to 1) of the values.
+        """
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(2 ** index - 1, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min or 0,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": {2 ** index - 1: count for index, count in enumerate(self.buckets) if count},
+        }
+
+
+class Instrumentation:
+    """
+    Collects counters and histograms.
+    `callback(name, value)` is called after every recorded timing (in nanoseconds) and
+    observation, e.g. to forward them to a metrics system.
+    With `profile_threshold` (seconds), a `profile_rate` fraction of timed calls run under
+    cProfile, and the profiles of the ones slower than the threshold are kept (at most
+    `max_profiles`), to see where slow outliers spend their time.
+    """
+
+    def __init__(self, callback=None, profile_threshold=None, profile_rate=0.1, max_profiles=20,
+                 rng=None):
+        self.callback = callback
+        self.profile_threshold = profile_threshold
+        self.profile_rate = profile_rate
+        self.max_profiles = max_profiles
+        self.rng = rng or random.Random()
+        self.counters = {}
+        self.histograms = {}
+        self.profiles = []  # (operation, seconds, pstats text) of slow sampled calls
+        self.profiling = False  # cProfile cannot nest, so only one call is sampled at a time
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, value):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(value)
+        if self.callback is not None:
+            self.callback(name, value)
+
+    def call(self, name, function, args, kwargs):
+        """
+        Run a timed call, sampling it with cProfile when profiling is on.
+        """
+        if (self.profile_threshold is not None and not self.profiling
+                and self.rng.random() < self.profile_rate):
+            return self._profiled_call(name, function, args, kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.observe(name, time.perf_counter_ns() - start)
+
+    def _profiled_call(self, name, function, args, kwargs):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # Another profiler is already running, e.g. on another thread
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter_ns() - start)
+        self.profiling = True
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter_ns() - start
+            self.profiling = False
+            self.observe(name, elapsed)
+            if elapsed >= self.profile_threshold * 1e9 and len(self.profiles) < self.max_profiles:
+                text = io.StringIO()
+                pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(15)
+                self.profiles.append((name, elapsed / 1e9, text.getvalue()))
+
+    def report(self):
+        """
+        Return everything collected so far as a JSON-serializable dict.
+        """
+        with self.lock:
+            return {
+                "started": self.started,
+                "duration": time.time() - self.started,
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+                "slow_profiles": [{"operation": name, "seconds": seconds, "stats": text}
+                                  for name, seconds, text in self.profiles],
+            }
+
+    def dump(self, path):
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.profiles = []
+
+
+def enable(**options):
+    """
+    Start collecting with a new Instrumentation (see its options) and return it.
+    """
+    global active
+    active = Instrumentation(**options)
+    return active
+
+
+def disable():
+    """
+    Stop collecting. Returns the Instrumentation that was active, if any.
+    """
+    global active
+    previous, active = active, None
+    return previous
+
+
+def timed(name):
+    """
+    Decorator recording the duration of every call under `name` while instrumentation
+    is enabled.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            instrumentation = active
+            if instrumentation is None:
+                return function(*args, **kwargs)
+            return instrumentation.call(name, function, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def observe(name, value):
+    instrumentation = active
+    if instrumentation is not None:
+        instrumentation.observe(name, value)
+
+
+def count(name, amount=1):
+    instrumentation = active
+    if instrumentation is not None:
+        instrumentation.count(name, amount)
@@ -0,0 +1,109 @@
+"""
+Reversible change journals, for constant-time board snapshots.
+
+Every board records each change it makes (a reveal cascade, a flag toggle, the deferred
+mine placement) as a (kind, data) entry in its Journal. A snapshot is simply the current
+length of the journal, so taking one costs nothing and copies nothing; restoring pops the
+entries recorded since and has the board revert each one, so it costs only the cells
+that changed. Snapshots nest like a stack: restoring one invalidates those taken after it.
+
+The oldest entries can be discarded (`discard_before`) to bound the journal's memory, at
+the price of the snapshots taken before that point.
+"""
+from collections import deque
+
+# Entry kinds
+REVEAL = 0  # (cells, count) revealed; count is what was added to revealed_count
+FLAG = 1    # (row, col) whose flag was toggled
+PLACE = 2   # Deferred mine placement; the data is whatever the board needs to undo it
+
+
+class Journal:
+    def __init__(self):
+        self.entries = deque()
+        self.base = 0  # Number of entries discarded from the front; marks count them too
+
+    def record(self, kind, data):
+        self.entries.append((kind, data))
+
+    def mark(self):
+        return self.base + len(self.entries)
+
+    def rewind(self, board, mark):
+        """
+        Revert the entries recorded after `mark` on `board`, newest first.
+        Returns the (row, col) cells whose display changed.
+        """
+        entries = self.entries
+        if mark > self.mark():
+            raise ValueError("The snapshot is newer than the board state; it was discarded by a restore.")
+        if mark < self.base:
+            raise ValueError("The snapshot is older than the journal keeps.")
+        changed = []
+        while self.base + len(entries) > mark:
+            changed.extend(board.undo_change(*entries.pop()))
+        return changed
+
+    def discard_before(self, mark):
+        """
+        Drop the entries recorded before `mark`; older snapshots can no longer be restored.
+        """
+        while self.base < mark and self.entries:
+            self.entries.popleft()
+            self.base += 1
+
+    def clear(self):
+        """
+        Forget the history, e.g. once the board state is replaced wholesale.
+        """
+        self.base = self.mark()
+        self.entries = deque()
+
+
+class JournaledBoard:
+    """
+    Snapshot and undo support shared by the board engines. A board records its changes
+    in `self.journal` and provides the primitives to apply and revert them:
+    `_reveal_hidden()`, `_hide(cells)`, `_flip_flag(row, col)` and `_unplace_mines(data)`.
+    """
+
+    def reveal_all(self):
+        """
+        Reveals every hidden cell, mines included, for the end of a game.
+        Returns the list of (row, col) positions that were revealed. The reveal counter
+        is left untouched since it only tracks cells uncovered by the player.
+        """
+        cells, revealed = self._reveal_hidden()
+        if revealed:
+            self.journal.record(REVEAL, (cells, 0))
+        return revealed
+
+    def snapshot(self):
+        """
+        Returns a token for the current state in constant time; see `core.journal`.
+        """
+        return self.journal.mark()
+
+    def restore(self, snapshot):
+        """
+        Rolls the board back to a snapshot, reverting only the changes made since.
+        Returns the (row, col) cells whose display changed.
+        """
+        return self.journal.rewind(self, snapshot)
+
+    def undo_change(self, kind, data):
+        """
+        Reverts one journal entry. Returns the (row, col) cells whose display changed.
+        """
+        if kind == REVEAL:
+            cells, count = data
+            self.revealed_count -= count
+            return self._hide(cells)
+        if kind == FLAG:
+            row, col = data
+            self.flags_placed += 1 if self._flip_flag(row, col) else -1
+            return [data]
+        # Take the deferred mines back off, so the next first click places them again
+        self._unplace_mines(data)
+        self.mines_placed = False
+        return []
@@ -0,0 +1,88 @@
+import random
+
+# Values accepted by the `first_click` argument of the boards
+SAFE_CELL = "cell"                  # The first revealed cell is never a mine
+SAFE_NEIGHBORHOOD = "neighborhood"  # Neither is any of its neighbors, so the first click opens an area
+FIRST_CLICK_MODES = (None, SAFE_CELL, SAFE_NEIGHBORHOOD)
+
+
+def resolve_seed(seed=None):
+    """
+    Turns a seed argument into a (rng, seed) pair.
+    `seed` may be an int, a `random.Random` instance or None. When None, a fresh seed is
+    drawn so that the board can still be reproduced later. A Random instance is used as is
+    and its seed is reported as None, since it cannot be recovered from the generator.
+    """
+    if isinstance(seed, random.Random):
+        return seed, None
+    if seed is None:
+        seed = random.randrange(2 ** 63)
+    return random.Random(seed), seed
+
+
+def validate_first_click(first_click):
+    """
+    Raises ValueError for an unknown first-click safety mode.
+    """
+    if first_click not in FIRST_CLICK_MODES:
+        raise ValueError(f"Unknown first click mode '{first_click}'. "
+                         f"Choose from: {', '.join(str(mode) for mode in FIRST_CLICK_MODES)}.")
+
+
+def safe_zone(rows, cols, num_mines, row, col, first_click, neighbors=None):
+    """
+    Returns the flat indices that must stay free of mines for a first click at (row, col).
+    `neighbors` are the flat indices of the cell's neighbors, for boards that are not
+    plain grids; by default the eight surrounding cells.
+    Falls back to a smaller zone when the board is too dense to keep the full zone clear.
+    """
+    total_cells = rows * cols
+    if first_click == SAFE_NEIGHBORHOOD:
+        if neighbors is None:
+            zone = [r * cols + c
+                    for r in range(max(row - 1, 0), min(row + 2, rows))
+                    for c in range(max(col - 1, 0), min(col + 2, cols))]
+        else:
+            zone = [row * cols + col, *neighbors]
+        if total_cells - len(zone) >= num_mines:
+            return zone
+    if first_click is not None and total_cells - 1 >= num_mines:
+        return [row * cols + col]
+    return []
+
+
+def sample_mine_indices(total_cells, num_mines, rng, excluded=()):
+    """
+    Picks `num_mines` distinct flat indices in [0, total_cells), skipping `excluded`.
+    Runs in time proportional to the number of mines, independent of density: at most
+    half of the candidate cells are ever sampled, since above 50% density the safe cells
+    are sampled instead and the mines are their complement.
+    Returns a list of flat indices.
+    """
+    excluded = sorted(set(excluded))
+    candidates = total_cells - len(excluded)
+    if num_mines < 0 or num_mines > candidates:
+        raise ValueError(f"Cannot place {num_mines} mines in {candidates} available cells.")
+
+    if num_mines * 2 <= candidates:
+        picked = rng.sample(range(candidates), num_mines)
+    else:
+        # Dense board: sample the safe cells and take everything else
+        safe = set(rng.sample(range(candidates), candidates - num_mines))
+        picked = [index for index in range(candidates) if index not in safe]
+
+    if not excluded:
+        return picked
+    return [_skip_excluded(index, excluded) for index in picked]
+
+
+def _skip_excluded(index, excluded):
+    """
+    Maps the index-th non-excluded cell to its flat index; `excluded` must be sorted.
+    """
+    for skipped in excluded:
+        if skipped <= index:
+            index += 1
+        else:
+            break
+    return index
@@ -0,0 +1,214 @@
+"""
+Precomputed neighbor tables and board topologies.
+
+A topology says which cells touch: the classic grid (eight neighbors, clipped at the
+edges), a torus (the grid wrapping around at the edges), a hexagonal board (six
+neighbors, odd rows shifted right by half a cell), or any custom set of offsets.
+
+`neighbor_table` turns a board shape and topology into a NeighborTable, a CSR-style pair
+of flat arrays: the neighbors of flat index i are indices[offsets[i]:offsets[i + 1]].
+Cascades and mine counts then walk plain integer arrays instead of re-checking bounds
+for every offset. Tables are built once per shape and topology, vectorized with NumPy,
+and shared by every board of that shape through a cache bounded by total cells.
+"""
+import threading
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+TABLE_CACHE_CELLS = 4_000_000  # Cells of all cached tables together, about 32 bytes each
+# Plain grids larger than this may skip the table (about 32 bytes per cell) and compute
+# neighbors on the fly instead
+MAX_TABLE_CELLS = 1_000_000
+
+
+class Topology:
+    """
+    Neighbor offsets as (row offset, column offset) pairs. `odd_row_offsets`, if given,
+    replaces `offsets` on odd rows (for hexagonal layouts). With `wrap`, offsets wrap
+    around the board edges instead of being clipped.
+    """
+
+    def __init__(self, name, offsets, odd_row_offsets=None, wrap=False):
+        self.name = name
+        self.offsets = _unique_offsets(offsets)
+        self.odd_row_offsets = _unique_offsets(odd_row_offsets) if odd_row_offsets is not None else None
+        self.wrap = wrap
+
+    def row_offsets(self, row):
+        if self.odd_row_offsets is not None and row % 2:
+            return self.odd_row_offsets
+        return self.offsets
+
+    def positions(self, rows, cols, row, col):
+        """
+        The (row, col) neighbors of a cell, computed directly without a table.
+        """
+        neighbors = []
+        for dr, dc in self.row_offsets(row):
+            new_row, new_col = row + dr, col + dc
+            if self.wrap:
+                new_row, new_col = new_row % rows, new_col % cols
+            elif not (0 <= new_row < rows and 0 <= new_col < cols):
+                continue
+            if (new_row, new_col) != (row, col) and (new_row, new_col) not in neighbors:
+                neighbors.append((new_row, new_col))
+        return neighbors
+
+    def _key(self):
+        return self.offsets, self.odd_row_offsets, self.wrap
+
+    def __eq__(self, other):
+        return isinstance(other, Topology) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"Topology({self.name!r})"
+
+
+def _unique_offsets(offsets):
+    """
+    Offsets without repeats or (0, 0), so a cell never counts a neighbor twice.
+    """
+    return tuple(dict.fromkeys(tuple(offset) for offset in offsets if tuple(offset) != (0, 0)))
+
+
+EIGHT_NEIGHBORS = ((-1, -1), (-1, 0), (-1, 1),
+                   (0, -1), (0, 1),
+                   (1, -1), (1, 0), (1, 1))
+
+GRID = Topology("grid", EIGHT_NEIGHBORS)
+TORUS = Topology("torus", EIGHT_NEIGHBORS, wrap=True)
+HEX = Topology("hex",
+               ((-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0)),
+               odd_row_offsets=((-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1)))
+
+# Topologies selectable by name
+TOPOLOGIES = {topology.name: topology for topology in (GRID, TORUS, HEX)}
+
+
+def get_topology(topology):
+    """
+    Resolve a topology name (see TOPOLOGIES) or pass a Topology through.
+    """
+    if isinstance(topology, Topology):
+        return topology
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology '{topology}'. Choose from: {', '.join(TOPOLOGIES)}.")
+    return TOPOLOGIES[topology]
+
+
+class NeighborTable:
+    """
+    Neighbors of every cell of a board shape, as flat indices in CSR layout.
+    `offsets` and `indices` are compact `array` objects, fast to index from Python.
+    """
+    __slots__ = ("rows", "cols", "topology", "offsets", "indices")
+
+    def __init__(self, rows, cols, topology, offsets, indices):
+        self.rows = rows
+        self.cols = cols
+        self.topology = topology
+        self.offsets = offsets
+        self.indices = indices
+
+    def neighbors(self, index):
+        return self.indices[self.offsets[index]:self.offsets[index + 1]]
+
+    def positions(self, row, col):
+        """
+        The (row, col) neighbors of a cell.
+        """
+        cols = self.cols
+        return [divmod(index, cols) for index in self.neighbors(row * cols + col)]
+
+    def numpy(self):
+        """
+        Returns (offsets, indices) as NumPy arrays sharing the table's memory.
+        """
+        return np.frombuffer(self.offsets, dtype=np.int64), np.frombuffer(self.indices, dtype=np.int32)
+
+    def count(self, mines):
+        """
+        Count the mines around every cell, given a boolean array of the flat mine layout.
+        """
+        offsets, indices = self.numpy()
+        owners = np.repeat(np.arange(self.rows * self.cols), np.diff(offsets))
+        return np.bincount(owners, weights=np.asarray(mines).ravel()[indices],
+                           minlength=self.rows * self.cols).astype(np.uint8)
+
+
+_table_cache = OrderedDict()  # (rows, cols, topology) -> NeighborTable, least recently used first
+_table_cache_cells = 0
+_table_cache_lock = threading.Lock()
+
+
+def neighbor_table(rows, cols, topology=GRID):
+    """
+    Build (or fetch from the cache) the neighbor table of a board shape and topology.
+    The least recently used tables are dropped once the cache holds more than
+    TABLE_CACHE_CELLS cells, and tables larger than that are never cached, so a few huge
+    boards cannot pin their tables after they are gone.
+    """
+    global _table_cache_cells
+    key = (rows, cols, topology)
+    with _table_cache_lock:
+        table = _table_cache.get(key)
+        if table is not None:
+            _table_cache.move_to_end(key)
+            return table
+    table = build_neighbor_table(rows, cols, topology)
+    if rows * cols <= TABLE_CACHE_CELLS:
+        with _table_cache_lock:
+            if key not in _table_cache:
+                _table_cache[key] = table
+                _table_cache_cells += rows * cols
+            while _table_cache_cells > TABLE_CACHE_CELLS:
+                _, dropped = _table_cache.popitem(last=False)
+                _table_cache_cells -= dropped.rows * dropped.cols
+    return table
+
+
+def build_neighbor_table(rows, cols, topology=GRID):
+    """
+    Build the neighbor table of a board shape and topology, without the cache.
+    """
+    total = rows * cols
+    index = np.arange(total, dtype=np.int32).reshape(rows, cols)
+    columns = np.arange(cols)
+    odd_offsets = topology.odd_row_offsets
+    width = max(len(topology.offsets), len(odd_offsets or ()))
+    if odd_offsets is None:
+        layouts = [(np.arange(rows), topology.offsets)]
+    else:
+        layouts = [(np.arange(0, rows, 2), topology.offsets), (np.arange(1, rows, 2), odd_offsets)]
+
+    # Slot k of each cell holds its k-th neighbor, or -1; filled a whole block of rows at a time
+    candidates = np.full((rows, cols, width), -1, dtype=np.int32)
+    for row_numbers, offsets in layouts:
+        for slot, (dr, dc) in enumerate(offsets):
+            new_rows, new_cols = row_numbers + dr, columns + dc
+            if topology.wrap:
+                new_rows, new_cols = new_rows % rows, new_cols % cols
+                keep_rows = keep_cols = slice(None)
+            else:
+                keep_rows = (new_rows >= 0) & (new_rows < rows)
+                keep_cols = (new_cols >= 0) & (new_cols < cols)
+            candidates[row_numbers[keep_rows][:, None], columns[keep_cols], slot] = \
+                index[new_rows[keep_rows][:, None], new_cols[keep_cols]]
+    candidates = candidates.reshape(total, width)
+
+    if topology.wrap:
+        # Small wrapped boards can reach a cell twice, or the cell itself
+        candidates[candidates == index.reshape(total, 1)] = -1
+        candidates.sort(axis=1)
+        candidates[:, 1:][candidates[:, 1:] == candidates[:, :-1]] = -1
+
+    valid = candidates >= 0
+    offsets = np.zeros(total + 1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=1), out=offsets[1:])
+    return NeighborTable(rows, cols, topology, array("q", offsets.tobytes()),
+                         array("i", candidates[valid].tobytes()))
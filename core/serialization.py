@@ -0,0 +1,172 @@
+"""
+Binary snapshots of boards and games.
+
+A snapshot is a fixed-size header followed by three bit-packed planes (mines, revealed,
+flagged), one bit per cell in row-major order. Adjacency counts are not stored; they are
+recomputed in one vectorized pass on load. Snapshots are self-delimiting, so a corpus is
+simply several of them written one after another into the same file.
+
+Loading maps the file with `mmap` and unpacks the planes straight into an ArrayBoard, so
+no per-cell objects are created unless the classic engine is explicitly requested.
+"""
+import mmap
+import struct
+import time
+
+import numpy as np
+
+from core.mines import SAFE_CELL, SAFE_NEIGHBORHOOD
+from core.neighbors import GRID
+
+MAGIC = b"MSWP"
+VERSION = 1
+
+# magic, version, flags, rows, cols, num_mines, seed, revealed_count, flags_placed,
+# elapsed_time, first_click, bytes per plane
+HEADER = struct.Struct("<4sHHIIIQQQdB7xQ")
+
+# Bits of the header flags field
+FLAG_MINES_PLACED = 1
+FLAG_GAME_OVER = 2
+FLAG_WINNER = 4
+FLAG_HAS_SEED = 8
+
+FIRST_CLICK_CODES = {None: 0, SAFE_CELL: 1, SAFE_NEIGHBORHOOD: 2}
+FIRST_CLICK_MODES = {code: mode for mode, code in FIRST_CLICK_CODES.items()}
+
+
+class SnapshotError(ValueError):
+    """
+    Raised when a file is not a snapshot or was written by a newer version.
+    """
+
+
+def pack_board(board, is_game_over=False, is_winner=False, elapsed_time=0.0):
+    """
+    Encode a board (either engine) and optional game state as snapshot bytes.
+    """
+    if board.topology != GRID:
+        raise SnapshotError("Only boards with the grid topology can be saved.")
+    if not hasattr(board, "get_planes"):
+        raise SnapshotError(f"{type(board).__name__} boards cannot be saved.")
+    mines, revealed, flagged = (np.asarray(plane, dtype=bool) for plane in board.get_planes())
+    planes = [np.packbits(plane, axis=None) for plane in (mines, revealed, flagged)]
+
+    flags = 0
+    if board.mines_placed:
+        flags |= FLAG_MINES_PLACED
+    if is_game_over:
+        flags |= FLAG_GAME_OVER
+    if is_winner:
+        flags |= FLAG_WINNER
+    seed = board.seed
+    if seed is not None and 0 <= seed < 2 ** 64:
+        flags |= FLAG_HAS_SEED
+    else:
+        seed = 0  # Boards built from a random.Random instance have no recoverable seed
+
+    header = HEADER.pack(MAGIC, VERSION, flags, board.rows, board.cols, board.num_mines, seed,
+                         board.revealed_count, board.flags_placed, float(elapsed_time),
+                         FIRST_CLICK_CODES[board.first_click], planes[0].nbytes)
+    return b"".join([header] + [plane.tobytes() for plane in planes])
+
+
+def unpack_board(buffer, offset=0, engine="array"):
+    """
+    Decode the snapshot starting at `offset` in `buffer` (bytes, mmap or memoryview).
+    Returns (board, state, next_offset), where state is a dict with the game fields.
+    """
+    from core.game import BOARD_ENGINES
+
+    if len(buffer) - offset < HEADER.size:
+        raise SnapshotError("Truncated snapshot header.")
+    (magic, version, flags, rows, cols, num_mines, seed, revealed_count, flags_placed,
+     elapsed_time, first_click, plane_bytes) = HEADER.unpack_from(buffer, offset)
+    if magic != MAGIC:
+        raise SnapshotError("Not a Minesweeper snapshot.")
+    if version > VERSION:
+        raise SnapshotError(f"Snapshot version {version} is newer than supported version {VERSION}.")
+
+    cells = rows * cols
+    start = offset + HEADER.size
+    end = start + 3 * plane_bytes
+    if len(buffer) < end:
+        raise SnapshotError("Truncated snapshot planes.")
+    packed = np.frombuffer(buffer, dtype=np.uint8, count=3 * plane_bytes, offset=start)
+    mines, revealed, flagged = (
+        np.unpackbits(packed[i * plane_bytes:(i + 1) * plane_bytes], count=cells).view(bool).reshape(rows, cols)
+        for i in range(3)
+    )
+
+    # Construct with deferred placement so no mines are sampled only to be overwritten
+    board = BOARD_ENGINES[engine](rows, cols, num_mines,
+                                  seed=seed if flags & FLAG_HAS_SEED else None, first_click=SAFE_CELL)
+    if engine != "array":
+        mines, revealed, flagged = mines.tolist(), revealed.tolist(), flagged.tolist()
+    board.set_planes(mines, revealed, flagged)
+    board.first_click = FIRST_CLICK_MODES[first_click]
+    board.mines_placed = bool(flags & FLAG_MINES_PLACED)
+    board.revealed_count = revealed_count
+    board.flags_placed = flags_placed
+    if not (flags & FLAG_HAS_SEED):
+        board.seed = None
+
+    state = {
+        "is_game_over": bool(flags & FLAG_GAME_OVER),
+        "is_winner": bool(flags & FLAG_WINNER),
+        "elapsed_time": elapsed_time,
+    }
+    return board, state, end
+
+
+def save_board(board, path):
+    """
+    Write a single board snapshot to `path`.
+    """
+    with open(path, "wb") as file:
+        file.write(pack_board(board))
+
+
+def load_board(path, engine="array"):
+    """
+    Load the first board snapshot from `path`.
+    """
+    for board, _ in iter_snapshots(path, engine=engine):
+        return board
+    raise SnapshotError("Empty snapshot file.")
+
+
+def iter_snapshots(path, engine="array"):
+    """
+    Yield (board, state) for every snapshot in a file, reading through one memory map.
+    """
+    with open(path, "rb") as file:
+        if file.seek(0, 2) == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            offset = 0
+            while offset < len(buffer):
+                board, state, offset = unpack_board(buffer, offset, engine=engine)
+                yield board, state
+
+
+def write_snapshots(items, path, append=False):
+    """
+    Write many snapshots to one file. `items` yields boards or Game objects.
+    Returns the number of snapshots written.
+    """
+    count = 0
+    with open(path, "ab" if append else "wb") as file:
+        for item in items:
+            file.write(pack_game(item) if hasattr(item, "board") else pack_board(item))
+            count += 1
+    return count
+
+
+def pack_game(game):
+    """
+    Encode a Game as snapshot bytes, including its game-over state and elapsed time.
+    """
+    elapsed = time.time() - game.start_time if game.start_time else 0.0
+    return pack_board(game.board, is_game_over=game.is_game_over, is_winner=game.is_winner,
+                      elapsed_time=elapsed)
@@ -0,0 +1,438 @@
+import math
+from collections import deque
+
+
+class _SearchBudgetExceeded(Exception):
+    """
+    Raised when exact enumeration of a component would take too long.
+    """
+
+
+class Component:
+    """
+    A group of constraints linked by shared unknown cells, with its cached solution.
+    """
+
+    def __init__(self, constraints, cells):
+        self.constraints = constraints  # Positions of the revealed numbers in this group
+        self.cells = cells              # Unknown cells touched by those numbers, in search order
+        self.exact = True
+        self.solutions = {}     # Mine count -> number of consistent layouts with that many mines
+        self.cell_counts = {}   # Mine count -> per-cell number of those layouts with a mine there
+        self.estimates = None   # Per-cell mine estimates when the group is too large to enumerate
+
+
+class Solver:
+    """
+    Constraint-propagation solver for a Minesweeper board.
+
+    The solver only looks at what a player can see: revealed numbers and hidden cells.
+    It keeps the frontier (revealed numbers with hidden neighbors) up to date from the
+    cells passed to `update`, deduces safe cells and mines with single-constraint rules,
+    and splits the remaining frontier into independent components. Each component is
+    solved by exact enumeration and cached until one of its cells changes; the cached
+    solutions are combined with the global mine count to give mine probabilities.
+    Player flags are ignored, since they may be wrong.
+    """
+    MAX_EXACT_CELLS = 40    # Larger components fall back to approximate estimates
+    MAX_SEARCH_NODES = 200_000
+
+    def __init__(self, board):
+        self.board = board
+        self.known_mines = set()  # Hidden cells proven to be mines
+        self.known_safe = set()   # Hidden cells proven to be safe
+        self.constraints = {}     # Revealed position -> [unknown neighbor set, mines among them]
+        self.unknown_constraints = {}  # Unknown frontier cell -> positions of constraints on it
+        self.dirty = set()        # Constraints to re-check with the simple rules
+        self.stale = set()        # Constraints whose component solution must be recomputed
+        self.components = {}      # Constraint position -> Component it belongs to
+
+        # Start from whatever is already revealed
+        self.update(list(board.iter_revealed()))
+
+    def update(self, revealed):
+        """
+        Feed the solver the (row, col) cells revealed since the last update, as returned
+        by `Board.reveal_cell`. Only the constraints around those cells are re-examined.
+        """
+        board = self.board
+        for position in revealed:
+            self.known_safe.discard(position)
+            for constraint in self.unknown_constraints.pop(position, ()):
+                if constraint in self.constraints:
+                    self.constraints[constraint][0].discard(position)
+                    self._touch(constraint)
+
+        for row, col in revealed:
+            cell = board.grid[row][col]
+            if cell.is_mine:
+                continue  # Only happens once the game is lost
+            unknown = set()
+            remaining = cell.adjacent_mines
+            for neighbor in board.neighbors(row, col):
+                if board.grid[neighbor[0]][neighbor[1]].is_revealed:
+                    continue
+                if neighbor in self.known_mines:
+                    remaining -= 1
+                elif neighbor not in self.known_safe:
+                    unknown.add(neighbor)
+            if unknown:
+                self.constraints[(row, col)] = [unknown, remaining]
+                for neighbor in unknown:
+                    self.unknown_constraints.setdefault(neighbor, set()).add((row, col))
+                self._touch((row, col))
+
+    def _touch(self, constraint):
+        self.dirty.add(constraint)
+        self.stale.add(constraint)
+
+    def _mark_safe(self, position):
+        self.known_safe.add(position)
+        for constraint in self.unknown_constraints.pop(position, ()):
+            self.constraints[constraint][0].discard(position)
+            self._touch(constraint)
+
+    def _mark_mine(self, position):
+        self.known_mines.add(position)
+        for constraint in self.unknown_constraints.pop(position, ()):
+            self.constraints[constraint][0].discard(position)
+            self.constraints[constraint][1] -= 1
+            self._touch(constraint)
+
+    def _propagate(self):
+        """
+        Apply the single-constraint rules until nothing changes: a number whose mines are
+        all accounted for makes its other neighbors safe, and a number with exactly as
+        many unknown neighbors as missing mines makes them all mines.
+        """
+        while self.dirty:
+            constraint = self.dirty.pop()
+            if constraint not in self.constraints:
+                continue
+            unknown, remaining = self.constraints[constraint]
+            if not unknown:
+                del self.constraints[constraint]
+                continue
+            if remaining == 0:
+                for position in list(unknown):
+                    self._mark_safe(position)
+            elif remaining == len(unknown):
+                for position in list(unknown):
+                    self._mark_mine(position)
+
+    def solve(self):
+        """
+        Bring all deductions up to date. Only components containing a changed constraint
+        are regrouped and re-enumerated; the rest keep their cached solutions.
+        """
+        while True:
+            self._propagate()
+            if not self.stale:
+                return
+
+            # Drop the cached components touched by a change and regroup their constraints
+            regroup = set()
+            for constraint in self.stale:
+                component = self.components.pop(constraint, None)
+                if component is not None:
+                    for member in component.constraints:
+                        self.components.pop(member, None)
+                        regroup.add(member)
+                regroup.add(constraint)
+            self.stale = set()
+
+            for component in self._group(regroup):
+                self._solve_component(component)
+                for constraint in component.constraints:
+                    self.components[constraint] = component
+                self._apply_certainties(component)
+
+    def _group(self, constraints):
+        """
+        Split the given constraints (and any linked to them) into connected components.
+        """
+        seen = set()
+        for start in constraints:
+            if start in seen or start not in self.constraints:
+                continue
+            members = []
+            cells = []
+            cell_seen = set()
+            queue = deque([start])
+            seen.add(start)
+            while queue:
+                constraint = queue.popleft()
+                members.append(constraint)
+                for cell in sorted(self.constraints[constraint][0]):
+                    if cell in cell_seen:
+                        continue
+                    cell_seen.add(cell)
+                    cells.append(cell)  # Breadth-first order keeps related cells close in the search
+                    for linked in self.unknown_constraints.get(cell, ()):
+                        if linked not in seen:
+                            seen.add(linked)
+                            queue.append(linked)
+            yield Component(members, cells)
+
+    def _solve_component(self, component):
+        if len(component.cells) <= self.MAX_EXACT_CELLS:
+            try:
+                self._enumerate(component)
+                return
+            except _SearchBudgetExceeded:
+                pass
+        self._estimate(component)
+
+    def _enumerate(self, component):
+        """
+        Count every mine layout of the component that satisfies all of its numbers,
+        by backtracking with pruning on each constraint's remaining mines.
+        """
+        cells = component.cells
+        index = {cell: i for i, cell in enumerate(cells)}
+        cell_constraints = [[] for _ in cells]
+        remaining = []
+        unassigned = []
+        for j, constraint in enumerate(component.constraints):
+            unknown, mines = self.constraints[constraint]
+            remaining.append(mines)
+            unassigned.append(len(unknown))
+            for cell in unknown:
+                cell_constraints[index[cell]].append(j)
+
+        count = len(cells)
+        assignment = [0] * count
+        solutions = {}
+        cell_counts = {}
+        nodes = [0]
+
+        def search(i, mines):
+            nodes[0] += 1
+            if nodes[0] > self.MAX_SEARCH_NODES:
+                raise _SearchBudgetExceeded()
+            if i == count:
+                solutions[mines] = solutions.get(mines, 0) + 1
+                counts = cell_counts.setdefault(mines, [0] * count)
+                for k in range(count):
+                    counts[k] += assignment[k]
+                return
+            for value in (0, 1):
+                feasible = True
+                for j in cell_constraints[i]:
+                    unassigned[j] -= 1
+                    remaining[j] -= value
+                    if remaining[j] < 0 or remaining[j] > unassigned[j]:
+                        feasible = False
+                if feasible:
+                    assignment[i] = value
+                    search(i + 1, mines + value)
+                for j in cell_constraints[i]:
+                    unassigned[j] += 1
+                    remaining[j] += value
+            assignment[i] = 0
+
+        search(0, 0)
+        component.exact = True
+        component.solutions = solutions
+        component.cell_counts = cell_counts
+
+    def _estimate(self, component):
+        """
+        Approximate per-cell mine probabilities for a component too large to enumerate,
+        by averaging the local density of every number around the cell.
+        """
+        totals = {cell: [0.0, 0] for cell in component.cells}
+        for constraint in component.constraints:
+            unknown, mines = self.constraints[constraint]
+            density = mines / len(unknown)
+            for cell in unknown:
+                totals[cell][0] += density
+                totals[cell][1] += 1
+        component.exact = False
+        component.estimates = {cell: total / n for cell, (total, n) in totals.items()}
+        expected = round(sum(component.estimates.values()))
+        component.solutions = {expected: 1}
+        component.cell_counts = {}
+
+    def _apply_certainties(self, component):
+        """
+        Cells that are safe (or mines) in every layout of an exact component are certain.
+        """
+        if not component.exact or not component.solutions:
+            return
+        total = sum(component.solutions.values())
+        for i, cell in enumerate(component.cells):
+            with_mine = sum(counts[i] for counts in component.cell_counts.values())
+            if with_mine == 0:
+                self._mark_safe(cell)
+            elif with_mine == total:
+                self._mark_mine(cell)
+
+    def _unique_components(self):
+        unique = {}
+        for component in self.components.values():
+            unique[id(component)] = component
+        return list(unique.values())
+
+    def interior_count(self):
+        """
+        Number of hidden cells that no revealed number gives any information about
+        (infinite on unbounded boards).
+        """
+        board = self.board
+        if board.rows is None:
+            return math.inf
+        hidden = board.rows * board.cols - board.revealed_count
+        return hidden - len(self.known_mines) - len(self.known_safe) - len(self.unknown_constraints)
+
+    def probabilities(self):
+        """
+        Return (frontier, interior): a dict of mine probabilities for the frontier cells,
+        and the probability shared by every interior cell.
+        Component solutions are weighted by the number of ways to place the remaining
+        mines in the interior, so the global mine count is taken into account. Unbounded
+        boards have no global count: their mines are spread at a fixed density, so each
+        solution is weighted by the odds of its mines at that density instead.
+        """
+        self.solve()
+        components = self._unique_components()
+        interior = self.interior_count()
+        mines_left = self.board.num_mines - len(self.known_mines)
+
+        # Scale each distribution to a maximum of 1 so products cannot overflow
+        distributions = []
+        for component in components:
+            scale = max(component.solutions.values(), default=1)
+            distributions.append({k: n / scale for k, n in component.solutions.items()})
+
+        unbounded = self.board.rows is None
+        density = getattr(self.board, "density", None)
+
+        def log_ways(total):
+            if unbounded:
+                return total * math.log(density / (1 - density))
+            # Log of the number of ways to put the other mines in the interior
+            rest = mines_left - total
+            if rest < 0 or rest > interior:
+                return None
+            return math.lgamma(interior + 1) - math.lgamma(rest + 1) - math.lgamma(interior - rest + 1)
+
+        def weights(convolution, offset=0):
+            result = {}
+            for total, count in convolution.items():
+                log_weight = log_ways(total + offset)
+                if log_weight is not None and count:
+                    result[total] = (count, log_weight)
+            return result
+
+        combined = self._convolve(distributions)
+        terms = weights(combined)
+        if not terms:
+            if unbounded:
+                return {}, density
+            return {}, (mines_left / interior if interior else 0.0)
+        peak = max(log_weight for _, log_weight in terms.values())
+        normalizer = sum(count * math.exp(log_weight - peak) for count, log_weight in terms.values())
+
+        interior_probability = 0.0
+        if unbounded:
+            interior_probability = density
+        elif interior:
+            interior_probability = sum(count * math.exp(log_weight - peak) * (mines_left - total) / interior
+                                       for total, (count, log_weight) in terms.items()) / normalizer
+
+        frontier = {}
+        for j, component in enumerate(components):
+            if not component.exact:
+                frontier.update(component.estimates)
+                continue
+            others = self._convolve(distributions[:j] + distributions[j + 1:])
+            scale = max(component.solutions.values())
+            sums = [0.0] * len(component.cells)
+            for mines, counts in component.cell_counts.items():
+                weight = sum(count * math.exp(log_weight - peak)
+                             for _, (count, log_weight) in weights(others, mines).items())
+                for i, cell_count in enumerate(counts):
+                    sums[i] += cell_count / scale * weight
+            for i, cell in enumerate(component.cells):
+                frontier[cell] = sums[i] / normalizer
+        return frontier, interior_probability
+
+    @staticmethod
+    def _convolve(distributions):
+        combined = {0: 1.0}
+        for distribution in distributions:
+            merged = {}
+            for total, count in combined.items():
+                for mines, ways in distribution.items():
+                    merged[total + mines] = merged.get(total + mines, 0.0) + count * ways
+            combined = merged
+        return combined
+
+    def safe_cells(self):
+        """
+        Hidden cells proven to be safe and not flagged, so they can be revealed.
+        """
+        self.solve()
+        return {position for position in self.known_safe if not self._is_flagged(position)}
+
+    def _is_flagged(self, position):
+        return self.board.grid[position[0]][position[1]].is_flagged
+
+    def mine_cells(self):
+        """
+        Hidden cells proven to be mines.
+        """
+        self.solve()
+        return set(self.known_mines)
+
+    def best_move(self, rng=None):
+        """
+        Return (row, col, mine probability) of the best cell to reveal next, or None if
+        no unflagged hidden cell is left. Proven safe cells come first; otherwise the cell
+        with the lowest estimated probability is chosen. Interior cells are picked with
+        `rng` when given, or by scanning the board in order. Flagged cells are never
+        suggested, since they cannot be revealed.
+        """
+        safe = self.safe_cells()
+        if safe:
+            row, col = min(safe)
+            return row, col, 0.0
+
+        frontier, interior_probability = self.probabilities()
+        best = min(((position, probability) for position, probability in frontier.items()
+                    if not self._is_flagged(position)), key=lambda item: item[1], default=None)
+        if self.interior_count() > 0 and (best is None or interior_probability < best[1]):
+            position = self._interior_cell(rng)
+            if position is not None:
+                return position[0], position[1], interior_probability
+        if best is None:
+            return None
+        (row, col), probability = best
+        return row, col, probability
+
+    def _interior_cell(self, rng):
+        board = self.board
+
+        def is_interior(row, col):
+            position = (row, col)
+            cell = board.grid[row][col]
+            return (not cell.is_revealed and not cell.is_flagged and position not in self.known_mines
+                    and position not in self.known_safe and position not in self.unknown_constraints)
+
+        if board.rows is None:
+            # Cells two rows or columns past the explored chunks have no revealed neighbor
+            first_row, last_row, first_col, last_col = board.explored_bounds() or (0, 0, 0, 0)
+            rows, cols = range(first_row - 2, last_row + 3), range(first_col - 2, last_col + 3)
+        else:
+            rows, cols = range(board.rows), range(board.cols)
+        if rng is not None:
+            for _ in range(64):
+                row, col = rng.choice(rows), rng.choice(cols)
+                if is_interior(row, col):
+                    return row, col
+        for row in rows:
+            for col in cols:
+                if is_interior(row, col):
+                    return row, col
+        return None
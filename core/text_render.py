@@ -0,0 +1,35 @@
+"""
+Plain-text rendering of boards.
+
+Lines are produced by a generator and joined once, instead of growing a string cell by
+cell, and can be written straight to a stream. Every board provides
+`row_symbols(row, first_col, last_col)`, so engines can render whole rows at once.
+An optional (first_row, last_row, first_col, last_col) window limits the output to part
+of the board.
+"""
+
+
+def iter_lines(board, window=None):
+    """
+    Yield the text lines of the board (or of `window`, inclusive bounds): a header with
+    the column numbers, then one line per row, each without a trailing newline.
+    """
+    first_row, last_row, first_col, last_col = window or (0, board.rows - 1, 0, board.cols - 1)
+    yield "  " + " ".join(map(str, range(first_col, last_col + 1)))
+    for row in range(first_row, last_row + 1):
+        yield f"{row} " + "".join(symbol + " " for symbol in board.row_symbols(row, first_col, last_col))
+
+
+def render(board, window=None):
+    """
+    Return the board (or `window`) as one string, one line per row.
+    """
+    return "".join(line + "\n" for line in iter_lines(board, window))
+
+
+def write(board, stream, window=None):
+    """
+    Write the board (or `window`) to a text stream line by line, without building the
+    whole string first.
+    """
+    stream.writelines(line + "\n" for line in iter_lines(board, window))
@@ -1,47 +1,152 @@
-from core.game import Game
+import argparse
+import sys
+
+from core import instrumentation, text_render
+from core.game import BOARD_ENGINES, Game
+from core.neighbors import TOPOLOGIES
+from ui.terminal import AnsiBoardView, Viewport
+from utils.stats_store import StatsStore
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Play Minesweeper in the terminal.")
+    parser.add_argument("--rows", type=int, help="Number of rows (prompted if omitted)")
+    parser.add_argument("--cols", type=int, help="Number of columns (prompted if omitted)")
+    parser.add_argument("--mines", type=int, help="Number of mines (prompted if omitted)")
+    parser.add_argument("--engine", choices=sorted(BOARD_ENGINES), default="classic")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--first-click", choices=["cell", "neighborhood"], default=None)
+    parser.add_argument("--topology", choices=sorted(TOPOLOGIES), default="grid",
+                        help="Which cells are neighbors: the usual grid, a torus or a hex board")
+    parser.add_argument("--ansi", action="store_true",
+                        help="Draw the board once and repaint only changed cells")
+    parser.add_argument("--viewport", help="Show only ROWSxCOLS cells at a time, e.g. 20x40 "
+                                           "(defaults to the terminal size)")
+    parser.add_argument("--instrument", metavar="FILE",
+                        help="Collect timings of the hot paths and write them to FILE as JSON")
+    parser.add_argument("--profile-slow", type=float, metavar="SECONDS",
+                        help="With --instrument, keep cProfile output for sampled operations slower than this")
+    parser.add_argument("--stats", metavar="FILE", help="Record the result in the SQLite statistics database FILE")
+    return parser.parse_args()
 
-def main():
-    print("Welcome to Minesweeper!")
 
+def ask_board_size(args):
     while True:
         try:
-            rows = int(input("Enter the number of rows: "))
-            cols = int(input("Enter the number of columns: "))
-            num_mines = int(input("Enter the number of mines: "))
-            break  # Exit the loop if everything is valid
+            rows = args.rows if args.rows is not None else int(input("Enter the number of rows: "))
+            cols = args.cols if args.cols is not None else int(input("Enter the number of columns: "))
+            num_mines = args.mines if args.mines is not None else int(input("Enter the number of mines: "))
+            return rows, cols, num_mines
         except ValueError:
             print("Please enter valid integers for rows, columns, and mines.")
 
+
+def make_viewport(args, rows, cols):
+    if args.viewport:
+        height, width = (int(value) for value in args.viewport.lower().split("x"))
+        return Viewport(rows, cols, height, width)
+    return Viewport.for_terminal(rows, cols)
+
+
+def main():
+    args = parse_args()
+    print("Welcome to Minesweeper!")
+    rows, cols, num_mines = ask_board_size(args)
+    if args.instrument:
+        instrumentation.enable(profile_threshold=args.profile_slow)
+
     # Create the minesweeper game
-    game = Game(rows, cols, num_mines)
+    game = Game(rows, cols, num_mines, engine=args.engine, seed=args.seed, first_click=args.first_click,
+                topology=args.topology)
+    viewport = make_viewport(args, rows, cols)
+    view = AnsiBoardView(sys.stdout, game.board, viewport) if args.ansi else None
+    prompt = "Enter action (r row col to reveal, f row col to flag, m row col to move the view, u to undo): "
+    message = None
+    redraw = True
 
     # Main game loop
     while not game.is_game_over:
-        print(game.board)  # Add a __str__() method to the Board class for visualization
-        action = input("Enter action (r row col to reveal, f row col to flag): ").strip()
+        status = game.get_status()
+        status_text = (f"Time: {status['elapsed_time']}  Mines Left: {status['mines_left']}  "
+                       f"Cells Left: {status['safe_cells_remaining']}")
+        if view is not None:
+            if redraw:
+                view.draw()
+            else:
+                view.update(game.pop_changes())
+            view.show_status(f"{status_text}  {message}" if message else status_text)
+            view.prepare_prompt()
+        else:
+            text_render.write(game.board, sys.stdout, viewport.window())
+            print(status_text)
+            if message:
+                print(message)
+        game.pop_changes()  # Anything not repainted above is covered by the next full draw
+        message = None
+        redraw = False
+
+        action = input(prompt).strip()
 
         # Parse user input
         parts = action.split()
-        if len(parts) != 3:
-            print("Invalid input format! Use 'r row col' to reveal or 'f row col' to flag.")
+        if parts == ["u"]:  # Undo the last move
+            if not game.undo():
+                message = "Nothing to undo."
+            continue
+
+        if len(parts) != 3 or not parts[1].lstrip("-").isdigit() or not parts[2].lstrip("-").isdigit():
+            message = "Invalid input format! Use 'r row col' to reveal or 'f row col' to flag."
             continue
 
         command, row, col = parts[0], int(parts[1]), int(parts[2])
+        if command in ("r", "f") and not game.board.is_valid_position(row, col):
+            message = f"({row}, {col}) is outside the board."
+            continue
 
         # Handle commands
         if command == "r":  # Reveal cell
             game.reveal_cell(row, col)
+            redraw = viewport.follow(row, col)
         elif command == "f":  # Flag cell
             game.flag_cell(row, col)
+            redraw = viewport.follow(row, col)
+        elif command == "m":  # Move the viewport
+            viewport.move_to(row, col)
+            redraw = True
         else:
-            print("Invalid command! Use 'r' to reveal or 'f' to flag.")
+            message = "Invalid command! Use 'r' to reveal, 'f' to flag or 'm' to move the view."
 
     # End of game
+    if view is not None:
+        game.reveal_board()
+        view.draw()
+        view.prepare_prompt()
     if game.is_winner:
         print("Congratulations, you won!")
     else:
         print("You hit a mine! Game over.")
+    if args.stats:
+        record_stats(args.stats, game)
+    if args.instrument:
+        instrumentation.disable().dump(args.instrument)
+        print(f"Instrumentation written to {args.instrument}")
+
+
+def record_stats(path, game):
+    store = StatsStore(path)
+    store.record(game)
+    store.flush()
+    board = game.board
+    config = (board.rows, board.cols, board.num_mines)
+    settings = {"first_click": board.first_click, "topology": board.topology}
+    summary = store.summary(*config, **settings)
+    print(f"{summary['wins']} wins in {summary['games']} games with these settings.")
+    if game.is_winner:
+        best = store.leaderboard(*config, limit=1, **settings)[0][0]
+        print(f"Best time: {best:.1f}s")
+    store.close()
+
 
 # Ensure script runs as the main entry point
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
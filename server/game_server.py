@@ -0,0 +1,313 @@
+# server/game_server.py
+"""
+Asyncio server hosting many concurrent Minesweeper games.
+
+Clients send newline-delimited JSON requests over TCP and get one JSON line back for each.
+Every request names an operation:
+
+    {"op": "new", "rows": 16, "cols": 30, "mines": 99, "seed": 1, "first_click": "cell"}
+    {"op": "reveal", "session": "<id>", "row": 3, "col": 4}
+    {"op": "flag", "session": "<id>", "row": 3, "col": 4}
+    {"op": "chord", "session": "<id>", "row": 3, "col": 4}
+    {"op": "batch", "session": "<id>", "actions": [["flag", 0, 1], ["chord", 1, 1], ["reveal", 5, 5]]}
+    {"op": "undo", "session": "<id>"}
+    {"op": "status", "session": "<id>"}
+    {"op": "close", "session": "<id>"}
+
+An optional "id" field is echoed back. Replies to the actions only carry the cells that
+changed, as [row, col, symbol] triples, never the whole board:
+
+    {"id": 7, "ok": true, "changes": [[3, 4, "2"]], "game_over": false, "message": null,
+     "status": {...}}
+
+Errors are replied as {"id": ..., "ok": false, "error": "..."}.
+
+Example:
+    python -m server.game_server --port 8765
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+
+from core.action_log import ACTION_KINDS
+from core.game import Game
+from core.mines import FIRST_CLICK_MODES
+from utils.stats_store import StatsStore
+
+MAX_LINE_BYTES = 64 * 1024  # Longest request line accepted
+MAX_BATCH_ACTIONS = 4096  # Most actions accepted in one batch request
+MAX_SEED = 2 ** 64  # Seeds must be below this to fit in an action log
+
+
+class ProtocolError(Exception):
+    """
+    Raised for requests that cannot be served; the message is sent back to the client.
+    """
+
+
+class SessionManager:
+    """
+    Keeps the active games keyed by session id, least recently used first.
+    Sessions idle for longer than `idle_timeout` seconds are evicted by `evict_idle`, and
+    the oldest session is dropped when `max_sessions` is reached. Board size is capped per
+    session and large boards use the compact array engine, so memory per session is bounded.
+    Undo is limited to `max_undo` moves and games keep no action log, so that long
+    sessions do not grow either.
+    Finished games are recorded in `stats` (a utils.stats_store.StatsStore) if given.
+    """
+
+    def __init__(self, max_sessions=10000, idle_timeout=600, max_cells=1_000_000, array_threshold=10_000,
+                 stats=None, max_undo=100):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_cells = max_cells
+        self.array_threshold = array_threshold  # Boards with more cells use the array engine
+        self.max_undo = max_undo
+        self.sessions = OrderedDict()  # Session id -> [game, time of last use]
+        self.stats = stats
+        self.recorded = weakref.WeakSet()  # Games already in the stats, so an undone end is not counted twice
+
+    def create(self, rows, cols, mines, seed=None, first_click=None):
+        if not (isinstance(rows, int) and isinstance(cols, int) and isinstance(mines, int)):
+            raise ProtocolError("rows, cols and mines must be integers.")
+        if rows < 1 or cols < 1 or mines < 0 or mines >= rows * cols:
+            raise ProtocolError("Invalid board configuration.")
+        if rows * cols > self.max_cells:
+            raise ProtocolError(f"Boards are limited to {self.max_cells} cells.")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or not 0 <= seed < MAX_SEED):
+            raise ProtocolError(f"seed must be an integer from 0 to {MAX_SEED - 1}.")
+        if first_click not in FIRST_CLICK_MODES:
+            raise ProtocolError(f"first_click must be one of: {', '.join(json.dumps(mode) for mode in FIRST_CLICK_MODES)}.")
+        engine = "array" if rows * cols > self.array_threshold else "classic"
+        try:
+            game = Game(rows, cols, mines, engine=engine, seed=seed, first_click=first_click, record=False,
+                        max_undo=self.max_undo)
+        except ValueError as error:
+            raise ProtocolError(str(error))
+
+        while len(self.sessions) >= self.max_sessions:
+            self.sessions.popitem(last=False)  # Drop the least recently used session
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = [game, time.monotonic()]
+        return session_id, game
+
+    def get(self, session_id):
+        if not isinstance(session_id, str):
+            raise ProtocolError("session must be a session id string.")
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            raise ProtocolError("Unknown or expired session.")
+        entry[1] = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return entry[0]
+
+    def record(self, game):
+        if self.stats is not None and game.is_game_over and game not in self.recorded:
+            self.recorded.add(game)
+            self.stats.record(game)
+
+    def close(self, session_id):
+        return self.sessions.pop(session_id, None) is not None
+
+    def evict_idle(self):
+        """
+        Drop sessions idle for longer than the timeout. Returns how many were dropped.
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        evicted = 0
+        while self.sessions:
+            session_id, (_, last_used) = next(iter(self.sessions.items()))
+            if last_used > deadline:
+                break  # Ordered by last use, so every remaining session is fresher
+            del self.sessions[session_id]
+            evicted += 1
+        return evicted
+
+
+def encode_changes(game, changes):
+    board = game.board
+    return [[row, col, str(board.grid[row][col])] for row, col in changes]
+
+
+def handle_request(manager, request):
+    """
+    Apply one decoded request and return the reply dict.
+    """
+    op = request.get("op")
+    if op == "new":
+        session_id, game = manager.create(request.get("rows"), request.get("cols"), request.get("mines"),
+                                          seed=request.get("seed"), first_click=request.get("first_click"))
+        return {"session": session_id, "rows": game.rows, "cols": game.cols, "mines": game.num_mines,
+                "status": game.get_status()}
+
+    game = manager.get(request.get("session"))
+    if op in ACTION_KINDS or op == "batch":
+        if op == "batch":
+            actions = request.get("actions")
+            if not isinstance(actions, list) or len(actions) > MAX_BATCH_ACTIONS:
+                raise ProtocolError(f"actions must be a list of at most {MAX_BATCH_ACTIONS} actions.")
+        else:
+            actions = [[op, request.get("row"), request.get("col")]]
+        for action in actions:
+            if not (isinstance(action, list) and len(action) == 3 and action[0] in ACTION_KINDS
+                    and isinstance(action[1], int) and isinstance(action[2], int)
+                    and game.board.is_valid_position(action[1], action[2])):
+                raise ProtocolError("Actions need a kind (reveal, flag or chord) and a position on the board.")
+        if op == "flag":
+            game_over, message = game.is_game_over, game.flag_cell(actions[0][1], actions[0][2])
+        else:
+            if op == "reveal":
+                game_over, message = game.reveal_cell(actions[0][1], actions[0][2])
+            else:
+                game_over, message, _ = game.apply_actions(actions)
+            if game_over:
+                game.reveal_board()
+        manager.record(game)
+        return {"changes": encode_changes(game, game.pop_changes()), "game_over": game_over,
+                "message": message, "status": game.get_status()}
+    if op == "undo":
+        undone = game.undo()
+        return {"undone": undone, "changes": encode_changes(game, game.pop_changes()), "status": game.get_status()}
+    if op == "status":
+        return {"status": game.get_status()}
+    if op == "close":
+        manager.close(request["session"])
+        return {}
+    raise ProtocolError(f"Unknown op '{op}'.")
+
+
+class GameServer:
+    """
+    TCP server speaking the newline-delimited JSON protocol described above.
+    Requests on boards larger than `offload_cells` cells are served in a worker thread, so
+    that a flood reveal or undo on a huge board does not stall every other session; a lock
+    per game keeps the requests of such a session in order meanwhile.
+    """
+
+    def __init__(self, manager=None, eviction_interval=30, offload_cells=100_000):
+        self.manager = manager or SessionManager()
+        self.eviction_interval = eviction_interval
+        self.offload_cells = offload_cells
+        self.locks = weakref.WeakKeyDictionary()  # Game -> asyncio.Lock, for games served in threads
+        self.server = None
+        self.eviction_task = None
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE_BYTES)
+        self.eviction_task = asyncio.create_task(self.evict_periodically())
+        return self.server
+
+    async def stop(self):
+        if self.eviction_task:
+            self.eviction_task.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def evict_periodically(self):
+        while True:
+            await asyncio.sleep(self.eviction_interval)
+            self.manager.evict_idle()
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"ok": false, "error": "Request line too long."}\n')
+                    break
+                if not line:
+                    break
+                writer.write(await self.serve_line(line))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_line(self, line):
+        """
+        Serve one request line, in a worker thread if it targets a large game.
+        """
+        game = self.large_game(line)
+        if game is None:
+            return self.process_line(line)
+        lock = self.locks.get(game)
+        if lock is None:
+            lock = self.locks[game] = asyncio.Lock()
+        async with lock:
+            return await asyncio.get_running_loop().run_in_executor(None, self.process_line, line)
+
+    def large_game(self, line):
+        """
+        Return the game a request line acts on if its board has more than `offload_cells`
+        cells, else None. Invalid requests return None and get their error from process_line.
+        """
+        try:
+            request = json.loads(line)
+            entry = self.manager.sessions.get(request.get("session"))
+        except (ValueError, AttributeError, TypeError):
+            return None
+        if entry is None or entry[0].rows * entry[0].cols <= self.offload_cells:
+            return None
+        return entry[0]
+
+    def process_line(self, line):
+        """
+        Decode one request line, serve it and return the encoded reply line.
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ProtocolError("Requests must be JSON objects.")
+            request_id = request.get("id")
+            reply = {"id": request_id, "ok": True}
+            reply.update(handle_request(self.manager, request))
+        except json.JSONDecodeError:
+            reply = {"id": request_id, "ok": False, "error": "Malformed JSON."}
+        except ProtocolError as error:
+            reply = {"id": request_id, "ok": False, "error": str(error)}
+        except Exception as error:
+            # A request the checks above missed must not take the connection down
+            reply = {"id": request_id, "ok": False, "error": f"Request failed: {error}"}
+        return json.dumps(reply, separators=(",", ":")).encode() + b"\n"
+
+
+async def serve(host, port, manager):
+    server = GameServer(manager)
+    await server.start(host, port)
+    print(f"Serving Minesweeper on {host}:{port}")
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Minesweeper games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--idle-timeout", type=float, default=600, help="Seconds before an idle game is dropped")
+    parser.add_argument("--max-cells", type=int, default=1_000_000, help="Largest board a session may create")
+    parser.add_argument("--max-undo", type=int, default=100, help="Moves each session can take back")
+    parser.add_argument("--stats", metavar="FILE", help="Record finished games in the SQLite statistics database FILE")
+    args = parser.parse_args()
+    stats = StatsStore(args.stats) if args.stats else None
+    manager = SessionManager(max_sessions=args.max_sessions, idle_timeout=args.idle_timeout,
+                             max_cells=args.max_cells, stats=stats, max_undo=args.max_undo)
+    try:
+        asyncio.run(serve(args.host, args.port, manager))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if stats is not None:
+            stats.close()
+
+
+if __name__ == "__main__":
+    main()
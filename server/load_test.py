@@ -0,0 +1,114 @@
+# server/load_test.py
+"""
+Load-test client for the game server.
+
+Opens many concurrent connections; each one plays games by revealing random hidden
+cells, one request at a time, and records the round-trip latency of every request.
+Reports requests per second and latency percentiles.
+
+Examples:
+    python -m server.load_test --spawn-server --clients 200 --duration 10
+    python -m server.load_test --host 127.0.0.1 --port 8765 --clients 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from server.game_server import GameServer, SessionManager
+
+
+class LatencyRecorder:
+    """
+    Collects request latencies for the percentile report.
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def request(reader, writer, recorder, payload):
+    start = time.perf_counter()
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    recorder.latencies.append(time.perf_counter() - start)
+    if not reply.get("ok"):
+        recorder.errors += 1
+    return reply
+
+
+async def run_client(host, port, config, deadline, recorder, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            reply = await request(reader, writer, recorder, {
+                "op": "new", "rows": config.rows, "cols": config.cols, "mines": config.mines,
+                "seed": rng.randrange(2 ** 32), "first_click": "cell",
+            })
+            session = reply["session"]
+            hidden = [(row, col) for row in range(config.rows) for col in range(config.cols)]
+            rng.shuffle(hidden)
+            revealed = set()
+            while hidden and time.perf_counter() < deadline:
+                row, col = hidden.pop()
+                if (row, col) in revealed:
+                    continue
+                reply = await request(reader, writer, recorder,
+                                      {"op": "reveal", "session": session, "row": row, "col": col})
+                revealed.update((r, c) for r, c, _ in reply.get("changes", ()))
+                if reply.get("game_over"):
+                    break
+            await request(reader, writer, recorder, {"op": "close", "session": session})
+    finally:
+        writer.close()
+
+
+async def run_load_test(config):
+    server = None
+    if config.spawn_server:
+        server = GameServer(SessionManager())
+        await server.start(config.host, config.port)
+
+    recorder = LatencyRecorder()
+    start = time.perf_counter()
+    deadline = start + config.duration
+    await asyncio.gather(*(run_client(config.host, config.port, config, deadline, recorder, seed)
+                           for seed in range(config.clients)))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.stop()
+
+    count = len(recorder.latencies)
+    print(f"requests: {count} ({recorder.errors} errors) in {elapsed:.2f}s")
+    print(f"throughput: {count / elapsed:.0f} requests/s")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("p99.9", 0.999)):
+        print(f"{label}: {recorder.percentile(fraction) * 1000:.2f} ms")
+    print(f"max: {max(recorder.latencies, default=0) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Minesweeper game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent connections")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run")
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--spawn-server", action="store_true", help="Run a server in this process")
+    asyncio.run(run_load_test(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
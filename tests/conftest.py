@@ -0,0 +1,32 @@
+# tests/conftest.py
+def cell_states(board):
+    """Every cell of a bounded board as (is_mine, is_revealed, is_flagged, adjacent_mines)."""
+    return [[(cell.is_mine, cell.is_revealed, cell.is_flagged, cell.adjacent_mines)
+             for cell in (board.grid[row][col] for col in range(board.cols))]
+            for row in range(board.rows)]
+
+
+def count_cells(board, attribute):
+    """Number of cells of a bounded board whose `attribute` is set."""
+    return sum(getattr(board.grid[row][col], attribute) for row in range(board.rows) for col in range(board.cols))
+
+
+def game_state(game):
+    return (cell_states(game.board), game.board.revealed_count, game.board.flags_placed,
+            game.is_game_over, game.is_winner)
+
+
+def play_randomly(game, rng, moves, flag_rate=0.25):
+    """Make up to `moves` random reveals and flags; returns the moves made."""
+    played = []
+    for _ in range(moves):
+        if game.is_game_over:
+            break
+        row, col = rng.randrange(game.rows), rng.randrange(game.cols)
+        if rng.random() < flag_rate:
+            game.flag_cell(row, col)
+            played.append(("flag", row, col))
+        else:
+            game.reveal_cell(row, col)
+            played.append(("reveal", row, col))
+    return played
@@ -0,0 +1,98 @@
+# tests/test_action_log.py
+import random
+
+import pytest
+
+from core.action_log import ActionLog, ActionLogError, Replayer, apply_action, iter_logs, new_game, replay
+from core.game import Game
+from tests.conftest import game_state
+
+
+def played_game(engine="classic", first_click="cell", seed=7, undo_rate=0.1):
+    """A game played by the solver with some flags and undos thrown in."""
+    rng = random.Random(seed)
+    game = Game(16, 30, 99, engine=engine, seed=seed, first_click=first_click)
+    moves = 0
+    while not game.is_game_over and moves < 120:
+        roll = rng.random()
+        if roll < undo_rate:
+            game.undo()
+        elif roll < 0.3:
+            game.flag_cell(rng.randrange(16), rng.randrange(30))
+        else:
+            row, col, _ = game.get_solver().best_move(rng)
+            game.reveal_cell(row, col)
+        moves += 1
+    return game
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+@pytest.mark.parametrize("first_click", [None, "cell", "neighborhood"])
+@pytest.mark.parametrize("undo_rate", [0, 0.1])
+def test_replay_reproduces_the_game(engine, first_click, undo_rate):
+    game = played_game(engine, first_click, undo_rate=undo_rate)
+    assert game_state(replay(game.action_log)) == game_state(game)
+    assert game_state(replay(game.action_log, engine="array")) == game_state(game)
+
+
+def test_replay_without_undos_keeps_no_history():
+    game = played_game(undo_rate=0)
+    replayed = replay(game.action_log)
+    assert not replayed.history
+    assert game_state(replayed) == game_state(game)
+    stepped = new_game(game.action_log)
+    for kind, row, col, _ in list(game.action_log)[:10]:
+        apply_action(stepped, kind, row, col)
+    assert game_state(replay(game.action_log, until=10)) == game_state(stepped)
+
+
+def test_log_bytes_round_trip():
+    game = played_game()
+    data = game.action_log.to_bytes()
+    log, offset = ActionLog.from_bytes(data)
+    assert offset == len(data)
+    assert list(log) == list(game.action_log)
+    assert (log.rows, log.cols, log.num_mines, log.seed, log.first_click, log.engine) == (
+        16, 30, 99, 7, "cell", "classic")
+
+
+def test_logs_are_self_delimiting():
+    games = [played_game(seed=seed) for seed in range(3)]
+    data = b"".join(game.action_log.to_bytes() for game in games)
+    logs = list(iter_logs(data))
+    assert [list(log) for log in logs] == [list(game.action_log) for game in games]
+
+
+def test_truncated_log_is_rejected():
+    data = played_game().action_log.to_bytes()
+    with pytest.raises(ActionLogError):
+        ActionLog.from_bytes(data[:10])
+
+
+@pytest.mark.parametrize("interval", [1, 7, 500])
+@pytest.mark.parametrize("undo_rate", [0, 0.15])
+def test_replayer_seek_matches_replay(interval, undo_rate):
+    game = played_game(undo_rate=undo_rate)
+    log = game.action_log
+    replayer = Replayer(log, checkpoint_interval=interval)
+    expected = [game_state(replay(log, until=position)) for position in range(len(log) + 1)]
+    for position in [*range(len(log) + 1), len(log) // 2, 0]:
+        assert game_state(replayer.seek(position)) == expected[position]
+    assert game_state(replayer.seek(len(log) + 10)) == game_state(game)
+
+
+def test_chunked_games_are_not_logged():
+    assert Game(16, 30, 99, engine="chunked", seed=1).action_log is None
+    assert Game(16, 30, 99, seed=1, record=False).action_log is None
+    assert Game(16, 30, 99, seed=1, topology="hex").action_log is None
+
+
+def test_restart_clock_keeps_logged_times():
+    log = ActionLog(9, 9, 10, seed=1)
+    log.append(0, 4, 4, timestamp=250)
+    log.start_time -= 60  # As if the game then waited a minute in a queue
+    log.restart_clock()
+    log.append(0, 0, 0)
+    times = [timestamp for _, _, _, timestamp in log]
+    assert times[0] == 250
+    assert 250 <= times[1] < 1250
@@ -0,0 +1,38 @@
+# tests/test_batch_actions.py
+import pytest
+
+from core.game import Game
+from tests.conftest import count_cells
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_batch_matches_single_moves(engine):
+    actions = [("reveal", 4, 4), ("flag", 0, 0), ("reveal", 8, 8), ("flag", 0, 0), ("reveal", 0, 8)]
+    batched = Game(9, 9, 10, engine=engine, seed=2, first_click="neighborhood", record=False)
+    single = Game(9, 9, 10, engine=engine, seed=2, first_click="neighborhood", record=False)
+    game_over, _, changes = batched.apply_actions(actions)
+    for kind, row, col in actions:
+        if single.is_game_over:
+            break
+        (single.flag_cell if kind == "flag" else single.reveal_cell)(row, col)
+    assert game_over == single.is_game_over
+    assert count_cells(batched.board, "is_revealed") == count_cells(single.board, "is_revealed")
+    assert len(changes) == len(set(changes))
+    assert set(batched.pop_changes()) == set(changes)
+
+
+def test_invalid_batch_leaves_the_game_untouched():
+    game = Game(9, 9, 10, seed=2, record=False)
+    for actions in ([("reveal", 0, 0), ("reveal", 9, 0)], [("flag", 0, 0), ("dig", 1, 1)]):
+        with pytest.raises(ValueError):
+            game.apply_actions(actions)
+    assert game.board.revealed_count == 0 and game.board.flags_placed == 0
+
+
+def test_batch_stops_after_a_mine():
+    game = Game(9, 9, 10, seed=4, record=False)
+    mine = next((row, col) for row in range(9) for col in range(9) if game.board.grid[row][col].is_mine)
+    safe = next((row, col) for row in range(9) for col in range(9) if not game.board.grid[row][col].is_mine)
+    game_over, _, _ = game.apply_actions([("reveal", *mine), ("reveal", *safe)])
+    assert game_over and not game.is_winner
+    assert not game.board.grid[safe[0]][safe[1]].is_revealed
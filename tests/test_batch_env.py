@@ -0,0 +1,82 @@
+# tests/test_batch_env.py
+import numpy as np
+import pytest
+
+from core.action_log import FLAG, REVEAL
+from core.batch_env import FLAGGED, HIDDEN, BatchEnv
+from core.game import Game
+
+
+def board_planes(game):
+    board = game.board
+    rows, cols = range(board.rows), range(board.cols)
+    return {name: np.array([[getattr(board.grid[row][col], name) for col in cols] for row in rows])
+            for name in ("is_mine", "is_revealed", "is_flagged", "adjacent_mines")}
+
+
+@pytest.mark.parametrize("topology", ["grid", "torus", "hex"])
+@pytest.mark.parametrize("first_click", [None, "cell", "neighborhood"])
+def test_steps_match_game(topology, first_click):
+    env = BatchEnv(16, 9, 11, 12, first_click=first_click, seed=3, topology=topology, auto_reset=False)
+    games = [Game(9, 11, 12, seed=int(seed), first_click=first_click, topology=topology, record=False)
+             for seed in env.seeds]
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        cells = rng.integers(0, 99, 16)
+        kinds = np.where(rng.random(16) < 0.2, FLAG, REVEAL)
+        _, _, done, won = env.step(cells, kinds)
+        for index, game in enumerate(games):
+            if game.is_game_over:
+                continue
+            row, col = divmod(int(cells[index]), 11)
+            (game.flag_cell if kinds[index] == FLAG else game.reveal_cell)(row, col)
+            assert done[index] == game.is_game_over
+            assert won[index] == game.is_winner
+            planes = board_planes(game)
+            assert (planes["is_revealed"] == env.revealed[index]).all()
+            assert (planes["is_flagged"] == env.flagged[index]).all()
+            if game.board.mines_placed:
+                assert (planes["is_mine"] == env.mines[index]).all()
+                assert (planes["adjacent_mines"] == env.adjacent[index]).all()
+
+
+def test_observation_codes():
+    env = BatchEnv(2, 9, 9, 10, first_click="neighborhood", seed=1, auto_reset=False)
+    observation, _, _, _ = env.step([40, 0], [REVEAL, FLAG])
+    assert observation[1, 0, 0] == FLAGGED
+    assert (observation[1].reshape(-1)[1:] == HIDDEN).all()
+    revealed = env.revealed[0]
+    assert (observation[0][revealed] == env.adjacent[0][revealed]).all()
+    assert (observation[0][~revealed] == HIDDEN).all()
+    assert not env.action_mask()[1, 0]
+
+
+def test_game_copies_a_board():
+    env = BatchEnv(4, 9, 9, 10, first_click="cell", seed=2, auto_reset=False)
+    env.step([40, -1, 3, 3])
+    game = env.game(0)
+    assert game.board.revealed_count == env.revealed_count[0]
+    assert (board_planes(game)["is_revealed"] == env.revealed[0]).all()
+    fresh = Game(9, 9, 10, seed=int(env.seeds[0]), first_click="cell")
+    fresh.reveal_cell(4, 4)
+    assert (board_planes(fresh)["is_mine"] == env.mines[0]).all()
+    assert not env.game(1).board.mines_placed
+
+
+def test_auto_reset_counts_games():
+    env = BatchEnv(64, 9, 9, 10, seed=2)
+    for _ in range(100):
+        safe = ~(env.mines | env.revealed).reshape(64, -1)
+        cells = np.where(safe.any(axis=1), np.argmax(safe, axis=1), -1)
+        _, _, done, won = env.step(cells)
+        assert (done == won).all()  # Only safe cells are played
+    assert env.games_played == env.games_won > 0
+    assert not env.done.any()
+
+
+def test_invalid_actions():
+    env = BatchEnv(2, 5, 5, 3, seed=1)
+    with pytest.raises(ValueError):
+        env.step([25, 0])
+    with pytest.raises(ValueError):
+        env.step([0, 0], [REVEAL, 3])
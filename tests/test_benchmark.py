@@ -0,0 +1,32 @@
+# tests/test_benchmark.py
+from utils import benchmark
+
+
+def document(**timings):
+    return {"results": [{"key": key, "seconds_min": seconds} for key, seconds in timings.items()]}
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    baseline = document(a=1.0, b=1.0, c=2.0)
+    current = document(a=1.2, b=1.5, c=1.0)
+    assert benchmark.compare(current, baseline, 1.25) == [("b", 1.0, 1.5, 1.5)]
+
+
+def test_compare_skips_new_and_zero_baseline_cases():
+    baseline = document(a=0.0)
+    current = document(a=1.0, new=5.0)
+    assert benchmark.compare(current, baseline, 1.25) == []
+
+
+def test_run_produces_comparable_results():
+    results = benchmark.run(["classic", "array"], [(9, 9)], [0.15], repeats=1, max_cells=100,
+                            only=["flood_cascade", "construct"])
+    keys = [result["key"] for result in results["results"]]
+    assert keys == ["construct/classic/9x9/12", "flood_cascade/classic/9x9/1",
+                    "construct/array/9x9/12", "flood_cascade/array/9x9/1"]
+    assert benchmark.compare(results, results, 1.0) == []
+
+
+def test_run_skips_boards_above_max_cells():
+    results = benchmark.run(["classic"], [(9, 9), (16, 30)], [0.15], repeats=1, max_cells=100, only=["construct"])
+    assert {(result["rows"], result["cols"]) for result in results["results"]} == {(9, 9)}
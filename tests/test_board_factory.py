@@ -0,0 +1,92 @@
+# tests/test_board_factory.py
+import time
+
+import pytest
+
+from core import board_factory
+from core.board_factory import BoardFactory, is_no_guess, start_cell
+
+
+def test_plain_games_are_dealt_at_once():
+    factory = BoardFactory(9, 9, 10, engine="array", seed=1)
+    try:
+        seeds = {factory.get().board.seed for _ in range(5)}
+        assert len(seeds) == 5
+    finally:
+        factory.close()
+
+
+def test_no_guess_games_are_solvable():
+    factory = BoardFactory(9, 9, 10, no_guess=True, processes=0, seed=1)
+    try:
+        for _ in range(3):
+            game = factory.get(timeout=30)
+            assert game is not None
+            assert game.board.grid[4][4].is_revealed
+            assert is_no_guess(game, *start_cell(9, 9))
+    finally:
+        factory.close()
+
+
+def test_dealing_restarts_the_clocks():
+    factory = BoardFactory(9, 9, 10, no_guess=True, processes=0, seed=2)
+    try:
+        time.sleep(0.3)  # Let a game wait in the queue
+        game = factory.get(timeout=30)
+        assert time.time() - game.start_time < 0.2
+        game.flag_cell(0, 0)
+        opening, flag = list(game.action_log)
+        assert flag[3] - opening[3] < 200
+    finally:
+        factory.close()
+
+
+def test_worker_failures_reach_get(monkeypatch):
+    def fail(*args):
+        raise ValueError("search failed")
+
+    monkeypatch.setattr(board_factory, "search_no_guess", fail)
+    factory = BoardFactory(9, 9, 10, no_guess=True, processes=0)
+    try:
+        with pytest.raises(RuntimeError, match="search failed"):
+            factory.get(timeout=None)
+        with pytest.raises(RuntimeError):
+            factory.get(block=False)
+    finally:
+        factory.close()
+
+
+def test_seed_cache(tmp_path):
+    factory = BoardFactory(9, 9, 10, no_guess=True, processes=0, cache_dir=tmp_path, seed=3)
+    game = factory.get(timeout=30)
+    factory.close()
+    cached = factory.cached_seeds
+    assert cached and game.board.seed not in cached
+    reloaded = BoardFactory(9, 9, 10, no_guess=True, processes=0, cache_dir=tmp_path, seed=4)
+    try:
+        assert reloaded.get(timeout=30).board.seed == cached[-1]
+    finally:
+        reloaded.close()
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_opening_cannot_be_undone(engine):
+    factory = BoardFactory(9, 9, 10, engine=engine, no_guess=True, processes=0, seed=5)
+    try:
+        game = factory.get(timeout=30)
+    finally:
+        factory.close()
+    opening = sorted(game.board.iter_revealed())
+    assert not game.undo()
+    hidden = next((row, col) for row in range(9) for col in range(9) if not game.board.grid[row][col].is_revealed)
+    game.flag_cell(*hidden)
+    assert game.undo() and not game.undo()
+    assert sorted(game.board.iter_revealed()) == opening
+    assert is_no_guess(game, *start_cell(9, 9))
+
+
+def test_process_pool_is_small_and_only_for_no_guess():
+    plain = BoardFactory(9, 9, 10, seed=1)
+    plain.close()
+    assert plain.executor is None
+    assert plain.processes == min(board_factory.DEFAULT_PROCESSES, board_factory.os.cpu_count() or 1)
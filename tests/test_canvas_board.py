@@ -0,0 +1,124 @@
+# tests/test_canvas_board.py
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from core.game import Game
+from ui.canvas_board import CanvasGrid
+
+
+class FakeCanvas:
+    """Stand-in for a tk.Canvas scrolled to (x, y), recording the items it holds."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+        self.ids = itertools.count(1)
+        self.items = {}
+
+    def canvasx(self, x):
+        return self.x + x
+
+    def canvasy(self, y):
+        return self.y + y
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def create_rectangle(self, *coords, **options):
+        item = next(self.ids)
+        self.items[item] = dict(options)
+        return item
+
+    create_text = create_rectangle
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def delete(self, item):
+        if item == "all":
+            self.items.clear()
+        else:
+            del self.items[item]
+
+
+def canvas_grid(game, width=300, height=200, cell_size=30):
+    """A CanvasGrid wired to a FakeCanvas, without creating any Tk widgets."""
+    grid = CanvasGrid.__new__(CanvasGrid)
+    grid.game = game
+    grid.color_map = {}
+    grid.cell_size = cell_size
+    grid.items = {}
+    grid.redraw_pending = False
+    grid.canvas = FakeCanvas(width, height)
+    grid.clicks = []
+    grid.on_reveal = lambda row, col: grid.clicks.append(("reveal", row, col))
+    grid.on_flag = lambda row, col: grid.clicks.append(("flag", row, col))
+    return grid
+
+
+@pytest.fixture
+def game():
+    return Game(1000, 2000, 1000, engine="array", seed=1, first_click="cell", record=False)
+
+
+def test_cell_at_accounts_for_scrolling(game):
+    grid = canvas_grid(game)
+    assert grid.cell_at(0, 0) == (0, 0)
+    assert grid.cell_at(29, 59) == (1, 0)
+    grid.canvas.x, grid.canvas.y = 3000, 600
+    assert grid.cell_at(15, 15) == (20, 100)
+
+
+def test_visible_range_is_clamped_to_the_board(game):
+    grid = canvas_grid(game)
+    assert grid.visible_range() == (0, 6, 0, 10)
+    grid.canvas.x, grid.canvas.y = 2000 * 30 - 100, 1000 * 30 - 50
+    assert grid.visible_range() == (998, 999, 1996, 1999)
+
+
+def test_only_visible_cells_get_items(game):
+    grid = canvas_grid(game)
+    grid.redraw_viewport()
+    assert set(grid.items) == {(row, col) for row in range(7) for col in range(11)}
+    assert len(grid.canvas.items) == 2 * 7 * 11
+    grid.canvas.x = 30 * 5
+    grid.redraw_viewport()
+    assert set(grid.items) == {(row, col) for row in range(7) for col in range(5, 16)}
+    assert len(grid.canvas.items) == 2 * len(grid.items)
+
+
+def test_clicks_are_hit_tested(game):
+    grid = canvas_grid(Game(5, 5, 3, engine="array", seed=1, record=False))
+    grid.handle_left_click(SimpleNamespace(x=45, y=75))
+    grid.handle_right_click(SimpleNamespace(x=5, y=5))
+    grid.handle_left_click(SimpleNamespace(x=200, y=5))  # Past the last column
+    assert grid.clicks == [("reveal", 2, 1), ("flag", 0, 0)]
+
+
+def test_refresh_restyles_visible_changes_only():
+    game = Game(50, 50, 600, engine="array", seed=3, first_click="cell", record=False)
+    grid = canvas_grid(game)
+    grid.redraw_viewport()
+    game.reveal_cell(3, 3)
+    grid.refresh_cells(game.pop_changes())
+    rect, _ = grid.items[(3, 3)]
+    assert grid.canvas.items[rect]["fill"] == "white"
+    hidden = next(position for position in grid.items if not game.board.grid[position[0]][position[1]].is_revealed)
+    assert grid.canvas.items[grid.items[hidden][0]]["fill"] == "gray"
+
+
+def test_set_game_starts_over(game):
+    grid = canvas_grid(game)
+    grid.redraw_viewport()
+    grid.update_scroll_region = lambda: None
+    grid.schedule_redraw = lambda: None
+    other = Game(5, 5, 3, engine="array", seed=2, record=False)
+    grid.set_game(other)
+    assert grid.game is other and not grid.items and not grid.canvas.items
@@ -0,0 +1,65 @@
+# tests/test_chunked_board.py
+import random
+
+import pytest
+
+from core.chunked_board import ChunkedBoard
+from core.game import Game
+
+
+def mine_positions(board):
+    return {(row, col) for row in range(board.rows) for col in range(board.cols) if board.is_mine(row, col)}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_first_click_moves_mines_out_of_zone(seed):
+    board = ChunkedBoard(40, 40, 700, seed=seed, first_click="neighborhood", chunk_size=16)
+    board.reveal_cell(17, 15)  # A zone straddling chunk boundaries
+    mines = mine_positions(board)
+    assert len(mines) == board.num_mines == 700
+    assert not mines & {(17 + dr, 15 + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)}
+    assert board.safe_cells == 40 * 40 - 700
+
+
+def test_moved_mines_are_deterministic():
+    layouts = []
+    for _ in range(2):
+        board = ChunkedBoard(30, 30, 300, seed=4, first_click="neighborhood", chunk_size=8)
+        board.reveal_cell(10, 10)
+        layouts.append(mine_positions(board))
+    assert layouts[0] == layouts[1]
+
+
+def test_moved_mines_survive_eviction():
+    board = ChunkedBoard(64, 64, 800, seed=3, first_click="neighborhood", chunk_size=8, max_cached_chunks=2)
+    board.reveal_cell(8, 8)
+    assert len(mine_positions(board)) == 800
+
+
+def test_undo_restores_mines_of_zone():
+    game = Game(30, 30, 300, engine="chunked", seed=1, first_click="neighborhood")
+    before = mine_positions(game.board)
+    game.reveal_cell(5, 5)
+    game.undo()
+    assert mine_positions(game.board) == before
+    assert game.board.num_mines == 300
+
+
+def test_mines_left_follows_chunked_safe_zone():
+    game = Game(30, 30, 200, engine="chunked", seed=2, first_click="neighborhood")
+    game.reveal_cell(3, 3)
+    game.flag_cell(0, 29)
+    assert game.board.num_mines == 200
+    assert game.mines_left == 199
+
+
+def test_hint_on_unbounded_board():
+    game = Game(None, None, None, engine="chunked", seed=7, first_click="neighborhood")
+    game.reveal_cell(0, 0)
+    assert game.mines_left == float("inf")
+    frontier, interior = game.get_solver().probabilities()
+    assert interior == game.board.density
+    assert all(0 <= probability <= 1 for probability in frontier.values())
+    row, col, probability = game.hint()
+    assert not game.board.grid[row][col].is_revealed
+    game.auto_play(guess=True, rng=random.Random(1), max_moves=50)
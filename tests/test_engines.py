@@ -0,0 +1,51 @@
+# tests/test_engines.py
+import random
+
+import pytest
+
+from core.game import Game
+from tests.conftest import game_state, play_randomly
+
+
+@pytest.mark.parametrize("first_click", [None, "cell", "neighborhood"])
+@pytest.mark.parametrize("seed", range(5))
+def test_array_engine_matches_classic(first_click, seed):
+    classic = Game(12, 17, 30, engine="classic", seed=seed, first_click=first_click, record=False)
+    array = Game(12, 17, 30, engine="array", seed=seed, first_click=first_click, record=False)
+    moves = play_randomly(classic, random.Random(seed), 80)
+    for kind, row, col in moves:
+        (array.flag_cell if kind == "flag" else array.reveal_cell)(row, col)
+    assert game_state(array) == game_state(classic)
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_chord_and_cascade_agree(engine):
+    game = Game(30, 30, 60, engine=engine, seed=9, first_click="neighborhood", record=False)
+    reference = Game(30, 30, 60, engine="classic", seed=9, first_click="neighborhood", record=False)
+    for board_game in (game, reference):
+        board_game.reveal_cell(15, 15)
+        board_game.auto_play(flag_mines=True)
+    assert game_state(game) == game_state(reference)
+
+
+def test_large_cascade_counts_match():
+    counts = []
+    for engine in ("classic", "array"):
+        game = Game(300, 300, 100, engine=engine, seed=1, first_click="cell", record=False)
+        game.reveal_cell(150, 150)
+        counts.append(game.board.revealed_count)
+    assert counts[0] == counts[1] > 1
+
+
+@pytest.mark.parametrize("engine", ["classic", "array", "chunked"])
+def test_reveal_skips_flagged_and_revealed_cells(engine):
+    game = Game(9, 9, 10, engine=engine, seed=3, first_click="cell", record=False)
+    game.flag_cell(0, 0)
+    game.reveal_cell(0, 0)
+    assert not game.board.grid[0][0].is_revealed
+    game.flag_cell(0, 0)
+    game.reveal_cell(4, 4)
+    revealed = game.board.revealed_count
+    assert game.board.reveal_cell(4, 4) == []
+    assert game.board.revealed_count == revealed
+
@@ -0,0 +1,47 @@
+# tests/test_game.py
+import random
+
+import pytest
+
+from core.game import Game
+from tests.conftest import count_cells
+
+
+@pytest.mark.parametrize("engine", ["classic", "array", "chunked"])
+def test_counters_match_a_full_scan(engine):
+    rng = random.Random(3)
+    game = Game(16, 16, 40, engine=engine, seed=3, first_click="cell", record=False)
+    while not game.is_game_over:
+        row, col = rng.randrange(16), rng.randrange(16)
+        if rng.random() < 0.2:
+            game.flag_cell(row, col)
+        else:
+            game.reveal_cell(row, col)
+        board = game.board
+        revealed_safe = sum(board.grid[row][col].is_revealed and not board.grid[row][col].is_mine
+                            for row in range(16) for col in range(16))
+        assert board.revealed_count == revealed_safe or game.is_game_over
+        assert board.flags_placed == count_cells(board, "is_flagged")
+        assert board.safe_cells_remaining == 16 * 16 - 40 - board.revealed_count or game.is_game_over
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_win_is_detected_on_the_last_safe_cell(engine):
+    game = Game(9, 9, 10, engine=engine, seed=5, record=False)
+    safe = [(row, col) for row in range(9) for col in range(9) if not game.board.grid[row][col].is_mine]
+    for row, col in safe:
+        if not game.board.grid[row][col].is_revealed:
+            assert not game.is_game_over
+            game.reveal_cell(row, col)
+    assert game.is_game_over and game.is_winner
+    assert game.get_status()["safe_cells_remaining"] == 0
+
+
+def test_status_counters():
+    game = Game(9, 9, 10, seed=1, first_click="cell", record=False)
+    game.flag_cell(0, 0)
+    status = game.get_status()
+    assert status["mines_left"] == 9
+    assert status["flags_placed"] == 1
+    assert status["revealed"] == 0
+    assert not status["is_game_over"]
@@ -0,0 +1,127 @@
+# tests/test_game_server.py
+import asyncio
+import json
+
+import pytest
+
+from server.game_server import GameServer, SessionManager, handle_request
+from utils.stats_store import StatsStore
+
+
+def request(server, **fields):
+    return json.loads(server.process_line(json.dumps(fields).encode()))
+
+
+@pytest.fixture
+def server():
+    return GameServer(SessionManager(max_undo=5))
+
+
+def new_session(server, **fields):
+    reply = request(server, **{"op": "new", "rows": 9, "cols": 9, "mines": 10, "seed": 1, **fields})
+    assert reply["ok"], reply
+    return reply["session"]
+
+
+def test_moves_reply_with_changes_only(server):
+    session = new_session(server, first_click="cell")
+    reply = request(server, op="reveal", session=session, row=4, col=4, id=3)
+    assert reply["ok"] and reply["id"] == 3
+    assert reply["changes"] and all(len(change) == 3 for change in reply["changes"])
+    hidden = next((row, col) for row in range(9) for col in range(9)
+                  if not server.manager.get(session).board.grid[row][col].is_revealed)
+    reply = request(server, op="flag", session=session, row=hidden[0], col=hidden[1])
+    assert [change[:2] for change in reply["changes"]] == [list(hidden)]
+    assert reply["status"]["flags_placed"] == 1
+    assert request(server, op="undo", session=session)["undone"]
+
+
+@pytest.mark.parametrize("fields", [
+    {"seed": -1}, {"seed": 2 ** 64}, {"seed": "7"}, {"seed": True}, {"seed": 1.5},
+    {"first_click": "corner"}, {"first_click": 3}, {"mines": 81}, {"rows": "9"},
+])
+def test_invalid_new_games_are_rejected(server, fields):
+    base = {"op": "new", "rows": 9, "cols": 9, "mines": 10}
+    reply = request(server, **{**base, **fields})
+    assert reply["ok"] is False and reply["error"]
+
+
+@pytest.mark.parametrize("session", [None, 7, ["x"], {"a": 1}, "missing"])
+def test_invalid_sessions_are_rejected(server, session):
+    reply = request(server, op="status", session=session)
+    assert reply["ok"] is False
+
+
+def test_malformed_requests_get_replies(server):
+    assert json.loads(server.process_line(b"{not json"))["ok"] is False
+    assert json.loads(server.process_line(b"[1, 2]"))["ok"] is False
+    session = new_session(server)
+    for actions in ([["reveal", 0]], [["dig", 0, 0]], [["reveal", 99, 0]], "reveal", [["reveal", "0", 0]]):
+        assert request(server, op="batch", session=session, actions=actions)["ok"] is False
+
+
+def test_undo_is_bounded(server):
+    session = new_session(server)
+    for _ in range(50):
+        request(server, op="flag", session=session, row=0, col=0)
+    game = server.manager.get(session)
+    assert len(game.history) == 5
+    assert game.action_log is None
+
+
+def test_finished_games_are_recorded_once(tmp_path):
+    stats = StatsStore(tmp_path / "stats.db")
+    manager = SessionManager(stats=stats)
+    try:
+        session, game = manager.create(9, 9, 10, seed=4)
+        mine = next((row, col) for row in range(9) for col in range(9) if game.board.grid[row][col].is_mine)
+        handle_request(manager, {"op": "reveal", "session": session, "row": mine[0], "col": mine[1]})
+        handle_request(manager, {"op": "undo", "session": session})
+        handle_request(manager, {"op": "reveal", "session": session, "row": mine[0], "col": mine[1]})
+        stats.flush()
+        assert stats.summary(9, 9, 10)["games"] == 1
+    finally:
+        stats.close()
+
+
+def test_sessions_are_evicted():
+    manager = SessionManager(max_sessions=2, idle_timeout=0)
+    first, _ = manager.create(9, 9, 10)
+    manager.create(9, 9, 10)
+    manager.create(9, 9, 10)
+    assert first not in manager.sessions
+    assert manager.evict_idle() == 2
+
+
+def test_large_games_do_not_block_other_sessions():
+    server = GameServer(SessionManager(), offload_cells=10_000)
+    large = new_session(server, rows=400, cols=400, mines=1, first_click="cell")
+    small = new_session(server)
+    finished = []
+
+    async def send(name, **fields):
+        reply = json.loads(await server.serve_line(json.dumps(fields).encode()))
+        finished.append(name)
+        return reply
+
+    async def play():
+        return await asyncio.gather(send("large", op="reveal", session=large, row=399, col=399),
+                                    send("small", op="reveal", session=small, row=4, col=4))
+
+    large_reply, small_reply = asyncio.run(play())
+    assert finished == ["small", "large"]
+    assert large_reply["ok"] and large_reply["game_over"] and small_reply["ok"]
+
+
+def test_requests_of_a_large_game_stay_in_order():
+    server = GameServer(SessionManager(), offload_cells=0)
+    session = new_session(server, first_click="cell")
+
+    async def play():
+        lines = [json.dumps({"op": op, "session": session, "row": 4, "col": 4, "id": index}).encode()
+                 for index, op in enumerate(["reveal", "undo", "status"])]
+        return await asyncio.gather(*(server.serve_line(line) for line in lines))
+
+    reveal, undo, status = [json.loads(reply) for reply in asyncio.run(play())]
+    assert reveal["changes"] and undo["undone"]
+    assert status["status"]["revealed"] == 0
@@ -0,0 +1,104 @@
+# tests/test_instrumentation.py
+import json
+import random
+
+import pytest
+
+from core import instrumentation
+from core.game import Game
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    instrumentation.disable()
+    yield
+    instrumentation.disable()
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = instrumentation.Histogram()
+    for value in [0, 1, 2, 3, 5, 6, 7, 100, 1000, 1000]:
+        histogram.add(value)
+    assert (histogram.count, histogram.min, histogram.max, histogram.total) == (10, 0, 1000, 2124)
+    assert histogram.percentile(0.1) == 0
+    assert histogram.percentile(0.5) == 7  # Fifth value (5) lies in the bucket [4, 8)
+    assert histogram.percentile(0.8) == 127
+    assert histogram.percentile(1.0) == 1000  # Capped by the largest value seen
+    summary = histogram.to_dict()
+    assert summary["buckets"] == {0: 1, 1: 1, 3: 2, 7: 3, 127: 1, 1023: 2}
+    assert summary["mean"] == pytest.approx(212.4)
+
+
+def test_empty_histogram():
+    summary = instrumentation.Histogram().to_dict()
+    assert summary["count"] == 0 and summary["mean"] == 0 and summary["p99"] == 0
+
+
+def test_disabled_instrumentation_records_nothing():
+    calls = []
+
+    @instrumentation.timed("op")
+    def operation(value, scale=1):
+        calls.append(value)
+        return value * scale
+
+    assert operation(3, scale=2) == 6
+    instrumentation.observe("size", 5)
+    instrumentation.count("events")
+    assert calls == [3]
+    assert instrumentation.active is None
+    assert instrumentation.disable() is None
+
+
+def test_timed_calls_and_callback():
+    received = []
+    stats = instrumentation.enable(callback=lambda name, value: received.append((name, value)))
+
+    @instrumentation.timed("op")
+    def operation():
+        return "done"
+
+    assert operation() == "done"
+    instrumentation.observe("size", 42)
+    instrumentation.count("events", 2)
+    report = stats.report()
+    assert report["histograms"]["op"]["count"] == 1
+    assert report["histograms"]["size"]["max"] == 42
+    assert report["counters"] == {"events": 2}
+    assert [name for name, _ in received] == ["op", "size"]
+    assert received[1] == ("size", 42)
+    json.dumps(report)
+    assert instrumentation.disable() is stats
+
+
+def test_failed_calls_are_timed():
+    stats = instrumentation.enable()
+
+    @instrumentation.timed("op")
+    def operation():
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        operation()
+    assert stats.histograms["op"].count == 1
+
+
+def test_slow_calls_are_profiled():
+    stats = instrumentation.enable(profile_threshold=0, profile_rate=1, max_profiles=2, rng=random.Random(1))
+    game = Game(30, 30, 20, seed=1, first_click="cell")
+    game.reveal_cell(0, 0)
+    game.reveal_cell(29, 29)
+    game.reveal_cell(15, 15)
+    assert len(stats.profiles) == 2
+    assert stats.profiles[0][0] == "game.reveal_cell"
+
+
+def test_game_reports_cascade_sizes():
+    stats = instrumentation.enable()
+    game = Game(20, 20, 1, seed=1, first_click="cell")
+    game.reveal_cell(0, 0)
+    report = stats.report()
+    assert report["histograms"]["board.reveal_cell.cells"]["max"] == 399
+    assert report["counters"] == {"game.won": 1}
+    stats.reset()
+    assert stats.report()["histograms"] == {}
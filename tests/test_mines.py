@@ -0,0 +1,60 @@
+# tests/test_mines.py
+import random
+
+import pytest
+
+from core.game import Game
+from core.mines import resolve_seed, safe_zone, sample_mine_indices, validate_first_click
+
+
+@pytest.mark.parametrize("num_mines", [0, 1, 30, 50, 51, 99, 100])
+def test_sample_is_distinct_and_in_range(num_mines):
+    picked = sample_mine_indices(100, num_mines, random.Random(1))
+    assert len(picked) == len(set(picked)) == num_mines
+    assert all(0 <= index < 100 for index in picked)
+
+
+@pytest.mark.parametrize("num_mines", [10, 80, 91])
+def test_sample_skips_excluded_cells(num_mines):
+    excluded = [0, 1, 2, 50, 99]
+    picked = sample_mine_indices(100, num_mines, random.Random(2), excluded)
+    assert len(set(picked)) == num_mines
+    assert not set(picked) & set(excluded)
+
+
+def test_too_many_mines():
+    with pytest.raises(ValueError):
+        sample_mine_indices(10, 9, random.Random(0), excluded=[0, 1])
+
+
+def test_seeded_layouts_are_reproducible():
+    first = Game(16, 30, 99, seed=42, record=False)
+    second = Game(16, 30, 99, seed=42, record=False)
+    assert str(first.board) == str(second.board)
+    assert first.board.seed == 42
+    assert resolve_seed(None)[1] is not None
+    assert resolve_seed(random.Random(1))[1] is None
+
+
+@pytest.mark.parametrize("engine", ["classic", "array", "chunked"])
+@pytest.mark.parametrize("first_click", ["cell", "neighborhood"])
+def test_first_click_is_safe(engine, first_click):
+    for seed in range(20):
+        game = Game(9, 9, 30, engine=engine, seed=seed, first_click=first_click, record=False)
+        game.reveal_cell(0, 4)
+        assert not game.is_game_over or game.is_winner
+        if first_click == "neighborhood":
+            assert game.board.grid[0][4].adjacent_mines == 0
+
+
+def test_safe_zone_shrinks_on_dense_boards():
+    assert sorted(safe_zone(3, 3, 0, 1, 1, "neighborhood")) == list(range(9))
+    assert sorted(safe_zone(4, 4, 7, 0, 0, "neighborhood")) == [0, 1, 4, 5]
+    assert safe_zone(3, 3, 6, 1, 1, "neighborhood") == [4]
+    assert safe_zone(3, 3, 9, 1, 1, "cell") == []
+    assert safe_zone(3, 3, 5, 1, 1, None) == []
+
+
+def test_unknown_first_click_mode():
+    with pytest.raises(ValueError):
+        validate_first_click("corner")
@@ -0,0 +1,116 @@
+# tests/test_neighbors.py
+import random
+
+import numpy as np
+import pytest
+
+from core import board, neighbors
+from core.game import Game
+from core.neighbors import GRID, HEX, TORUS, Topology, get_topology, neighbor_table
+from tests.conftest import game_state, play_randomly
+
+KNIGHT = Topology("knight", [(1, 2), (2, 1), (-1, 2), (-2, 1), (1, -2), (2, -1), (-1, -2), (-2, -1)])
+
+
+@pytest.mark.parametrize("topology", [GRID, TORUS, HEX, KNIGHT], ids=lambda topology: topology.name)
+@pytest.mark.parametrize("shape", [(1, 1), (2, 2), (2, 3), (3, 3), (5, 7), (9, 9)])
+def test_table_matches_topology(topology, shape):
+    rows, cols = shape
+    table = neighbor_table(rows, cols, topology)
+    for row in range(rows):
+        for col in range(cols):
+            assert sorted(table.positions(row, col)) == sorted(topology.positions(rows, cols, row, col))
+
+
+def test_grid_corners_and_edges():
+    table = neighbor_table(4, 5, GRID)
+    assert sorted(table.positions(0, 0)) == [(0, 1), (1, 0), (1, 1)]
+    assert len(table.positions(0, 2)) == 5
+    assert len(table.positions(2, 2)) == 8
+
+
+def test_torus_wraps_around():
+    table = neighbor_table(4, 5, TORUS)
+    assert sorted(table.positions(0, 0)) == [(0, 1), (0, 4), (1, 0), (1, 1), (1, 4), (3, 0), (3, 1), (3, 4)]
+    assert all(len(table.positions(row, col)) == 8 for row in range(4) for col in range(5))
+
+
+def test_torus_smaller_than_its_neighborhood_has_no_duplicates():
+    table = neighbor_table(2, 2, TORUS)
+    assert sorted(table.positions(0, 0)) == [(0, 1), (1, 0), (1, 1)]
+
+
+def test_hex_rows_alternate():
+    table = neighbor_table(5, 5, HEX)
+    assert sorted(table.positions(2, 2)) == [(1, 1), (1, 2), (2, 1), (2, 3), (3, 1), (3, 2)]
+    assert sorted(table.positions(1, 2)) == [(0, 2), (0, 3), (1, 1), (1, 3), (2, 2), (2, 3)]
+    assert sorted(table.positions(0, 0)) == [(0, 1), (1, 0)]
+
+
+def test_hex_neighborhood_is_symmetric():
+    table = neighbor_table(6, 7, HEX)
+    for row in range(6):
+        for col in range(7):
+            for neighbor in table.positions(row, col):
+                assert (row, col) in table.positions(*neighbor)
+
+
+def test_tables_are_cached_and_numpy_views_agree():
+    table = neighbor_table(9, 9, HEX)
+    assert neighbor_table(9, 9, get_topology("hex")) is table
+    offsets, indices = table.numpy()
+    assert offsets[-1] == len(indices)
+    assert list(indices[offsets[10]:offsets[11]]) == list(table.neighbors(10))
+
+
+def test_unknown_topology():
+    with pytest.raises(ValueError):
+        get_topology("moebius")
+
+
+@pytest.mark.parametrize("topology", ["torus", "hex"])
+def test_counts_follow_the_topology(topology):
+    game = Game(8, 9, 15, engine="array", seed=2, topology=topology)
+    board = game.board
+    table = neighbor_table(8, 9, get_topology(topology))
+    mines = board.mines.reshape(-1)
+    for index in range(72):
+        if not mines[index]:
+            assert board.adjacent.reshape(-1)[index] == np.count_nonzero(mines[list(table.neighbors(index))])
+
+
+@pytest.mark.parametrize("topology", ["torus", "hex"])
+def test_engines_agree_on_other_topologies(topology):
+    games = [Game(8, 9, 12, engine=engine, seed=4, first_click="cell", topology=topology)
+             for engine in ("classic", "array")]
+    for game in games:
+        game.reveal_cell(3, 3)
+    assert game_state(games[0]) == game_state(games[1])
+
+
+@pytest.mark.parametrize("first_click", [None, "neighborhood"])
+def test_classic_board_without_table_matches(monkeypatch, first_click):
+    reference = Game(20, 25, 40, seed=3, first_click=first_click, record=False)
+    monkeypatch.setattr(board, "MAX_TABLE_CELLS", 100)
+    game = Game(20, 25, 40, seed=3, first_click=first_click, record=False)
+    assert game.board.neighbor_table is None and reference.board.neighbor_table is not None
+    for kind, row, col in play_randomly(reference, random.Random(3), 60):
+        (game.flag_cell if kind == "flag" else game.reveal_cell)(row, col)
+    assert game_state(game) == game_state(reference)
+    assert sorted(game.board.neighbors(0, 5)) == sorted(reference.board.neighbors(0, 5))
+
+
+def test_other_topologies_keep_their_table(monkeypatch):
+    monkeypatch.setattr(board, "MAX_TABLE_CELLS", 10)
+    assert Game(8, 9, 12, seed=1, topology="hex").board.neighbor_table is not None
+
+
+def test_table_cache_is_bounded_by_cells(monkeypatch):
+    monkeypatch.setattr(neighbors, "TABLE_CACHE_CELLS", 1000)
+    first = neighbor_table(20, 20, TORUS)
+    assert neighbor_table(20, 20, TORUS) is first
+    neighbor_table(20, 21, TORUS)
+    neighbor_table(20, 22, TORUS)  # Pushes the cache past 1000 cells
+    assert neighbor_table(20, 20, TORUS) is not first
+    assert neighbor_table(40, 40, TORUS) is not neighbor_table(40, 40, TORUS)  # Too large to cache
+    assert neighbors._table_cache_cells <= 1000
@@ -0,0 +1,50 @@
+# tests/test_reveal.py
+import pytest
+
+from core.game import Game
+from tests.conftest import cell_states
+
+
+def revealed_positions(board):
+    return {(row, col) for row in range(board.rows) for col in range(board.cols)
+            if board.grid[row][col].is_revealed}
+
+
+@pytest.mark.parametrize("engine", ["classic", "array", "chunked"])
+def test_reveal_returns_exactly_the_changed_cells(engine):
+    game = Game(30, 40, 120, engine=engine, seed=6, first_click="neighborhood", record=False)
+    before = revealed_positions(game.board)
+    changed = game.board.reveal_cell(15, 20)
+    assert len(changed) == len(set(changed)) > 1
+    assert set(changed) == revealed_positions(game.board) - before
+    assert game.board.revealed_count == len(changed)
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_numbered_cell_reveals_only_itself(engine):
+    game = Game(20, 20, 60, engine=engine, seed=2, record=False)
+    board = game.board
+    row, col = next((row, col) for row in range(20) for col in range(20)
+                    if not board.grid[row][col].is_mine and board.grid[row][col].adjacent_mines)
+    assert board.reveal_cell(row, col) == [(row, col)]
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_flags_stop_the_cascade(engine):
+    games = [Game(30, 30, 40, engine=engine, seed=8, first_click="cell", record=False) for _ in range(2)]
+    games[0].reveal_cell(15, 15)
+    opened = sorted(revealed_positions(games[0].board))
+    flagged = opened[len(opened) // 2]
+    games[1].flag_cell(*flagged)
+    games[1].reveal_cell(15, 15)
+    assert flagged not in revealed_positions(games[1].board)
+    assert games[1].board.grid[flagged[0]][flagged[1]].is_flagged
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_flagged_start_reveals_nothing(engine):
+    game = Game(9, 9, 10, engine=engine, seed=1, record=False)
+    game.board.toggle_flag(4, 4)
+    before = cell_states(game.board)
+    assert game.board.reveal_cell(4, 4) == []
+    assert cell_states(game.board) == before
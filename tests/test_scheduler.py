@@ -0,0 +1,122 @@
+# tests/test_scheduler.py
+import itertools
+import threading
+
+import pytest
+
+from ui.scheduler import Scheduler
+
+
+class FakeWidget:
+    """Stand-in for a Tk widget: `after` callbacks run on a simulated clock by `run`."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.ids = itertools.count()
+        self.now = 0
+        self.reported = []
+
+    def after(self, delay, callback):
+        job = f"after#{next(self.ids)}"
+        self.jobs[job] = (self.now + delay, callback)
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def report_callback_exception(self, kind, error, traceback):
+        self.reported.append(error)
+
+    def run(self, until):
+        while self.jobs:
+            job, (due, callback) = min(self.jobs.items(), key=lambda item: item[1][0])
+            if due > until:
+                break
+            del self.jobs[job]
+            self.now = due
+            callback()
+        self.now = until
+
+    def run_until_idle(self, scheduler):
+        while scheduler.running:
+            self.run(self.now + Scheduler.POLL_INTERVAL)
+
+
+@pytest.fixture
+def widget():
+    return FakeWidget()
+
+
+@pytest.fixture
+def scheduler(widget):
+    scheduler = Scheduler(widget)
+    yield scheduler
+    scheduler.close()
+
+
+def test_single_timer(widget, scheduler):
+    ticks = []
+    scheduler.start_timer(1000, lambda: ticks.append(("a", widget.now)))
+    scheduler.start_timer(1000, lambda: ticks.append(("b", widget.now)) or len(ticks) < 4)
+    widget.run(10_000)
+    assert ticks == [("a", 0), ("b", 0), ("b", 1000), ("b", 2000)]
+    assert not widget.jobs
+
+
+def test_stop_timer(widget, scheduler):
+    ticks = []
+    scheduler.start_timer(100, lambda: ticks.append(widget.now))
+    widget.run(250)
+    scheduler.stop_timer()
+    widget.run(1000)
+    assert ticks == [0, 100, 200]
+
+
+def test_redraws_are_coalesced(widget, scheduler):
+    calls = []
+    first, second = (lambda: calls.append("first")), (lambda: calls.append("second"))
+    for _ in range(5):
+        scheduler.request_redraw(first)
+        scheduler.request_redraw(second)
+    widget.run(Scheduler.FRAME_INTERVAL)
+    assert calls == ["first", "second"]
+    widget.run(1000)
+    assert calls == ["first", "second"]
+
+
+def test_background_results_come_back_on_the_widget_thread(widget, scheduler):
+    main_thread = threading.current_thread()
+    results = []
+
+    def work():
+        assert threading.current_thread() is not main_thread
+        return 42
+
+    scheduler.run_in_background(work, lambda result: results.append((result, threading.current_thread())))
+    scheduler.run_in_background(lambda: 1 / 0, results.append, lambda error: results.append(type(error)))
+    scheduler.run_in_background(lambda: 1 / 0, results.append)
+    widget.run_until_idle(scheduler)
+    assert (42, main_thread) in results
+    assert ZeroDivisionError in results
+    assert len(results) == 2
+    assert [type(error) for error in widget.reported] == [ZeroDivisionError]
+
+
+def test_discarded_work_is_dropped(widget, scheduler):
+    results = []
+    release = threading.Event()
+    scheduler.run_in_background(lambda: release.wait(5), results.append)
+    scheduler.request_redraw(lambda: results.append("redraw"))
+    scheduler.discard_pending()
+    release.set()
+    widget.run_until_idle(scheduler)
+    widget.run(widget.now + 1000)
+    assert results == []
+
+
+def test_close_cancels_everything(widget, scheduler):
+    scheduler.start_timer(100, lambda: None)
+    scheduler.request_redraw(lambda: None)
+    scheduler.run_in_background(lambda: None, lambda result: None)
+    scheduler.close()
+    assert not widget.jobs
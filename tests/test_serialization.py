@@ -0,0 +1,73 @@
+# tests/test_serialization.py
+import pytest
+
+from core.array_board import ArrayBoard
+from core.game import Game
+from core.serialization import SnapshotError, iter_snapshots, load_board, save_board, write_snapshots
+from tests.conftest import cell_states, game_state
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+@pytest.mark.parametrize("load_engine", ["classic", "array"])
+def test_game_round_trip(tmp_path, engine, load_engine):
+    game = Game(37, 53, 300, engine=engine, seed=5, first_click="cell")
+    game.reveal_cell(10, 10)
+    game.flag_cell(0, 0)
+    path = tmp_path / "game.msw"
+    game.save(path)
+    loaded = Game.load(path, engine=load_engine)
+    assert game_state(loaded) == game_state(game)
+    assert loaded.board.seed == 5
+    assert loaded.get_status()["mines_left"] == game.get_status()["mines_left"]
+
+
+def test_deferred_mines_survive_a_round_trip(tmp_path):
+    game = Game(10, 10, 10, seed=2, first_click="neighborhood")
+    game.save(tmp_path / "game.msw")
+    loaded = Game.load(tmp_path / "game.msw")
+    assert not loaded.board.mines_placed
+    loaded.reveal_cell(0, 0)
+    assert not loaded.is_game_over
+
+
+def test_finished_game_round_trip(tmp_path):
+    game = Game(9, 9, 10, seed=4)
+    mine = next((row, col) for row in range(9) for col in range(9) if game.board.grid[row][col].is_mine)
+    game.reveal_cell(*mine)
+    game.save(tmp_path / "game.msw")
+    loaded = Game.load(tmp_path / "game.msw")
+    assert loaded.is_game_over and not loaded.is_winner
+
+
+def test_board_round_trip(tmp_path):
+    board = ArrayBoard(64, 96, 900, seed=3)
+    board.reveal_cell(0, 0)
+    save_board(board, tmp_path / "board.msw")
+    loaded = load_board(tmp_path / "board.msw")
+    assert (loaded.mines == board.mines).all()
+    assert (loaded.adjacent == board.adjacent).all()
+    assert cell_states(loaded) == cell_states(board)
+
+
+def test_corpus_round_trip(tmp_path):
+    games = [Game(9, 9, 10, seed=seed) for seed in range(50)]
+    path = tmp_path / "corpus.msw"
+    assert write_snapshots(games, path) == 50
+    loaded = [Game.from_board(board, **state) for board, state in iter_snapshots(path)]
+    assert [cell_states(game.board) for game in loaded] == [cell_states(game.board) for game in games]
+
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / "junk.msw"
+    path.write_bytes(b"not a snapshot at all, just some bytes padding it out" * 4)
+    with pytest.raises(SnapshotError):
+        Game.load(path)
+
+
+@pytest.mark.parametrize("options", [{"engine": "chunked"}, {"topology": "hex"}])
+def test_unsupported_boards_raise_without_touching_the_file(tmp_path, options):
+    path = tmp_path / "game.msw"
+    path.write_bytes(b"previous save")
+    with pytest.raises(SnapshotError):
+        Game(9, 9, 10, seed=1, **options).save(path)
+    assert path.read_bytes() == b"previous save"
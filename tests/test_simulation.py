@@ -0,0 +1,87 @@
+# tests/test_simulation.py
+import pytest
+
+from utils import simulation
+from utils.simulation import SimulationStats, run_batch, run_simulation
+from utils.stats_store import StatsStore
+
+
+def config(**overrides):
+    return {"games": 25, "rows": 9, "cols": 9, "mines": 10, "policy": "solver", "engine": "classic",
+            "first_click": "neighborhood", "seed": 3, "batch_size": 10, **overrides}
+
+
+def test_batches_are_reproducible():
+    assert run_batch(config(), 1)["wins"] == run_batch(config(), 1)["wins"]
+    first, second = (run_batch(config(record_games=True), 1)["results"] for _ in range(2))
+    # Everything but the measured seconds
+    assert [(won, revealed, seed) for won, _, revealed, seed in first] == [
+        (won, revealed, seed) for won, _, revealed, seed in second]
+
+
+def test_last_batch_is_partial():
+    summary = run_batch(config(record_games=True), 2)
+    assert summary["games"] == 5
+    assert len(summary["results"]) == 5
+    assert summary["wins"] == sum(won for won, _, _, _ in summary["results"])
+    assert summary["cells_revealed"] == sum(revealed for _, _, revealed, _ in summary["results"])
+    assert run_batch(config(), 0)["results"] is None
+
+
+def test_stats_fold_batch_summaries():
+    stats = SimulationStats()
+    batches = [run_batch(config(), index) for index in range(3)]
+    for summary in batches:
+        stats.add(summary)
+    report = stats.report()
+    assert report["games"] == 25
+    assert report["wins"] == sum(summary["wins"] for summary in batches)
+    assert report["win_rate"] == pytest.approx(report["wins"] / 25)
+    low, high = report["win_rate_95"]
+    assert 0 <= low <= report["win_rate"] <= high <= 1
+    assert report["moves_per_game"] == pytest.approx(sum(summary["moves"] for summary in batches) / 25)
+
+
+def test_empty_stats_report():
+    report = SimulationStats().report()
+    assert report["games"] == 0 and report["win_rate"] == 0
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_run_simulation_matches_its_batches(workers):
+    batches = []
+    stats = run_simulation(25, 9, 9, 10, policy="solver", first_click="neighborhood", seed=3, batch_size=10,
+                           workers=workers, on_batch=lambda summary, stats: batches.append(summary))
+    assert len(batches) == 3
+    assert stats.games == 25
+    assert stats.wins == sum(run_batch(config(), index)["wins"] for index in range(3))
+
+
+def test_results_are_recorded_in_the_store(tmp_path):
+    store = StatsStore(tmp_path / "stats.db")
+    try:
+        stats = run_simulation(12, 9, 9, 10, policy="random", seed=1, batch_size=5, workers=0, store=store)
+        store.flush()
+        assert store.summary(9, 9, 10)["games"] == 12
+        assert store.summary(9, 9, 10)["wins"] == stats.wins
+    finally:
+        store.close()
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        run_simulation(1, 9, 9, 10, policy="psychic", workers=0)
+
+
+def test_games_keep_no_log_or_history(monkeypatch):
+    games = []
+
+    class RecordingGame(simulation.Game):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            games.append(self)
+
+    monkeypatch.setattr(simulation, "Game", RecordingGame)
+    run_batch(config(games=3), 0)
+    assert len(games) == 3
+    assert all(game.action_log is None and not game.history and game.max_undo == 0 for game in games)
@@ -0,0 +1,98 @@
+# tests/test_solver.py
+import itertools
+import random
+
+import pytest
+
+from core.game import Game
+from core.solver import Solver
+
+
+def brute_force_probabilities(board):
+    """Mine probability of every hidden cell, by enumerating all consistent layouts."""
+    hidden = [(row, col) for row in range(board.rows) for col in range(board.cols)
+              if not board.grid[row][col].is_revealed]
+    numbers = [(row, col, board.grid[row][col].adjacent_mines)
+               for row in range(board.rows) for col in range(board.cols) if board.grid[row][col].is_revealed]
+    layouts = 0
+    counts = dict.fromkeys(hidden, 0)
+    for mines in itertools.combinations(hidden, board.num_mines):
+        mines = set(mines)
+        if all(sum((row + dr, col + dc) in mines for dr in (-1, 0, 1) for dc in (-1, 0, 1)) == count
+               for row, col, count in numbers):
+            layouts += 1
+            for position in mines:
+                counts[position] += 1
+    return {position: count / layouts for position, count in counts.items()}
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_probabilities_match_brute_force(seed):
+    game = Game(5, 5, 6, seed=seed, first_click="cell")
+    game.reveal_cell(2, 2)
+    if game.is_game_over:
+        pytest.skip("The opening won the game")
+    solver = Solver(game.board)
+    frontier, interior = solver.probabilities()
+    for position, expected in brute_force_probabilities(game.board).items():
+        if position in frontier:
+            assert frontier[position] == pytest.approx(expected)
+        elif position in solver.known_mines:
+            assert expected == 1
+        elif position in solver.known_safe:
+            assert expected == 0
+        else:
+            assert interior == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_deductions_are_sound(seed):
+    game = Game(16, 30, 99, seed=seed, first_click="neighborhood")
+    game.reveal_cell(8, 15)
+    solver = game.get_solver()
+    for row, col in solver.safe_cells():
+        assert not game.board.grid[row][col].is_mine
+    for row, col in solver.mine_cells():
+        assert game.board.grid[row][col].is_mine
+
+
+def test_auto_play_without_guessing_only_reveals_safe_cells():
+    for seed in range(20):
+        game = Game(9, 9, 10, seed=seed, first_click="neighborhood")
+        game.reveal_cell(4, 4)
+        game.auto_play(flag_mines=True)
+        assert not game.is_game_over or game.is_winner
+
+
+def test_flagged_safe_cells_are_never_suggested():
+    game = Game(9, 9, 10, seed=3, first_click="neighborhood")
+    game.reveal_cell(4, 4)
+    solver = game.get_solver()
+    safe = sorted(solver.safe_cells())
+    assert safe
+    for row, col in safe:
+        game.flag_cell(row, col)
+    assert not solver.safe_cells()
+    move = game.hint()
+    assert move is None or not game.board.grid[move[0]][move[1]].is_flagged
+
+
+def test_auto_play_stops_when_only_flagged_cells_are_safe():
+    game = Game(9, 9, 10, seed=3, first_click="neighborhood")
+    game.reveal_cell(4, 4)
+    for row, col in game.get_solver().safe_cells():
+        game.flag_cell(row, col)
+    game.auto_play(guess=True, rng=random.Random(0), max_moves=1000)  # Must return
+
+
+def test_solver_wins_most_beginner_games():
+    rng = random.Random(0)
+    wins = 0
+    for seed in range(40):
+        game = Game(9, 9, 10, seed=seed, first_click="neighborhood")
+        game.reveal_cell(4, 4)
+        game.auto_play(guess=True, rng=rng)
+        assert game.is_game_over
+        wins += game.is_winner
+    assert wins >= 30
+
@@ -0,0 +1,99 @@
+# tests/test_stats_store.py
+import bisect
+import math
+import random
+import sqlite3
+import threading
+
+import pytest
+
+from core.game import Game
+from utils.stats_store import StatsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StatsStore(tmp_path / "stats.db", flush_interval=0.05)
+    yield store
+    store.close()
+
+
+def test_percentile_and_rank_match_a_sorted_reference(store):
+    rng = random.Random(1)
+    wins = []
+    for seed in range(5000):
+        won = rng.random() < 0.6
+        elapsed = rng.expovariate(1 / 30)
+        store.record_result(9, 9, 10, won, elapsed, seed=seed)
+        if won:
+            wins.append(elapsed)
+    store.flush()
+    wins.sort()
+    for fraction in (0.0, 0.01, 0.25, 0.5, 0.9, 0.999, 1.0):
+        rank = min(max(math.ceil(fraction * len(wins)) - 1, 0), len(wins) - 1)
+        assert store.percentile(9, 9, 10, fraction) == wins[rank]
+    for elapsed in (0, 1, 10, 30, 100, 1e6):
+        assert store.rank(9, 9, 10, elapsed) == pytest.approx(bisect.bisect_left(wins, elapsed) / len(wins))
+    summary = store.summary(9, 9, 10)
+    assert summary["games"] == 5000 and summary["wins"] == len(wins)
+    assert [elapsed for elapsed, _, _ in store.leaderboard(9, 9, 10, limit=5)] == wins[:5]
+
+
+def test_configurations_are_kept_apart(store):
+    store.record_result(9, 9, 10, True, 5.0)
+    store.record_result(9, 9, 10, True, 6.0, first_click="cell")
+    store.record_result(9, 9, 10, True, 7.0, topology="hex")
+    store.flush()
+    assert store.summary(9, 9, 10)["games"] == 1
+    assert store.percentile(9, 9, 10, 0.5, first_click="cell") == 6.0
+    assert store.percentile(9, 9, 10, 0.5, topology="hex") == 7.0
+    assert store.percentile(16, 16, 40, 0.5) is None
+    assert store.rank(16, 16, 40, 1.0) == 0.0
+
+
+def test_large_seeds_are_stored(store):
+    store.record_result(9, 9, 10, True, 1.0, seed=2 ** 64 - 1)
+    store.flush()
+    assert store.leaderboard(9, 9, 10)[0][1] == 2 ** 64 - 1
+
+
+def test_failed_writes_are_raised_by_flush_and_the_writer_survives(store):
+    store.record_result(9, 9, 10, True, 1.0, revealed=[1])  # Not a type SQLite can store
+    with pytest.raises(Exception):
+        store.flush()
+    store.record_result(9, 9, 10, True, 1.0)
+    store.flush()
+    assert store.summary(9, 9, 10)["games"] == 1
+
+
+def test_record_game(store, tmp_path):
+    game = Game(9, 9, 10, seed=3, record=False)
+    with pytest.raises(ValueError):
+        store.record(game)
+    game.reveal_cell(0, 0)
+    game.auto_play(guess=True, rng=random.Random(0))
+    store.record(game)
+    store.close()
+    with pytest.raises(ValueError):
+        store.record(game)
+    reopened = StatsStore(tmp_path / "stats.db")
+    assert reopened.summary(9, 9, 10) == {"games": 1, "wins": int(game.is_winner),
+                                         "win_rate": float(game.is_winner)}
+    reopened.close()
+
+
+def test_close_closes_query_connections(store):
+    store.record_result(9, 9, 10, True, 1.0)
+    store.flush()
+    thread = threading.Thread(target=store.summary, args=(9, 9, 10))
+    thread.start()
+    thread.join()
+    store.summary(9, 9, 10)
+    readers = list(store.readers)
+    assert len(readers) == 2
+    store.close()
+    for connection in readers:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+    with pytest.raises(ValueError):
+        store.summary(9, 9, 10)
@@ -0,0 +1,82 @@
+# tests/test_text_render.py
+import io
+
+import pytest
+
+from core import text_render
+from core.game import Game
+from ui.terminal import AnsiBoardView, Viewport, move_cursor
+
+
+def opened_game(engine):
+    game = Game(12, 15, 25, engine=engine, seed=6, first_click="neighborhood", record=False)
+    game.reveal_cell(6, 7)
+    game.flag_cell(0, 0)
+    return game
+
+
+def test_engines_render_the_same_text():
+    assert text_render.render(opened_game("classic").board) == text_render.render(opened_game("array").board)
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_render_matches_cells(engine):
+    board = opened_game(engine).board
+    lines = text_render.render(board).splitlines()
+    assert lines[0] == "  " + " ".join(str(col) for col in range(board.cols))
+    for row in range(board.rows):
+        assert lines[row + 1] == f"{row} " + "".join(str(board.grid[row][col]) + " " for col in range(board.cols))
+
+
+def test_window_and_write():
+    board = opened_game("classic").board
+    full = text_render.render(board).splitlines()
+    window = text_render.render(board, (2, 4, 0, board.cols - 1)).splitlines()
+    assert window == full[:1] + full[3:6]
+    assert text_render.render(board, (0, 0, 3, 5)).splitlines()[0] == "  3 4 5"
+    stream = io.StringIO()
+    text_render.write(board, stream)
+    assert stream.getvalue() == text_render.render(board)
+
+
+def test_viewport_is_clamped_to_board():
+    viewport = Viewport(10, 20, 50, 8)
+    assert (viewport.height, viewport.width) == (10, 8)
+    viewport.move_to(5, 30)
+    assert viewport.window() == (0, 9, 12, 19)
+    viewport.move_to(-3, -3)
+    assert viewport.window() == (0, 9, 0, 7)
+
+
+def test_viewport_follows_moves_outside_it():
+    viewport = Viewport(100, 100, 10, 10)
+    assert not viewport.follow(5, 5)
+    assert viewport.follow(50, 60)
+    assert viewport.contains(50, 60)
+    assert viewport.window() == (45, 54, 55, 64)
+    assert viewport.follow(99, 99)
+    assert viewport.window() == (90, 99, 90, 99)
+
+
+def test_update_repaints_only_visible_changes():
+    game = Game(20, 20, 40, seed=3, first_click="neighborhood", record=False)
+    stream = io.StringIO()
+    view = AnsiBoardView(stream, game.board, Viewport(20, 20, 5, 5))
+    view.viewport.move_to(10, 10)
+    game.board.grid[11][12].is_flagged = True
+    view.update([(11, 12), (0, 0)])
+    # Labels are three characters wide and cells three characters per column
+    assert stream.getvalue() == move_cursor(3, 3 + 2 * 3 + 1) + "F"
+    stream.truncate(0)
+    view.update([(0, 0)])
+    assert stream.getvalue() == ""
+
+
+def test_draw_shows_the_viewport():
+    game = Game(20, 20, 40, seed=3, first_click="neighborhood", record=False)
+    stream = io.StringIO()
+    view = AnsiBoardView(stream, game.board, Viewport(20, 20, 3, 4))
+    view.draw()
+    lines = stream.getvalue().split("\n")
+    assert lines[0].endswith("   0  1  2  3  ")
+    assert lines[1:4] == ["0  ?  ?  ?  ?  ", "1  ?  ?  ?  ?  ", "2  ?  ?  ?  ?  "]
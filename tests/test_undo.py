@@ -0,0 +1,99 @@
+# tests/test_undo.py
+import random
+
+import pytest
+
+from core.game import Game
+from tests.conftest import game_state
+
+
+def revealed_and_flagged(game):
+    board = game.board
+    return (sorted(board.iter_revealed()),
+            [board.grid[row][col].is_flagged for row in range(game.rows) for col in range(game.cols)],
+            game.is_game_over, board.flags_placed)
+
+
+def play_recording_states(game, rng, moves):
+    """Play random moves, returning the state before each one that entered the undo history."""
+    states = [revealed_and_flagged(game)]
+    for _ in range(moves):
+        if game.is_game_over:
+            break
+        depth = game.history_base + len(game.history)
+        row, col = rng.randrange(game.rows), rng.randrange(game.cols)
+        (game.flag_cell if rng.random() < 0.3 else game.reveal_cell)(row, col)
+        if game.history_base + len(game.history) > depth:
+            states.append(revealed_and_flagged(game))
+    return states
+
+
+@pytest.mark.parametrize("engine", ["classic", "array", "chunked"])
+@pytest.mark.parametrize("first_click", [None, "cell", "neighborhood"])
+def test_undo_walks_back_every_move(engine, first_click):
+    game = Game(12, 12, 20, engine=engine, seed=3, first_click=first_click)
+    states = play_recording_states(game, random.Random(5), 40)
+    undone = 0
+    while game.undo():
+        undone += 1
+        assert revealed_and_flagged(game) == states[-1 - undone]
+    assert undone == len(states) - 1
+    assert game.board.mines_placed == (first_click is None)
+
+
+@pytest.mark.parametrize("engine", ["classic", "array", "chunked"])
+@pytest.mark.parametrize("max_undo", [0, 3])
+def test_max_undo_bounds_history_and_journal(engine, max_undo):
+    game = Game(12, 12, 20, engine=engine, seed=3, first_click="cell", max_undo=max_undo)
+    states = play_recording_states(game, random.Random(5), 40)
+    assert len(game.history) <= max_undo
+    assert len(game.board.journal.entries) <= 2 * max_undo + 2
+    undone = 0
+    while game.undo():
+        undone += 1
+        assert revealed_and_flagged(game) == states[-1 - undone]
+    assert undone == min(max_undo, len(states) - 1)
+
+
+def test_flag_spam_keeps_memory_bounded():
+    game = Game(9, 9, 10, seed=1, max_undo=100)
+    for _ in range(10_000):
+        game.flag_cell(0, 0)
+    assert len(game.history) == 100
+    assert len(game.board.journal.entries) <= 101
+
+
+@pytest.mark.parametrize("engine", ["classic", "array"])
+def test_snapshot_restore_branches(engine):
+    game = Game(16, 30, 99, engine=engine, seed=3, first_click="cell")
+    game.reveal_cell(8, 8)
+    before = game_state(game)
+    snapshot = game.snapshot()
+    for row in range(16):
+        for col in range(30):
+            if not game.is_game_over:
+                game.reveal_cell(row, col)
+    game.restore(snapshot)
+    assert game_state(game) == before
+    game.flag_cell(0, 0)
+    game.restore(snapshot)
+    assert game_state(game) == before
+
+
+def test_restoring_an_expired_snapshot_fails():
+    game = Game(9, 9, 10, seed=1, max_undo=2)
+    snapshot = game.snapshot()
+    for row in range(3):
+        game.flag_cell(row, row)
+    with pytest.raises(ValueError):
+        game.restore(snapshot)
+
+
+def test_undo_after_loss_resumes_the_game():
+    game = Game(9, 9, 10, engine="array", seed=4)
+    mine = next((row, col) for row in range(9) for col in range(9) if game.board.grid[row][col].is_mine)
+    game.reveal_cell(*mine)
+    assert game.is_game_over
+    assert game.undo()
+    assert not game.is_game_over
+    assert not game.board.grid[mine[0]][mine[1]].is_revealed
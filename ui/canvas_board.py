@@ -0,0 +1,177 @@
+# ui/canvas_board.py
+import tkinter as tk
+
+
+class CanvasGrid(tk.Frame):
+    """
+    Draws the game board on a single scrollable Canvas instead of one Button per cell.
+    Only the cells inside the visible viewport have canvas items, so the cost of building
+    and redrawing the board depends on the window size rather than the board size.
+    """
+    MIN_CELL_SIZE = 6
+    MAX_CELL_SIZE = 60
+    MIN_TEXT_SIZE = 12  # Below this cell size numbers are not drawn, only colors
+
+    def __init__(self, master, game, color_map, on_reveal, on_flag, cell_size=30):
+        super().__init__(master)
+        self.game = game
+        self.color_map = color_map
+        self.on_reveal = on_reveal  # Called with (row, col) on left click
+        self.on_flag = on_flag      # Called with (row, col) on right click
+        self.cell_size = cell_size
+        self.items = {}  # (row, col) -> (rectangle id, text id) for the visible cells
+        self.redraw_pending = False
+
+        self.canvas = tk.Canvas(self, width=600, height=400, bg="light gray", highlightthickness=0)
+        x_scrollbar = tk.Scrollbar(self, orient="horizontal", command=self.xview)
+        y_scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.canvas.configure(xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
+
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        y_scrollbar.grid(row=0, column=1, sticky="ns")
+        x_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # Clicks are hit-tested by coordinate; there is no widget per cell
+        self.canvas.bind("<Button-1>", self.handle_left_click)
+        self.canvas.bind("<Button-3>", self.handle_right_click)
+        self.canvas.bind("<Button-2>", self.handle_right_click)  # Right click on macOS
+        self.canvas.bind("<Configure>", lambda event: self.schedule_redraw())
+
+        # Scrolling and zooming (Linux reports the wheel as buttons 4 and 5)
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll("y", -event.delta))
+        self.canvas.bind("<Shift-MouseWheel>", lambda event: self.scroll("x", -event.delta))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll("y", -1))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll("y", 1))
+        self.canvas.bind("<Control-MouseWheel>", lambda event: self.zoom(1 if event.delta > 0 else -1))
+        self.canvas.bind("<Control-Button-4>", lambda event: self.zoom(1))
+        self.canvas.bind("<Control-Button-5>", lambda event: self.zoom(-1))
+        self.canvas.bind("<Enter>", lambda event: self.canvas.focus_set())
+        self.canvas.bind("<plus>", lambda event: self.zoom(1))
+        self.canvas.bind("<minus>", lambda event: self.zoom(-1))
+
+        self.update_scroll_region()
+
+    def set_game(self, game):
+        """Switch to a new game and redraw from scratch."""
+        self.game = game
+        self.update_scroll_region()
+        self.clear_items()
+        self.schedule_redraw()
+
+    def update_scroll_region(self):
+        board = self.game.board
+        self.canvas.configure(scrollregion=(0, 0, board.cols * self.cell_size, board.rows * self.cell_size))
+
+    def xview(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_redraw()
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_redraw()
+
+    def scroll(self, axis, delta):
+        step = 1 if delta > 0 else -1
+        if axis == "x":
+            self.canvas.xview_scroll(step, "units")
+        else:
+            self.canvas.yview_scroll(step, "units")
+        self.schedule_redraw()
+
+    def zoom(self, direction):
+        """Grow or shrink the cells, keeping the top-left visible cell in place."""
+        new_size = self.cell_size + (2 if direction > 0 else -2)
+        new_size = max(self.MIN_CELL_SIZE, min(self.MAX_CELL_SIZE, new_size))
+        if new_size == self.cell_size:
+            return
+        first_row, first_col = self.cell_at(0, 0)
+        self.cell_size = new_size
+        self.update_scroll_region()
+        board = self.game.board
+        self.canvas.xview_moveto(first_col / board.cols)
+        self.canvas.yview_moveto(first_row / board.rows)
+        self.clear_items()
+        self.schedule_redraw()
+
+    def cell_at(self, x, y):
+        """Convert widget coordinates into a (row, col) on the board."""
+        col = int(self.canvas.canvasx(x) // self.cell_size)
+        row = int(self.canvas.canvasy(y) // self.cell_size)
+        return row, col
+
+    def handle_left_click(self, event):
+        row, col = self.cell_at(event.x, event.y)
+        if self.game.board.is_valid_position(row, col):
+            self.on_reveal(row, col)
+
+    def handle_right_click(self, event):
+        row, col = self.cell_at(event.x, event.y)
+        if self.game.board.is_valid_position(row, col):
+            self.on_flag(row, col)
+
+    def schedule_redraw(self):
+        """Coalesce scroll, resize and zoom events into one viewport redraw."""
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.after_idle(self.redraw_viewport)
+
+    def visible_range(self):
+        """Return (first_row, last_row, first_col, last_col) of the cells in view, inclusive."""
+        board = self.game.board
+        first_row, first_col = self.cell_at(0, 0)
+        last_row, last_col = self.cell_at(self.canvas.winfo_width(), self.canvas.winfo_height())
+        return (max(first_row, 0), min(last_row, board.rows - 1),
+                max(first_col, 0), min(last_col, board.cols - 1))
+
+    def redraw_viewport(self):
+        """Create items for cells that scrolled into view and drop the ones that left it."""
+        self.redraw_pending = False
+        first_row, last_row, first_col, last_col = self.visible_range()
+
+        for position in [position for position in self.items
+                         if not (first_row <= position[0] <= last_row and first_col <= position[1] <= last_col)]:
+            for item in self.items.pop(position):
+                self.canvas.delete(item)
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                if (row, col) not in self.items:
+                    self.draw_cell(row, col)
+
+    def draw_cell(self, row, col):
+        size = self.cell_size
+        x, y = col * size, row * size
+        rect = self.canvas.create_rectangle(x, y, x + size, y + size, outline="dark gray")
+        text = self.canvas.create_text(x + size / 2, y + size / 2,
+                                       font=("Helvetica", max(size // 2, 1), "bold"))
+        self.items[(row, col)] = (rect, text)
+        self.update_cell(row, col)
+
+    def update_cell(self, row, col):
+        """Restyle the items of one cell; cells outside the viewport are skipped."""
+        items = self.items.get((row, col))
+        if items is None:
+            return
+        rect, text = items
+        cell = self.game.board.grid[row][col]
+        label = str(cell)
+        self.canvas.itemconfigure(rect, fill="white" if cell.is_revealed else "gray")
+        self.canvas.itemconfigure(text,
+                                  text=label if self.cell_size >= self.MIN_TEXT_SIZE else "",
+                                  fill=self.color_map.get(label, "black"))
+
+    def refresh_cells(self, changes):
+        """Redraw the given (row, col) cells, ignoring those that are not visible."""
+        if len(changes) > len(self.items):
+            # Large cascades: restyling everything in view is cheaper than scanning the changes
+            for row, col in list(self.items):
+                self.update_cell(row, col)
+        else:
+            for row, col in changes:
+                self.update_cell(row, col)
+
+    def clear_items(self):
+        self.canvas.delete("all")
+        self.items = {}
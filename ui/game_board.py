@@ -2,7 +2,12 @@
 import tkinter as tk
 import tkmacosx
 from tkinter import messagebox
+import threading
+from core import instrumentation
+from core.board_factory import BoardFactory
 from core.game import Game
+from ui.canvas_board import CanvasGrid
+from ui.scheduler import Scheduler
 
 
 class GameBoard(tk.Frame):
@@ -19,16 +24,30 @@ class GameBoard(tk.Frame):
         "?": "black",  # Default hidden state
     }
 
-    def __init__(self, master):
+    RENDERERS = ("buttons", "canvas")  # One widget per cell, or a single scrollable canvas
+    BACKGROUND_CELLS = 100_000  # Moves on boards this large run on a worker thread
+
+    def __init__(self, master, engine="classic", renderer="buttons", stats=None):
         super().__init__(master)
         self.rows = 10
         self.cols = 10
         self.num_mines = 10
+        self.engine = engine  # Board implementation, see core.game.BOARD_ENGINES; see board_engine
         self.master = master
-        self.game = Game(self.rows, self.cols, self.num_mines)  # 10x10 grid, 10 mines
+        self.renderer = tk.StringVar(master, value=renderer)  # Applied on the next New Game
+        self.canvas_grid = None  # Set while the canvas renderer is in use
+        self.no_guess = tk.BooleanVar(master, value=False)  # Deal boards solvable without guessing
+        self.factory = None  # Pre-generates games for the current settings
+        self.stats = stats  # utils.stats_store.StatsStore recording finished games, if any
+        self.recorded_game = None  # Last game sent to the stats, so an undone end is not counted twice
+        self.scheduler = Scheduler(self)  # Timer, coalesced redraws and background work
+        self.dealing = None  # Factory a worker is waiting on for the next game
+        self.move_pending = False  # A move is running on a worker thread; clicks wait for it
+        self.game = Game(self.rows, self.cols, self.num_mines, engine=self.board_engine())  # 10x10 grid, 10 mines
         self.buttons = [[None for _ in range(self.game.board.cols)] for _ in range(self.game.board.rows)]
         self.create_widgets()
-        self.update_timer_and_mines_left()
+        self.scheduler.start_timer(1000, self.update_timer_and_mines_left)
+        self.bind("<Destroy>", self.handle_destroy)
 
     def create_widgets(self):
         # Main frame for all top controls
@@ -69,6 +88,21 @@ class GameBoard(tk.Frame):
         )
         new_game_button.grid(row=0, column=6, padx=10)
 
+        # Undo button (also Ctrl+Z), as many moves back as wanted
+        undo_button = tk.Button(inputs_frame, text="Undo", command=self.undo, bg="light gray")
+        undo_button.grid(row=0, column=9, padx=10)
+        self.master.bind("<Control-z>", lambda event: self.undo())
+
+        # Renderer selection (the canvas only draws the visible cells, for very large boards)
+        renderer_label = tk.Label(inputs_frame, text="Renderer:")
+        renderer_label.grid(row=0, column=7, padx=5)
+        renderer_menu = tk.OptionMenu(inputs_frame, self.renderer, *self.RENDERERS)
+        renderer_menu.grid(row=0, column=8, padx=5)
+
+        # No-guess boards are found in the background, so they may take a moment
+        no_guess_check = tk.Checkbutton(inputs_frame, text="No guessing", variable=self.no_guess)
+        no_guess_check.grid(row=0, column=10, padx=5)
+
         # Row for Timer and Mines Left
         status_frame = tk.Frame(top_controls_frame)
         status_frame.pack(pady=5)
@@ -82,15 +116,24 @@ class GameBoard(tk.Frame):
         self.mines_left_label.grid(row=0, column=1, padx=10)
 
     def create_game_grid(self):
-        """Create the grid of buttons for the game board."""
+        """Create the grid of buttons for the game board, or a canvas in canvas mode."""
+        if self.renderer.get() == "canvas" and self.canvas_grid is not None:
+            self.canvas_grid.set_game(self.game)  # Keep the canvas, its zoom and scroll position
+            return
         if hasattr(self, "grid_frame"):
             self.grid_frame.destroy()  # Remove the existing grid frame if it exists
 
+        if self.renderer.get() == "canvas":
+            self.create_canvas_grid()
+            return
+        self.canvas_grid = None
+
         self.grid_frame = tk.Frame(self.master)
         self.grid_frame.pack(pady=10)
 
-        # reset grid of buttons
+        # reset grid of buttons, and the text each one currently shows
         self.buttons = [[None for _ in range(self.game.board.cols)] for _ in range(self.game.board.rows)]
+        self.button_text = [["?" for _ in range(self.game.board.cols)] for _ in range(self.game.board.rows)]
 
         for row in range(self.game.board.rows):
             for col in range(self.game.board.cols):
@@ -110,6 +153,18 @@ class GameBoard(tk.Frame):
                 # Bind right-click to flag the cell
                 btn.bind("<Button-3>", lambda event, r=row, c=col: self.flag_cell(r, c))
 
+    def create_canvas_grid(self):
+        """Create a single canvas that only draws the cells in view."""
+        self.canvas_grid = CanvasGrid(
+            self.master,
+            self.game,
+            color_map=self.COLOR_MAP,
+            on_reveal=self.reveal_cell,
+            on_flag=self.flag_cell,
+        )
+        self.canvas_grid.pack(fill="both", expand=True, pady=10)
+        self.grid_frame = self.canvas_grid
+
     def start_new_game(self):
         """Start a new game with the specified settings."""
         try:
@@ -122,79 +177,199 @@ class GameBoard(tk.Frame):
             if num_mines >= rows * cols:
                 raise ValueError("Mines must be fewer than total cells.")
 
-            # Update game parameters
-            self.rows = rows
-            self.cols = cols
-            self.num_mines = num_mines
-
-            # Create new game
-            self.game = Game(self.rows, self.cols, self.num_mines)
-
             # Resize board and refresh UI
             self.resize_board(rows, cols, num_mines)
-            self.create_game_grid()
-
-            # Reset Timer and Mines Left
-            self.timer_label.config(text="Time: 0")  # Reset the timer display
-            self.mines_left_label.config(text=f"Mines Left: {self.game.mines_left}")  # Reset mines left display
-
-            # Restart the timer update loop
-            self.update_timer_and_mines_left()
         except ValueError as e:
             messagebox.showerror("Invalid Input", str(e))
 
-    def update_timer_and_mines_left(self):
-        if not self.game.is_game_over:
-            # Update timer
-            elapsed_time = self.game.get_elapsed_time()
-            self.timer_label.config(text=f"Time: {elapsed_time}")
+    def board_engine(self):
+        """The engine for the current settings: the canvas and large boards use the array engine."""
+        if self.renderer.get() == "canvas" or self.rows * self.cols >= self.BACKGROUND_CELLS:
+            return "array"  # No per-cell objects to build before anything is drawn
+        return self.engine
+
+    def deal_game(self):
+        """Take the next pre-generated game, waiting for it on a worker thread."""
+        no_guess = self.no_guess.get()
+        engine = self.board_engine()
+        if self.factory is None or not self.factory.matches(self.rows, self.cols, self.num_mines,
+                                                            engine=engine, no_guess=no_guess):
+            if self.factory is not None:
+                threading.Thread(target=self.factory.close, daemon=True).start()  # Don't wait on workers
+            self.factory = BoardFactory(self.rows, self.cols, self.num_mines, engine=engine,
+                                        no_guess=no_guess)
+
+        if self.dealing is self.factory:
+            return  # Already waiting for this factory's next game
+        self.scheduler.discard_pending()  # Drop a game still being waited for, and moves on the old one
+        self.scheduler.stop_timer()
+        self.timer_label.config(text="Generating board...")
+        factory = self.dealing = self.factory
+        self.scheduler.run_in_background(lambda: self.wait_for_game(factory), self.show_game, self.deal_failed)
+
+    @staticmethod
+    def wait_for_game(factory):
+        """Block until the factory deals a game; returns None once it is closed."""
+        while not factory.closed.is_set():
+            game = factory.get(timeout=0.5)
+            if game is not None:
+                return game
+        return None
+
+    def deal_failed(self, error):
+        """Report a factory whose generation failed, and start a fresh one on the next deal."""
+        if self.factory is self.dealing:
+            threading.Thread(target=self.factory.close, daemon=True).start()
+            self.factory = None
+        self.dealing = None
+        self.timer_label.config(text="Time: 0")
+        messagebox.showerror("New Game", str(error))
+
+    def show_game(self, game):
+        """Switch to a new game and redraw everything."""
+        self.scheduler.discard_pending()
+        self.dealing = None
+        self.move_pending = False
+        self.master.config(cursor="")
+        self.game = game
+        self.create_game_grid()
+        if self.canvas_grid is None and game.board.revealed_count:
+            self.refresh_buttons()  # No-guess games come already opened
 
-            # Update mines left
-            self.mines_left_label.config(text=f"Mines Left: {self.game.mines_left}")
+        # Reset Timer and Mines Left
+        self.timer_label.config(text="Time: 0")  # Reset the timer display
+        self.mines_left_label.config(text=f"Mines Left: {self.game.mines_left}")  # Reset mines left display
 
-            # Call this method again after 1 second
-            self.after(1000, self.update_timer_and_mines_left)
+        # Restart the timer update loop; the scheduler replaces the previous game's
+        self.scheduler.start_timer(1000, self.update_timer_and_mines_left)
+
+    def update_timer_and_mines_left(self):
+        """Timer tick: refresh the status labels, returning False once the game is over."""
+        status = self.game.get_status()
+        if status["is_game_over"]:
+            return False
+
+        # Update timer
+        self.timer_label.config(text=f"Time: {status['elapsed_time']}")
+
+        # Update mines left
+        self.mines_left_label.config(text=f"Mines Left: {status['mines_left']}")
+        return True
+
+    def run_move(self, move, on_done):
+        """Call `move()` and pass its result to `on_done`, on a worker thread for large boards."""
+        board = self.game.board
+        if board.rows * board.cols < self.BACKGROUND_CELLS:
+            on_done(move())
+            return
+
+        self.move_pending = True
+        self.master.config(cursor="watch")
+
+        def finished(result):
+            self.move_pending = False
+            self.master.config(cursor="")
+            self.scheduler.request_redraw(self.refresh_changed_cells)  # Redraws were held back
+            on_done(result)
+
+        def failed(error):
+            self.move_pending = False
+            self.master.config(cursor="")
+            self.scheduler.request_redraw(self.refresh_changed_cells)
+            raise error
+
+        self.scheduler.run_in_background(move, finished, failed)
 
     def reveal_cell(self, row, col):
-        if self.game.is_game_over:
-            return  # Do nothing if the game is over
+        if self.game.is_game_over or self.move_pending:
+            return  # Do nothing if the game is over or busy with the previous move
+
+        game = self.game
+        # Clicking a number chords it
+        move = game.chord_cell if game.board.grid[row][col].is_revealed else game.reveal_cell
 
-        game_over, message = self.game.reveal_cell(row, col)
+        def play():
+            game_over, message = move(row, col)
+            if game_over:
+                game.reveal_board()  # Game is over, reveal all cells
+            return game_over, message
+
+        self.run_move(play, self.finish_reveal)
+
+    def finish_reveal(self, result):
+        game_over, message = result
         if game_over:
-            # Game is over, reveal all cells
-            self.reveal_entire_board()
+            self.record_game()
+            self.refresh_changed_cells()  # Draw the final board before the dialog blocks
             if message == "You hit a mine! Game over.":
                 messagebox.showerror("Game Over", message)
             elif message == "You Win!":
                 messagebox.showinfo("Congratulations!", "You won! 🎉")
         else:
-            # After revealing a cell, refresh all buttons to reflect the updated state
-            self.refresh_buttons()
+            # After revealing a cell, redraw only the cells the reveal changed, once per frame
+            self.scheduler.request_redraw(self.refresh_changed_cells)
 
-    def reveal_entire_board(self):
-        """Reveal all cells on the board."""
-        for row in range(self.game.board.rows):
-            for col in range(self.game.board.cols):
-                self.game.board.grid[row][col].is_revealed = True  # Mark all cells as revealed
-                self.update_button(row, col)  # Update the button to display the cell's state
+    def record_game(self):
+        if self.stats is not None and self.recorded_game is not self.game:
+            self.recorded_game = self.game
+            self.stats.record(self.game)
 
     def flag_cell(self, row, col):
-        if self.game.is_game_over:
-            return  # Do nothing if the game is over
+        if self.game.is_game_over or self.move_pending:
+            return  # Do nothing if the game is over or busy with the previous move
 
         self.game.flag_cell(row, col)  # Toggle the flag state of the cell
-        self.update_button(row, col)  # Update the button's appearance
+        self.scheduler.request_redraw(self.refresh_changed_cells)  # Update the button's appearance
+
+    def undo(self):
+        """Take back the last move, redrawing only the cells it changed."""
+        if self.move_pending:
+            return
+        was_over = self.game.is_game_over
+        self.run_move(self.game.undo, lambda undone: self.finish_undo(undone, was_over))
+
+    def finish_undo(self, undone, was_over):
+        if not undone:
+            return
+        self.scheduler.request_redraw(self.refresh_changed_cells)
+        self.mines_left_label.config(text=f"Mines Left: {self.game.mines_left}")
+        if was_over and not self.game.is_game_over:
+            # The timer stopped when the game ended
+            self.scheduler.start_timer(1000, self.update_timer_and_mines_left)
+
+    def handle_destroy(self, event):
+        if event.widget is self:
+            self.scheduler.close()
 
     def update_button(self, row, col):
         # Get the cell object
         cell = self.game.board.grid[row][col]
-        btn = self.buttons[row][col]
+        text = str(cell)
+        if self.button_text[row][col] == text:
+            return  # Already showing this state, skip the round-trip into Tcl
+        self.button_text[row][col] = text
 
-        btn.config(text=str(cell),
+        btn = self.buttons[row][col]
+        btn.config(text=text,
                    borderless=1,
                    bg="white" if cell.is_revealed else "gray",
-                   fg=self.COLOR_MAP.get(str(cell), "black"))
+                   fg=self.COLOR_MAP.get(text, "black"))
+
+    @instrumentation.timed("ui.refresh_changed_cells")
+    def refresh_changed_cells(self):
+        """Redraw only the cells the game reports as changed since the last redraw."""
+        if self.move_pending:
+            return  # The worker is still adding changes; the move redraws when it finishes
+        changes = self.game.pop_changes()
+        instrumentation.observe("ui.refresh_changed_cells.cells", len(changes))
+        if self.canvas_grid is not None:
+            self.canvas_grid.refresh_cells(changes)
+        else:
+            for row, col in changes:
+                self.update_button(row, col)
+        self.update_idletasks()  # Flush the batched widget updates in a single pass
 
+    @instrumentation.timed("ui.refresh_buttons")
     def refresh_buttons(self):
         # Loop through all cells and refresh their buttons
         for row in range(self.game.board.rows):
@@ -203,11 +378,10 @@ class GameBoard(tk.Frame):
 
     def resize_board(self, rows, cols, num_mines):
         """Dynamically resize the board."""
-        # Update the game instance with the new configuration
-        self.game = Game(rows, cols, num_mines)
+        # Update game parameters
         self.rows = rows
         self.cols = cols
         self.num_mines = num_mines
 
-        # Recreate the game grid
-        self.create_game_grid()
+        # Deal a game with the new configuration and recreate the game grid
+        self.deal_game()
@@ -2,18 +2,26 @@
 import tkinter as tk
 from tkinter import messagebox
 from ui.game_board import GameBoard
+from utils.stats_store import StatsStore
 
 
 class MainWindow(tk.Tk):
-    def __init__(self):
+    def __init__(self, stats_path=None, engine="classic", renderer="buttons"):
         super().__init__()
         self.title("Minesweeper")
         self.geometry("600x500")
 
-        self.game_board_frame = GameBoard(self)
+        # Finished games are recorded in this SQLite database, if given
+        self.stats = StatsStore(stats_path) if stats_path else None
+        self.game_board_frame = GameBoard(self, engine=engine, renderer=renderer, stats=self.stats)
         self.game_board_frame.pack()
 
+    def destroy(self):
+        super().destroy()
+        if self.stats is not None:
+            self.stats.close()
+
 
 if __name__ == "__main__":
-    app = MainWindow()
+    app = MainWindow(stats_path="minesweeper_stats.db")
     app.mainloop()
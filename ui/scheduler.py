@@ -0,0 +1,104 @@
+# ui/scheduler.py
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Scheduler:
+    """
+    Owns the timing of a Tk widget: a single repeating timer, redraws coalesced into one
+    frame, and slow work run on background threads.
+    Tk may only be used from its own thread, so workers never touch widgets: their results
+    go through a queue that the Tk thread drains, and the callbacks run there.
+    """
+    FRAME_INTERVAL = 16  # Milliseconds between coalesced redraws (about 60 per second)
+    POLL_INTERVAL = 15   # Milliseconds between checks for finished background work
+
+    def __init__(self, widget, workers=2):
+        self.widget = widget
+        self.timer_job = None
+        self.frame_job = None
+        self.poll_job = None
+        self.redraws = {}  # Redraw callbacks requested for the next frame, in request order
+        self.results = queue.Queue()  # (generation, future, on_done, on_error) of finished work
+        self.running = 0  # Background jobs not yet handed back
+        self.generation = 0  # Bumped by discard_pending, so older results are dropped
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ui-worker")
+
+    def start_timer(self, interval, callback):
+        """Call `callback` now and every `interval` ms until it returns False, replacing any running timer."""
+        self.stop_timer()
+
+        def tick():
+            self.timer_job = None
+            if callback() is not False:
+                self.timer_job = self.widget.after(interval, tick)
+
+        tick()
+
+    def stop_timer(self):
+        if self.timer_job is not None:
+            self.widget.after_cancel(self.timer_job)
+            self.timer_job = None
+
+    def request_redraw(self, callback):
+        """Run `callback` in the next frame; repeated requests before then run it once."""
+        self.redraws[callback] = None
+        if self.frame_job is None:
+            self.frame_job = self.widget.after(self.FRAME_INTERVAL, self.draw_frame)
+
+    def draw_frame(self):
+        self.frame_job = None
+        redraws, self.redraws = self.redraws, {}
+        for callback in redraws:
+            callback()
+
+    def run_in_background(self, work, on_done, on_error=None):
+        """
+        Run `work()` on a worker thread, then `on_done(result)` (or `on_error(exception)`)
+        on the Tk thread. Without `on_error`, exceptions are reported like any Tk callback's.
+        """
+        generation = self.generation
+        future = self.executor.submit(work)
+        future.add_done_callback(lambda future: self.results.put((generation, future, on_done, on_error)))
+        self.running += 1
+        if self.poll_job is None:
+            self.poll_job = self.widget.after(self.POLL_INTERVAL, self.poll)
+
+    def poll(self):
+        """Hand finished work back to its callbacks, polling again while jobs are outstanding."""
+        self.poll_job = None
+        while True:
+            try:
+                generation, future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.running -= 1
+            if generation != self.generation or future.cancelled():
+                continue  # Discarded, e.g. a move on a game that has since been replaced
+            error = future.exception()
+            try:
+                if error is None:
+                    on_done(future.result())
+                elif on_error is not None:
+                    on_error(error)
+                else:
+                    raise error
+            except Exception:
+                self.widget.report_callback_exception(*sys.exc_info())
+        if self.running:
+            self.poll_job = self.widget.after(self.POLL_INTERVAL, self.poll)
+
+    def discard_pending(self):
+        """Drop the results of background work already started, and any pending redraws."""
+        self.generation += 1
+        self.redraws = {}
+
+    def close(self):
+        """Cancel every scheduled callback and stop the workers without waiting for them."""
+        for job in (self.timer_job, self.frame_job, self.poll_job):
+            if job is not None:
+                self.widget.after_cancel(job)
+        self.timer_job = self.frame_job = self.poll_job = None
+        self.discard_pending()
+        self.executor.shutdown(wait=False, cancel_futures=True)
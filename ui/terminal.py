@@ -0,0 +1,114 @@
+# ui/terminal.py
+import shutil
+
+# ANSI escape sequences
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[2K"
+
+
+def move_cursor(line, column):
+    """Escape sequence moving the cursor to a 1-based (line, column)."""
+    return f"\x1b[{line};{column}H"
+
+
+class Viewport:
+    """
+    The window of the board shown in the terminal. Follows the player's moves so boards
+    larger than the terminal stay usable.
+    """
+
+    def __init__(self, board_rows, board_cols, height, width):
+        self.board_rows = board_rows
+        self.board_cols = board_cols
+        self.height = min(height, board_rows)
+        self.width = min(width, board_cols)
+        self.top = 0
+        self.left = 0
+
+    @classmethod
+    def for_terminal(cls, board_rows, board_cols, reserved_lines=4):
+        """Size a viewport to the current terminal, keeping lines free for status and prompt."""
+        size = shutil.get_terminal_size()
+        label_width = len(str(board_rows - 1)) + 1
+        cell_width = len(str(board_cols - 1)) + 1
+        height = max(size.lines - reserved_lines - 1, 1)
+        width = max((size.columns - label_width) // cell_width, 1)
+        return cls(board_rows, board_cols, height, width)
+
+    def window(self):
+        """Return (first_row, last_row, first_col, last_col), inclusive."""
+        return self.top, self.top + self.height - 1, self.left, self.left + self.width - 1
+
+    def contains(self, row, col):
+        return self.top <= row < self.top + self.height and self.left <= col < self.left + self.width
+
+    def move_to(self, row, col):
+        """Put (row, col) at the top-left corner, clamped to the board."""
+        self.top = max(0, min(row, self.board_rows - self.height))
+        self.left = max(0, min(col, self.board_cols - self.width))
+
+    def follow(self, row, col):
+        """Center the viewport on (row, col) if it is outside. Returns True if it moved."""
+        if self.contains(row, col):
+            return False
+        self.move_to(row - self.height // 2, col - self.width // 2)
+        return True
+
+
+class AnsiBoardView:
+    """
+    Draws a board in a terminal and afterwards repaints only the cells that changed, using
+    ANSI cursor positioning. Columns use a fixed width so every cell has a known position.
+    """
+
+    def __init__(self, stream, board, viewport):
+        self.stream = stream
+        self.board = board
+        self.viewport = viewport
+        self.label_width = len(str(board.rows - 1)) + 1
+        self.cell_width = len(str(board.cols - 1)) + 1
+
+    @property
+    def status_line(self):
+        """Terminal line just below the board, for the status text."""
+        return self.viewport.height + 2
+
+    @property
+    def prompt_line(self):
+        return self.status_line + 1
+
+    def draw(self):
+        """Redraw the whole viewport, e.g. at start or after the viewport moved."""
+        first_row, last_row, first_col, last_col = self.viewport.window()
+        header = " " * self.label_width + "".join(str(col).ljust(self.cell_width)
+                                                  for col in range(first_col, last_col + 1))
+        lines = [CLEAR_SCREEN, header, "\n"]
+        for row in range(first_row, last_row + 1):
+            lines.append(str(row).ljust(self.label_width))
+            lines.extend(symbol.ljust(self.cell_width)
+                         for symbol in self.board.row_symbols(row, first_col, last_col))
+            lines.append("\n")
+        self.stream.write("".join(lines))
+        self.stream.flush()
+
+    def update(self, changes):
+        """Repaint the given (row, col) cells that are inside the viewport, in one write."""
+        viewport = self.viewport
+        parts = []
+        for row, col in changes:
+            if viewport.contains(row, col):
+                line = row - viewport.top + 2  # Line 1 holds the column header
+                column = self.label_width + (col - viewport.left) * self.cell_width + 1
+                parts.append(move_cursor(line, column) + str(self.board.grid[row][col]))
+        if parts:
+            self.stream.write("".join(parts))
+            self.stream.flush()
+
+    def show_status(self, text):
+        self.stream.write(move_cursor(self.status_line, 1) + CLEAR_LINE + text)
+        self.stream.flush()
+
+    def prepare_prompt(self):
+        """Move to a cleared prompt line so input() echoes in a fixed place."""
+        self.stream.write(move_cursor(self.prompt_line, 1) + CLEAR_LINE)
+        self.stream.flush()
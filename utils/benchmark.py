@@ -0,0 +1,170 @@
+# utils/benchmark.py
+"""
+Benchmarks for the hot paths of the game.
+
+Times board construction, reveal cascades (including the worst case of one click
+flooding an almost empty board), win checks and text rendering across board sizes,
+mine densities and engines, all with fixed seeds. Results (timings and peak traced
+memory) are written to a JSON file, and can be compared against a stored baseline to
+flag slowdowns.
+
+Examples:
+    python -m utils.benchmark --output bench.json
+    python -m utils.benchmark --max-cells 250000 --baseline bench.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from core.game import BOARD_ENGINES, Game
+
+SIZES = [(9, 9), (16, 30), (100, 100), (500, 500), (1000, 1000), (2000, 2000)]
+DENSITIES = [0.01, 0.15, 0.5]
+SEED = 1234
+
+
+def measure(case, repeats):
+    """
+    Time a benchmark case, given as a pair (setup, action): setup() runs untimed and its
+    result is passed to the timed action(). Peak memory is traced in a separate run so
+    tracing overhead does not skew the timings.
+    Returns (list of seconds, peak traced bytes).
+    """
+    setup, action = case
+    state = setup()
+    tracemalloc.start()
+    action(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeats):
+        state = setup()
+        start = time.perf_counter()
+        action(state)
+        timings.append(time.perf_counter() - start)
+    return timings, peak
+
+
+def scenarios(engines, sizes, densities):
+    """
+    Yield (name, parameters, (setup, action)) for every benchmark case.
+    """
+    for engine in engines:
+        for rows, cols in sizes:
+            for density in densities:
+                mines = max(1, int(rows * cols * density))
+                params = {"engine": engine, "rows": rows, "cols": cols, "mines": mines}
+                yield ("construct", params,
+                       (lambda: None,
+                        lambda _, r=rows, c=cols, m=mines, e=engine: Game(r, c, m, engine=e, seed=SEED)))
+
+            # A single mine and a click in the opposite corner: the cascade floods the board
+            params = {"engine": engine, "rows": rows, "cols": cols, "mines": 1}
+            yield ("flood_cascade", params,
+                   (lambda r=rows, c=cols, e=engine: Game(r, c, 1, engine=e, seed=SEED, first_click="cell"),
+                    lambda game: game.reveal_cell(game.rows - 1, game.cols - 1)))
+
+            # A typical opening on an expert-density board
+            mines = max(1, int(rows * cols * 0.2))
+            params = {"engine": engine, "rows": rows, "cols": cols, "mines": mines}
+            yield ("opening_cascade", params,
+                   (lambda r=rows, c=cols, m=mines, e=engine:
+                    Game(r, c, m, engine=e, seed=SEED, first_click="neighborhood"),
+                    lambda game: game.reveal_cell(game.rows // 2, game.cols // 2)))
+
+            def opened_game(r=rows, c=cols, m=mines, e=engine):
+                game = Game(r, c, m, engine=e, seed=SEED, first_click="neighborhood")
+                game.reveal_cell(r // 2, c // 2)
+                return game
+
+            yield ("win_check", params, (opened_game, lambda game: game.check_win_condition()))
+            yield ("render_text", params, (opened_game, lambda game: str(game.board)))
+
+
+def run(engines, sizes, densities, repeats, max_cells, only=None):
+    """
+    Run the benchmarks and return the results document.
+    """
+    results = []
+    for name, params, case in scenarios(engines, sizes, densities):
+        if params["rows"] * params["cols"] > max_cells or (only and name not in only):
+            continue
+        timings, peak = measure(case, repeats)
+        result = dict(params, name=name, key=result_key(name, params),
+                      seconds_min=min(timings), seconds_median=statistics.median(timings),
+                      peak_bytes=peak, repeats=repeats)
+        results.append(result)
+        print(f"{result['key']}: {result['seconds_min'] * 1000:.3f} ms, {peak / 1024:.0f} KiB peak")
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+
+def result_key(name, params):
+    return f"{name}/{params['engine']}/{params['rows']}x{params['cols']}/{params['mines']}"
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare two results documents by key on the best timing.
+    Returns a list of (key, baseline seconds, current seconds, ratio) for cases slower than
+    `threshold` times the baseline.
+    """
+    previous = {result["key"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(result["key"])
+        if before is None or before["seconds_min"] <= 0:
+            continue
+        ratio = result["seconds_min"] / before["seconds_min"]
+        if ratio > threshold:
+            regressions.append((result["key"], before["seconds_min"], result["seconds_min"], ratio))
+    return regressions
+
+
+def parse_size(text):
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Minesweeper hot paths.")
+    parser.add_argument("--engines", nargs="+", choices=sorted(BOARD_ENGINES), default=["classic", "array"])
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=SIZES, help="e.g. 9x9 100x100")
+    parser.add_argument("--densities", nargs="+", type=float, default=DENSITIES)
+    parser.add_argument("--only", nargs="+", help="Run only these scenarios, e.g. flood_cascade")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-cells", type=int, default=4_000_000, help="Skip boards larger than this")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+
+    document = run(args.engines, args.sizes, args.densities, args.repeats, args.max_cells, args.only)
+    with open(args.output, "w") as file:
+        json.dump(document, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(document, json.load(file), args.threshold)
+        for key, before, after, ratio in regressions:
+            print(f"SLOWER {key}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
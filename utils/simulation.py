@@ -0,0 +1,230 @@
+# utils/simulation.py
+"""
+Headless game simulation.
+
+Plays many games without any UI using a pluggable policy, spreads batches of games over
+a process pool and aggregates the results as they stream in, so memory use does not grow
+with the number of games.
+
+Example:
+    python -m utils.simulation --games 100000 --rows 9 --cols 9 --mines 10 --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from core.game import Game
+from utils.stats_store import StatsStore
+
+
+class RandomPolicy:
+    """
+    Reveals hidden cells in a random order, never flagging.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.order = None
+
+    def choose(self, game):
+        """
+        Return the next (row, col) to reveal, or None if there is nothing left to try.
+        """
+        board = game.board
+        if self.order is None:
+            self.order = list(range(board.rows * board.cols))
+            self.rng.shuffle(self.order)
+        while self.order:
+            row, col = divmod(self.order.pop(), board.cols)
+            cell = board.grid[row][col]
+            if not cell.is_revealed and not cell.is_flagged:
+                return row, col
+        return None
+
+
+class SolverPolicy:
+    """
+    Reveals the cells proven safe by `core.solver.Solver`, guessing the lowest mine
+    probability when nothing is certain.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def choose(self, game):
+        move = game.get_solver().best_move(self.rng)
+        return None if move is None else move[:2]
+
+
+# Policies available to the simulation, by name (names keep them picklable for workers)
+POLICIES = {
+    "random": RandomPolicy,
+    "solver": SolverPolicy,
+}
+
+
+def play_game(game, policy):
+    """
+    Play one game to the end with the given policy.
+    Returns the number of moves made.
+    """
+    moves = 0
+    while not game.is_game_over:
+        move = policy.choose(game)
+        if move is None:
+            break
+        game.reveal_cell(*move)
+        moves += 1
+    return moves
+
+
+def run_batch(config, batch_index):
+    """
+    Play `config["batch_size"]` games and return a summary of the batch. With
+    `config["record_games"]`, the summary also lists every game's result as
+    (won, seconds, cells revealed, seed).
+    Each batch gets its own generator derived from the base seed and the batch index, so
+    results do not depend on which worker ran the batch or in which order.
+    """
+    rng = random.Random(config["seed"] * 1_000_003 + batch_index)
+    games = min(config["batch_size"], config["games"] - batch_index * config["batch_size"])
+    summary = {"games": games, "wins": 0, "moves": 0, "cells_revealed": 0, "seconds": 0.0}
+    results = summary["results"] = [] if config.get("record_games") else None
+
+    start = time.perf_counter()
+    for _ in range(games):
+        game_start = time.perf_counter()
+        seed = rng.randrange(2 ** 63)
+        # Nothing is replayed or undone, so skip the action log and the undo history
+        game = Game(config["rows"], config["cols"], config["mines"], engine=config["engine"],
+                    seed=seed, first_click=config["first_click"], record=False, max_undo=0)
+        policy = POLICIES[config["policy"]](rng)
+        summary["moves"] += play_game(game, policy)
+        summary["cells_revealed"] += game.board.revealed_count
+        summary["wins"] += game.is_winner
+        if results is not None:
+            results.append((game.is_winner, time.perf_counter() - game_start, game.board.revealed_count, seed))
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+class SimulationStats:
+    """
+    Running aggregate of batch summaries.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.moves = 0
+        self.cells_revealed = 0
+        self.cpu_seconds = 0.0  # Time spent inside the workers, summed
+        self.start_time = time.perf_counter()
+
+    def add(self, summary):
+        self.games += summary["games"]
+        self.wins += summary["wins"]
+        self.moves += summary["moves"]
+        self.cells_revealed += summary["cells_revealed"]
+        self.cpu_seconds += summary["seconds"]
+
+    def report(self):
+        """
+        Return the aggregate statistics as a dict.
+        """
+        wall_seconds = max(time.perf_counter() - self.start_time, 1e-9)
+        games = max(self.games, 1)
+        win_rate = self.wins / games
+        # Normal approximation of the 95% confidence interval of the win rate
+        margin = 1.96 * (win_rate * (1 - win_rate) / games) ** 0.5
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "win_rate": win_rate,
+            "win_rate_95": (max(win_rate - margin, 0.0), min(win_rate + margin, 1.0)),
+            "moves_per_game": self.moves / games,
+            "cells_revealed_per_game": self.cells_revealed / games,
+            "wall_seconds": wall_seconds,
+            "games_per_second": self.games / wall_seconds,
+            "cells_revealed_per_second": self.cells_revealed / wall_seconds,
+        }
+
+
+def run_simulation(games, rows, cols, mines, policy="random", engine="classic", first_click=None,
+                   seed=0, batch_size=1000, workers=None, on_batch=None, store=None):
+    """
+    Play `games` games and return the aggregate SimulationStats.
+    With a `store` (utils.stats_store.StatsStore), every game's result is recorded in it.
+    Batches run on a ProcessPoolExecutor with `workers` processes (workers=0 runs them in
+    this process). Only a few batches are in flight at a time and each summary is folded
+    into the stats as soon as it arrives; `on_batch(summary, stats)` is called for each.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'. Choose from: {', '.join(POLICIES)}.")
+    config = {"games": games, "rows": rows, "cols": cols, "mines": mines, "policy": policy,
+              "engine": engine, "first_click": first_click, "seed": seed, "batch_size": batch_size,
+              "record_games": store is not None}
+    num_batches = -(-games // batch_size)
+    stats = SimulationStats()
+
+    def collect(summary):
+        stats.add(summary)
+        if store is not None:
+            for won, seconds, revealed, game_seed in summary["results"]:
+                store.record_result(rows, cols, mines, won, seconds, revealed=revealed, seed=game_seed,
+                                    first_click=first_click)
+        if on_batch:
+            on_batch(summary, stats)
+
+    if workers == 0:
+        for batch_index in range(num_batches):
+            collect(run_batch(config, batch_index))
+        return stats
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        next_batch = 0
+        pending = set()
+        while next_batch < num_batches or pending:
+            while next_batch < num_batches and len(pending) < max_in_flight:
+                pending.add(executor.submit(run_batch, config, next_batch))
+                next_batch += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future.result())
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Minesweeper games.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--rows", type=int, default=9)
+    parser.add_argument("--cols", type=int, default=9)
+    parser.add_argument("--mines", type=int, default=10)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--engine", default="classic")
+    parser.add_argument("--first-click", choices=["cell", "neighborhood"], default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="0 runs in this process")
+    parser.add_argument("--stats", metavar="FILE", help="Record every game in the SQLite statistics database FILE")
+    args = parser.parse_args()
+    store = StatsStore(args.stats) if args.stats else None
+
+    def progress(summary, stats):
+        print(f"{stats.games}/{args.games} games, win rate {stats.wins / stats.games:.4f}")
+
+    stats = run_simulation(args.games, args.rows, args.cols, args.mines, policy=args.policy,
+                           engine=args.engine, first_click=args.first_click, seed=args.seed,
+                           batch_size=args.batch_size, workers=args.workers, on_batch=progress, store=store)
+    if store is not None:
+        store.close()
+    for key, value in stats.report().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
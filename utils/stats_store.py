@@ -0,0 +1,298 @@
+# utils/stats_store.py
+"""
+Persistent game statistics.
+
+A StatsStore keeps the result of every finished game in a local SQLite database, for
+leaderboards and percentiles per configuration (board size, mine count, first-click
+mode and topology). Recording never waits on the disk: `record` only queues a row, and
+a background thread writes the queue in batches, one transaction per batch.
+
+Queries stay fast with tens of millions of games:
+- Games are indexed by (configuration, outcome, time bucket, elapsed time), so the
+  fastest wins are a short index scan.
+- A small table counts the games per time bucket (about 2% wide). Percentiles and ranks
+  add up those counts, then look inside a single bucket through the index, instead of
+  counting every game.
+
+Example:
+    store = StatsStore("stats.db")
+    store.record(game)  # Once the game is over
+    store.flush()       # Wait for queued games to be written
+    store.leaderboard(16, 30, 99)
+    store.close()
+"""
+import math
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+BATCH_SIZE = 1000      # Most games written per transaction
+FLUSH_INTERVAL = 1.0   # Seconds a queued game may wait for a batch to fill
+BUCKETS_PER_DOUBLING = 32  # Time buckets per doubling of the elapsed milliseconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    first_click TEXT NOT NULL,  -- '' for no first-click safety
+    topology TEXT NOT NULL,
+    UNIQUE (rows, cols, mines, first_click, topology)
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    config_id INTEGER NOT NULL REFERENCES configs (id),
+    won INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,  -- time_bucket(elapsed)
+    elapsed REAL NOT NULL,    -- Seconds
+    revealed INTEGER NOT NULL,  -- Safe cells revealed
+    seed TEXT,  -- Decimal, since seeds may not fit SQLite's 64-bit integers
+    finished_at REAL NOT NULL  -- Unix time
+);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (config_id, won, bucket, elapsed);
+CREATE TABLE IF NOT EXISTS time_buckets (
+    config_id INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (config_id, won, bucket)
+) WITHOUT ROWID;
+"""
+
+
+def time_bucket(elapsed):
+    """
+    Bucket of an elapsed time in seconds, growing logarithmically with the time.
+    """
+    return int(math.log2(1 + max(elapsed, 0.0) * 1000) * BUCKETS_PER_DOUBLING)
+
+
+def config_key(rows, cols, mines, first_click=None, topology="grid"):
+    return rows, cols, mines, first_click or "", getattr(topology, "name", topology)
+
+
+class StatsStore:
+    """
+    Game results stored in the SQLite database at `path`, written by a background thread
+    in batches of up to `batch_size` games, at most `flush_interval` seconds after they
+    are recorded. Queries see the games written so far; `flush` waits for the rest.
+    """
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()  # Game rows, flush Events, or None to stop
+        self.local = threading.local()  # Query connection of each thread
+        self.readers = []  # Every query connection opened, closed with the store
+        self.readers_lock = threading.Lock()
+        self.closed = False
+        self.error = None  # Last write failure, raised by the next flush
+        connection = self.connect()
+        try:
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+        self.thread = threading.Thread(target=self.write_queued, name="stats-writer", daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        # WAL lets queries run while the writer commits
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def record(self, game):
+        """
+        Queue the result of a finished Game.
+        """
+        if not game.is_game_over:
+            raise ValueError("Only finished games can be recorded.")
+        board = game.board
+        elapsed = time.time() - game.start_time if game.start_time else 0.0
+        self.record_result(board.rows, board.cols, board.num_mines, game.is_winner, elapsed,
+                           revealed=board.revealed_count, seed=board.seed,
+                           first_click=board.first_click, topology=board.topology)
+
+    def record_result(self, rows, cols, mines, won, elapsed, revealed=0, seed=None, first_click=None,
+                      topology="grid", finished_at=None):
+        """
+        Queue a game result given field by field, e.g. from a headless run.
+        """
+        if self.closed:
+            raise ValueError("The stats store is closed.")
+        self.queue.put((config_key(rows, cols, mines, first_click, topology), bool(won), float(elapsed),
+                        revealed, seed, time.time() if finished_at is None else finished_at))
+
+    def write_queued(self):
+        """
+        Writer thread: collects queued games into batches and writes each in one transaction.
+        """
+        connection = self.connect()
+        config_ids = {}
+        stopping = False
+        while not stopping:
+            records, waiters = [], []
+            item = self.queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break  # Someone is waiting for this batch
+                records.append(item)
+                if len(records) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if records:
+                try:
+                    self.write(connection, config_ids, records)
+                except Exception as error:
+                    self.error = error  # The batch is lost, but the writer keeps going
+                    config_ids.clear()  # Ids created in the rolled back transaction are gone
+            for waiter in waiters:
+                waiter.set()
+        connection.close()
+
+    def write(self, connection, config_ids, records):
+        games = []
+        buckets = Counter()
+        with connection:
+            for config, won, elapsed, revealed, seed, finished_at in records:
+                config_id = config_ids.get(config)
+                if config_id is None:
+                    config_id = config_ids[config] = self.config_id(connection, config, create=True)
+                bucket = time_bucket(elapsed)
+                games.append((config_id, won, bucket, elapsed, revealed, None if seed is None else str(seed),
+                              finished_at))
+                buckets[config_id, won, bucket] += 1
+            connection.executemany(
+                "INSERT INTO games (config_id, won, bucket, elapsed, revealed, seed, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", games)
+            connection.executemany(
+                "INSERT INTO time_buckets (config_id, won, bucket, games) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (config_id, won, bucket) DO UPDATE SET games = games + excluded.games",
+                [(*key, count) for key, count in buckets.items()])
+
+    @staticmethod
+    def config_id(connection, config, create=False):
+        """
+        Id of a configuration, or None if it has no games (unless `create`).
+        """
+        if create:
+            connection.execute("INSERT OR IGNORE INTO configs (rows, cols, mines, first_click, topology) "
+                               "VALUES (?, ?, ?, ?, ?)", config)
+        row = connection.execute("SELECT id FROM configs WHERE rows = ? AND cols = ? AND mines = ? "
+                                 "AND first_click = ? AND topology = ?", config).fetchone()
+        return row and row[0]
+
+    def flush(self):
+        """
+        Wait until every game recorded so far is written. Raises the last write error, if any.
+        """
+        done = threading.Event()
+        self.queue.put(done)
+        while not done.wait(0.1):
+            if not self.thread.is_alive():
+                raise RuntimeError("The stats writer thread has stopped.")
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        """
+        Write the queued games, stop the writer thread and close the query connections.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+        with self.readers_lock:
+            for connection in self.readers:
+                connection.close()
+            self.readers.clear()
+
+    def reader(self):
+        """
+        The calling thread's query connection, opened on first use.
+        """
+        if self.closed:
+            raise ValueError("The stats store is closed.")
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            with self.readers_lock:
+                if self.closed:
+                    raise ValueError("The stats store is closed.")
+                connection = self.local.connection = self.connect()
+                self.readers.append(connection)
+        return connection
+
+    def query(self, sql, parameters=()):
+        return self.reader().execute(sql, parameters).fetchall()
+
+    def lookup(self, rows, cols, mines, first_click=None, topology="grid"):
+        return self.config_id(self.reader(), config_key(rows, cols, mines, first_click, topology))
+
+    def summary(self, rows, cols, mines, first_click=None, topology="grid"):
+        """
+        Returns {"games", "wins", "win_rate"} for a configuration.
+        """
+        config_id = self.lookup(rows, cols, mines, first_click, topology)
+        counts = dict(self.query("SELECT won, SUM(games) FROM time_buckets WHERE config_id = ? GROUP BY won",
+                                 (config_id,)))
+        games = sum(counts.values())
+        wins = counts.get(1, 0)
+        return {"games": games, "wins": wins, "win_rate": wins / games if games else 0.0}
+
+    def leaderboard(self, rows, cols, mines, first_click=None, topology="grid", limit=10):
+        """
+        The fastest wins of a configuration, as (elapsed, seed, finished_at) tuples.
+        """
+        config_id = self.lookup(rows, cols, mines, first_click, topology)
+        results = self.query("SELECT elapsed, seed, finished_at FROM games WHERE config_id = ? AND won = 1 "
+                             "ORDER BY bucket, elapsed LIMIT ?", (config_id, limit))
+        return [(elapsed, None if seed is None else int(seed), finished_at) for elapsed, seed, finished_at in results]
+
+    def percentile(self, rows, cols, mines, fraction, first_click=None, topology="grid", won=True):
+        """
+        The elapsed time that `fraction` (0 to 1) of the configuration's won (or lost)
+        games are at least as fast as (nearest rank), or None without games.
+        """
+        config_id = self.lookup(rows, cols, mines, first_click, topology)
+        buckets = self.query("SELECT bucket, games FROM time_buckets WHERE config_id = ? AND won = ? "
+                             "ORDER BY bucket", (config_id, int(won)))
+        total = sum(games for _, games in buckets)
+        if not total:
+            return None
+        position = min(max(math.ceil(fraction * total) - 1, 0), total - 1)  # 0-based rank
+        for bucket, games in buckets:
+            if position < games:
+                return self.query("SELECT elapsed FROM games WHERE config_id = ? AND won = ? AND bucket = ? "
+                                  "ORDER BY elapsed LIMIT 1 OFFSET ?",
+                                  (config_id, int(won), bucket, position))[0][0]
+            position -= games
+
+    def rank(self, rows, cols, mines, elapsed, first_click=None, topology="grid"):
+        """
+        Fraction of the configuration's wins strictly faster than `elapsed` seconds.
+        """
+        config_id = self.lookup(rows, cols, mines, first_click, topology)
+        bucket = time_bucket(elapsed)
+        below, total = self.query(
+            "SELECT COALESCE(SUM(CASE WHEN bucket < ? THEN games END), 0), COALESCE(SUM(games), 0) "
+            "FROM time_buckets WHERE config_id = ? AND won = 1", (bucket, config_id))[0]
+        if not total:
+            return 0.0
+        within = self.query("SELECT COUNT(*) FROM games WHERE config_id = ? AND won = 1 AND bucket = ? "
+                            "AND elapsed < ?", (config_id, bucket, elapsed))[0][0]
+        return (below + within) / total